@@ -0,0 +1,553 @@
+'''
+Offline benchmark of the extraction and persistence hot paths of `src.py`. No browser, no network: the search timeline is
+replayed from the fixtures in `Benchmarks/fixtures` through a fake WebDriver that counts every command it gets. The fixtures
+are synthetic (seeded random posts laid out like X's timeline HTML and SearchTimeline JSON, see `make_fixtures`), not captured.
+
+    python benchmark.py                       # run everything and print the results
+    python benchmark.py --check               # also compare against Benchmarks/baseline.json, exit code 1 on a regression
+    python benchmark.py --save-baseline       # store the results as the new baseline
+    python benchmark.py --sizes 10000         # only benchmark savepoints/resume at 10k rows (default is 10k, 100k and 1M)
+    python benchmark.py --make-fixtures       # regenerate the synthetic fixtures
+
+Metrics
+----------
+- extract.<html|script|network|webdriver>.posts_per_sec
+    Parsing/conversion throughput of one captured batch, without the scroll loop.
+- scrape.<mode>.posts_per_sec / scrape.<mode>.commands_per_post
+    A whole `start()` over the replayed timeline, per `extractionMode`, and how many WebDriver commands it took per post.
+- savepoint.<rows>.seconds
+    One autosave (`save("savepoint")`) of `autoSaveInterval` new posts with <rows> posts already collected.
+- final_csv.<rows>.seconds
+    `save("final")` of <rows> posts to CSV.
+- resume.<rows>.seconds
+    Resuming a run of <rows> posts: `_load_latest_savepoint` plus the dedupe set rebuild of `scrape()`.
+- buffer.bytes_per_post
+    Memory `theDict` (a `postBuffer`) takes per collected post, texts left out.
+
+Timings are the best of `--repeat` runs, and are compared to the baseline relative to a calibration workload timed in the same
+run (`calibration.seconds`), so a busier or throttled machine doesn't read as a regression. They still only compare on the same
+kind of machine, so save the baseline where `--check` runs. Commands and bytes per post don't depend on the machine.
+'''
+import argparse
+import contextlib
+import copy
+import gc
+import gzip
+import io
+import json
+import os
+import platform
+import random as rd
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from html import escape
+from typing import *
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import src
+from src import twitterScrapper
+try:
+    import lxml.html as lxml_html
+except ImportError:         # Checked by `run`, the fixtures are HTML
+    lxml_html = None
+from selenium.common.exceptions import NoSuchElementException
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Benchmarks")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+TIMELINE_FIXTURE = os.path.join(FIXTURE_DIR, "search_timeline.html.gz")
+NETWORK_FIXTURE = os.path.join(FIXTURE_DIR, "search_timeline.json.gz")
+FIXTURE_POSTS = 300
+CELLS_PER_SCROLL = 6            # New cells rendered by one scroll step
+RENDERED_CELLS = 14             # Cells X keeps in the DOM at once, older ones get recycled
+EXTRACT_ROUNDS = 10             # Passes over the fixture per timed extraction run, so the run is long enough to time
+COMMAND_TOLERANCE = 0.05        # Commands and bytes per post are deterministic, only a real change should trip them
+
+FILTERS = src.SEARCH_FILTERS
+SCRAPING_PARAMS = {"wait_short": 2, "wait_long": 0.05, "detection_wait": 900, "max_empty_pages": 2,
+                   "poll_interval": 0.005, "idle_window": 0.02}
+
+
+# Fixtures
+WORDS = ("makan bergizi gratis program anak sekolah gizi menu hari ini dapur umum sayur buah susu telur ayam nasi "
+         "anggaran daerah kota desa pemerintah pusat laporan korban keracunan pengawasan distribusi evaluasi").split()
+EMOJIS = ("😭", "🔥", "👏", "🙏", "😂")
+
+
+def _fixture_posts(n: int = FIXTURE_POSTS, newest: int = 1768800000) -> list[dict]:
+    generator = rd.Random(17)
+    posts = []
+    ts = newest
+    for i in range(n):
+        ts -= generator.randint(30, 1800)
+        words = generator.sample(WORDS, generator.randint(6, 24))
+        posts.append({
+            "Post_id": ((ts * 1000 - src.TWITTER_EPOCH_MS) << 22) | generator.getrandbits(22),
+            "User": f"@user_{generator.randint(1, 120)}",
+            "created_at": ts,
+            "text": " ".join(words),
+            "emoji": generator.choice(EMOJIS) if generator.random() < 0.3 else "",
+            "link": f"kompas.com/read/{generator.randint(1000, 9999)}" if generator.random() < 0.2 else "",
+            "quoted": " ".join(generator.sample(WORDS, 8)) if generator.random() < 0.15 else "",
+            "counts": [int(generator.paretovariate(1.2)) - 1 for _ in range(3)] + [int(generator.paretovariate(0.8) * 20)],
+        })
+    return posts
+
+
+def _fixture_cell(post: dict) -> str:
+    '''
+    One timeline cell, laid out the way X renders it (only the parts the XPaths of `src.py` go through).
+    '''
+    handle = post["User"][1:]
+    date = datetime.utcfromtimestamp(post["created_at"]).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    text = f'<span>{escape(post["text"])}</span>'
+    if post["emoji"]:
+        text += f'<img alt="{post["emoji"]}" src="https://abs-0.twimg.com/emoji/v2/svg/1f62d.svg">'
+    if post["link"]:
+        text += f'<a dir="ltr" href="https://t.co/x"><span>{post["link"]}</span></a>'
+    quoted = (f'<div role="link" tabindex="0"><div><div data-testid="tweetText"><span>{escape(post["quoted"])}</span></div></div></div>'
+              if post["quoted"] else "")
+    reply, repost, like, view = post["counts"]
+    return ('<div data-testid="cellInnerDiv" style="transform: translateY(0px); position: absolute;"><div><div>'
+            '<article data-testid="tweet" role="article" tabindex="0"><div><div>'
+            f'<div data-testid="User-Name"><a href="/{handle}" role="link"><div><span>{escape(post["User"])}</span></div></a>'
+            f'<a href="/{handle}/status/{post["Post_id"]}" role="link"><time datetime="{date}">{date[:10]}</time></a></div>'
+            f'<div><div><div><div><div data-testid="tweetText" dir="auto" lang="in">{text}</div></div></div></div></div>'
+            f'{quoted}'
+            '<div aria-label="" role="group">'
+            f'<div><button aria-label="{reply} Replies. Reply" data-testid="reply"></button></div>'
+            f'<div><button aria-label="{repost} reposts. Repost" data-testid="retweet"></button></div>'
+            f'<div><button aria-label="{like} Likes. Like" data-testid="like"></button></div>'
+            f'<div><a aria-label="{view} views. View post analytics" href="/{handle}/status/{post["Post_id"]}/analytics"></a></div>'
+            '</div></div></div></article></div></div></div>')
+
+
+def _timeline_page(cells: list[str]) -> str:
+    '''
+    Wrap cells into the search timeline, with the trailing loader cell X always has at the bottom.
+    '''
+    return ('<div aria-label="Timeline: Search timeline"><div style="position: relative;">' + "".join(f"<div>{c}</div>" for c in cells)
+            + '<div><div data-testid="cellInnerDiv"></div></div></div></div>')
+
+
+def _network_page(posts: list[dict]) -> dict:
+    '''
+    The same posts as a SearchTimeline GraphQL response.
+    '''
+    def tweet(post, text):
+        return {"__typename": "Tweet", "rest_id": str(post["Post_id"]),
+                "core": {"user_results": {"result": {"core": {"screen_name": post["User"][1:]}}}},
+                "views": {"count": str(post["counts"][3])},
+                "legacy": {"id_str": str(post["Post_id"]), "full_text": text,
+                           "created_at": datetime.utcfromtimestamp(post["created_at"]).strftime("%a %b %d %H:%M:%S +0000 %Y"),
+                           "reply_count": post["counts"][0], "retweet_count": post["counts"][1], "favorite_count": post["counts"][2],
+                           "entities": {"urls": [{"url": "https://t.co/x", "display_url": post["link"]}] if post["link"] else []}}}
+
+    entries = []
+    for post in posts:
+        result = tweet(post, post["text"] + post["emoji"] + (" https://t.co/x" if post["link"] else ""))
+        if post["quoted"]:
+            result["quoted_status_result"] = {"result": tweet(post, post["quoted"])}
+        entries.append({"entryId": f"tweet-{post['Post_id']}",
+                        "content": {"itemContent": {"tweet_results": {"result": result}}}})
+    entries.append({"entryId": "cursor-bottom", "content": {"cursorType": "Bottom", "value": "DAABCgABGQ"}})
+    return {"data": {"search_by_raw_query": {"search_timeline": {"timeline": {
+        "instructions": [{"type": "TimelineAddEntries", "entries": entries}]}}}}}
+
+
+def make_fixtures() -> None:
+    '''
+    Write `Benchmarks/fixtures`: the timeline HTML and SearchTimeline JSON of `FIXTURE_POSTS` posts, newest first.
+    '''
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    posts = _fixture_posts()
+    with gzip.open(TIMELINE_FIXTURE, "wt", encoding="utf-8") as f:
+        f.write(_timeline_page([_fixture_cell(p) for p in posts]))
+    with gzip.open(NETWORK_FIXTURE, "wt", encoding="utf-8") as f:
+        json.dump(_network_page(posts), f, ensure_ascii=False)
+
+
+def load_fixtures() -> tuple[str, str]:
+    with gzip.open(TIMELINE_FIXTURE, "rt", encoding="utf-8") as f:
+        page = f.read()
+    with gzip.open(NETWORK_FIXTURE, "rt", encoding="utf-8") as f:
+        body = f.read()
+    return page, body
+
+
+# Fake WebDriver
+class fakeElement:
+    '''
+    A WebElement over an lxml node. Every call counts as one WebDriver command of its driver, like a real round-trip would.
+    '''
+
+    def __init__(self, driver: "fakeDriver", node):
+        self._driver = driver
+        self._node = node
+
+    def find_element(self, by, path: str) -> "fakeElement":
+        self._driver.commands += 1
+        found = self._node.xpath(path)
+        if not found:
+            raise NoSuchElementException(path)
+        return fakeElement(self._driver, found[0])
+
+    def find_elements(self, by, path: str) -> list["fakeElement"]:
+        self._driver.commands += 1
+        return [fakeElement(self._driver, node) for node in self._node.xpath(path)]
+
+    @property
+    def tag_name(self) -> str:
+        self._driver.commands += 1
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        self._driver.commands += 1
+        return src._inner_text(self._node)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        self._driver.commands += 1
+        return self._node.get(name)
+
+
+class fakeDriver:
+    '''
+    Replays the fixture timeline. `get()` honours the `until_time`/`since_time` of the search url, every scroll renders
+    `CELLS_PER_SCROLL` more cells and only the last `RENDERED_CELLS` stay in the DOM, like X's virtualized list.
+
+    Answers the scripts of `src.py` (`PAGE_STATE_JS`, `OBSERVE_POSTS_JS`, `EXTRACT_POSTS_JS`, `TIMELINE_HTML_JS`) and the
+    XPaths of the "webdriver" extraction mode.
+    '''
+
+    def __init__(self, page: str):
+        root = lxml_html.fromstring(page)
+        cells = root.xpath('//div[@aria-label="Timeline: Search timeline"]/div/div')[:-1]
+        self.cells = [lxml_html.tostring(cell[0], encoding="unicode") for cell in cells]
+        self.raws = src._timeline_html_raws(page)
+        self.times = [src.snowflake_to_unix(int(raw["Post_id"])) for raw in self.raws]
+        self.commands = 0
+        self.current = []
+        self.visible = 0
+        self.drained = 0
+        self._dom = None
+
+    def get(self, url: str) -> None:
+        self.commands += 1
+        query = unquote(url)
+        until = re.search(r"until_time:(\d+)", query)
+        since = re.search(r"since_time:(\d+)", query)
+        until = int(until.group(1)) if until else float("inf")
+        since = int(since.group(1)) if since else 0
+        self.current = [i for i, t in enumerate(self.times) if since <= t < until]
+        self.visible = min(CELLS_PER_SCROLL, len(self.current))
+        self.drained = 0
+        self._dom = None
+
+    def _rendered(self) -> list[int]:
+        return self.current[max(0, self.visible - RENDERED_CELLS):self.visible]
+
+    def execute_script(self, script: str, *args):
+        self.commands += 1
+        if script == src.PAGE_STATE_JS:
+            return {"cells": self.visible, "height": self.visible * 600, "requests": 0, "error": False}
+        if script == src.OBSERVE_POSTS_JS:
+            fresh = self.current[self.drained:self.visible]
+            self.drained = self.visible
+            return [dict(self.raws[i]) for i in fresh]
+        if script == src.EXTRACT_POSTS_JS:
+            return [dict(self.raws[i]) for i in self._rendered()]
+        if script == src.TIMELINE_HTML_JS:
+            return _timeline_page([self.cells[i] for i in self._rendered()])
+        if "scrollTo" in script:
+            self.visible = min(len(self.current), self.visible + CELLS_PER_SCROLL)
+            self._dom = None
+            return None
+        return None
+
+    def _root(self) -> fakeElement:
+        if self._dom is None:
+            self._dom = lxml_html.fromstring(_timeline_page([self.cells[i] for i in self._rendered()]))
+        return fakeElement(self, self._dom)
+
+    def find_element(self, by, path: str) -> fakeElement:
+        return self._root().find_element(by, path)
+
+    def find_elements(self, by, path: str) -> list[fakeElement]:
+        return self._root().find_elements(by, path)
+
+    def quit(self) -> None:
+        pass
+
+
+class benchScrapper(twitterScrapper):
+    '''
+    `twitterScrapper` logged in on a `fakeDriver` instead of Chrome.
+    '''
+
+    def __init__(self, credentials: str, page: str):
+        self._fixture_page = page
+        super().__init__(credentials, sessionCache=False)
+
+    def _login_account(self) -> None:
+        self.driver = fakeDriver(self._fixture_page)
+
+
+# Benchmarks
+def best_of(repeat: int, run: Callable[[], Any], setup: Optional[Callable[[], Any]] = None) -> float:
+    '''
+    Best wall time in seconds of `repeat` calls of `run`, each after an untimed `setup`. The garbage collector is off while
+    timing, like `timeit` does, so a collection landing in one run doesn't skew it.
+    '''
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return best
+
+
+def calibrate(repeat: int) -> float:
+    '''
+    Time a fixed pure Python workload, so timings can be compared to the baseline relative to how fast the machine is right now.
+    '''
+    def workload():
+        generator = rd.Random(3)
+        rows = [{"id": generator.getrandbits(63), "text": " ".join(generator.sample(WORDS, 12))} for _ in range(20_000)]
+        json.loads(json.dumps(rows))
+        sorted(rows, key=lambda row: row["text"])
+
+    return best_of(repeat, workload)
+
+
+def bench_extraction(page: str, body: str, repeat: int) -> dict[str, float]:
+    '''
+    Throughput of turning one captured batch into posts, for every kind of batch `_capture_batch` can return.
+    '''
+    raws = src._timeline_html_raws(page)
+    batches = [copy.deepcopy(raws) for _ in range(EXTRACT_ROUNDS * repeat)]     # Converted in place, one fresh copy per round
+    posts = len(raws) * EXTRACT_ROUNDS
+
+    def rounds(parse):
+        return lambda: [parse() for _ in range(EXTRACT_ROUNDS)]
+
+    results = {
+        "extract.html.posts_per_sec": posts / best_of(repeat, rounds(lambda: src.parse_timeline_html(page))),
+        "extract.script.posts_per_sec": posts / best_of(repeat, rounds(lambda: src.convert_extracted_posts(batches.pop()))),
+        "extract.network.posts_per_sec": posts / best_of(repeat, rounds(lambda: src.parse_search_timeline(json.loads(body)))),
+    }
+
+    # The element by element WebDriver walk, over the whole fixture rendered at once
+    driver = fakeDriver(page)
+    driver._dom = lxml_html.fromstring(page)
+    session = twitterScrapper.__new__(twitterScrapper)
+    session.driver = driver
+    walked = {}
+    seconds = best_of(repeat, rounds(lambda: walked.update(posts=len(list(session._walk_post_elements())))))
+    if walked["posts"] != len(raws):
+        raise RuntimeError(f"The WebDriver walk read {walked['posts']} of the {len(raws)} fixture posts.")
+    results["extract.webdriver.posts_per_sec"] = posts / seconds
+    return results
+
+
+def bench_scrape(credentials: str, page: str, repeat: int) -> dict[str, float]:
+    '''
+    A whole `start()` over the replayed timeline for every extraction mode.
+    '''
+    results = {}
+    times = fakeDriver(page).times
+    for mode in ("observer", "script", "snapshot", "webdriver"):
+        session = benchScrapper(credentials, page)
+        counts = {}
+
+        def run():
+            session.account.driver = session.driver = fakeDriver(page)
+            session.start(dict(FILTERS), startDate=int(max(times)) + 1, endDate=int(min(times)), scraping_Params=dict(SCRAPING_PARAMS),
+                          processDir=f"scrape_{mode}", resume_from_savepoint=False, autoSave=True, autoSaveInterval=100,
+                          extractionMode=mode)
+            counts["posts"] = len(session.theDict)
+            counts["commands"] = session.driver.commands
+
+        seconds = best_of(repeat, run)
+        if counts["posts"] != len(times):
+            raise RuntimeError(f"extractionMode={mode} collected {counts['posts']} of the {len(times)} fixture posts.")
+        results[f"scrape.{mode}.posts_per_sec"] = counts["posts"] / seconds
+        results[f"scrape.{mode}.commands_per_post"] = counts["commands"] / counts["posts"]
+    return results
+
+
+def _synthetic_rows(rows: int, page: str) -> list[dict]:
+    '''
+    `rows` posts as scraped, cycling through the fixture posts with fresh ids going back in time.
+    '''
+    template = src.parse_timeline_html(page)
+    newest = template[0]["Date"]
+    posts = []
+    for i in range(rows):
+        ts = newest - i * 60
+        posts.append({**template[i % len(template)], "Date": ts,
+                      "Post_id": ((ts * 1000 - src.TWITTER_EPOCH_MS) << 22) | (i & 0x3FFFFF)})
+    return posts
+
+
+def bench_persistence(credentials: str, page: str, sizes: list[int], repeat: int) -> dict[str, float]:
+    '''
+    Savepoint, final CSV and resume latency with a growing number of collected posts.
+    '''
+    results = {}
+    session = benchScrapper(credentials, page)
+    for rows in sizes:
+        new_rows = 100
+        runs = max(1, repeat if rows <= 100_000 else 1)     # A million rows takes a while, once is enough
+        posts = _synthetic_rows(rows + new_rows * runs, page)
+        # maxPages=0 only sets the run up (and writes an empty savepoint), nothing is scraped
+        session.start(dict(FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir=f"persist_{rows}",
+                      resume_from_savepoint=False, autoSave=True, autoSaveInterval=new_rows, maxPages=0)
+        session.theDict = src.postBuffer(posts[:rows])
+        session.save("savepoint")      # Everything collected so far is in the journal already
+
+        def collect_new_rows():
+            have = len(session.theDict)
+            for post in posts[have:have + new_rows]:
+                session.theDict.append(post)
+
+        results[f"savepoint.{rows}.seconds"] = best_of(runs, lambda: session.save("savepoint"), setup=collect_new_rows)
+        results[f"final_csv.{rows}.seconds"] = best_of(runs, lambda: session.save("final"))
+
+        def resume():
+            session._load_latest_savepoint()
+            session._rebuild_seen()
+
+        results[f"resume.{rows}.seconds"] = best_of(runs, resume)
+        if len(session._seen) != len(posts):
+            raise RuntimeError(f"Resumed {len(session._seen)} of {len(posts)} posts.")
+        session.theDict = src.postBuffer()
+        shutil.rmtree(f"Process/persist_{rows}", ignore_errors=True)
+    return results
+
+
+def bench_memory(page: str, rows: int = 100_000) -> dict[str, float]:
+    '''
+    Bytes `theDict` allocates per collected post. The synthetic posts share their texts, so those aren't counted.
+    '''
+    posts = _synthetic_rows(rows, page)
+    tracemalloc.start()
+    try:
+        buffer = src.postBuffer(posts)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return {"buffer.bytes_per_post": allocated / len(buffer)}
+
+
+def run(sizes: list[int], repeat: int) -> dict[str, float]:
+    '''
+    Run every benchmark in a scratch directory (`start()` writes under `Process/`) and return the metrics.
+    '''
+    if lxml_html is None:
+        raise ImportError("The benchmark replays HTML fixtures and needs lxml, install it with `pip install lxml`.")
+    page, body = load_fixtures()
+    # Imported lazily by `src`, load them up front so the first timed run doesn't pay for them
+    import pandas
+    import selenium.webdriver.support.wait, selenium.webdriver.support.expected_conditions
+    calibration = calibrate(repeat)
+    results = bench_extraction(page, body, repeat)
+    results.update(bench_memory(page))
+
+    cwd = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix="xscraper_bench_")
+    try:
+        os.chdir(scratch)
+        with open("credentials.json", "w") as f:
+            json.dump({"username": "bench", "password": "bench", "email": "bench@example.com"}, f)
+        with contextlib.redirect_stdout(io.StringIO()):     # The scraper is chatty
+            results.update(bench_scrape("credentials.json", page, repeat))
+            results.update(bench_persistence("credentials.json", page, sizes, repeat))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+    results["calibration.seconds"] = min(calibration, calibrate(repeat))    # Before and after, in case the machine got busier
+    return results
+
+
+# Baseline
+def higher_is_better(name: str) -> bool:
+    return name.endswith("per_sec")
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    '''
+    Print the results next to the baseline and return the metrics that got worse by more than the tolerance.
+
+    Timings are scaled by how much slower or faster the calibration workload ran than when the baseline was saved.
+    '''
+    regressions = []
+    speed = results["calibration.seconds"] / baseline["calibration.seconds"] if baseline.get("calibration.seconds") else 1.0
+    print(f"{'metric':<40}{'result':>14}{'baseline':>14}{'change':>10}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<40}{value:>14.4g}{'-':>14}{'':>10}")
+            continue
+        if name.endswith("per_sec"):
+            base /= speed
+        elif name.endswith(".seconds") and name != "calibration.seconds":
+            base *= speed
+        change = value / base - 1
+        allowed = COMMAND_TOLERANCE if name.endswith(("commands_per_post", "bytes_per_post")) else tolerance
+        worse = change < -allowed if higher_is_better(name) else change > allowed and name != "calibration.seconds"
+        print(f"{name:<40}{value:>14.4g}{base:>14.4g}{change:>+10.1%}{'  REGRESSION' if worse else ''}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the scraper's extraction and persistence hot paths.")
+    parser.add_argument("--check", action="store_true", help="Fail (exit code 1) on a regression against the baseline.")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Store the results in {BASELINE_PATH}.")
+    parser.add_argument("--make-fixtures", action="store_true", help="Regenerate the fixtures and exit.")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Collected posts to benchmark savepoints/resume at.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark, the best one counts.")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown against the baseline, 0.3 is 30%%.")
+    args = parser.parse_args(argv)
+
+    if args.make_fixtures:
+        make_fixtures()
+        print(f"Fixtures written to {FIXTURE_DIR}")
+        return 0
+
+    results = run([int(s) for s in args.sizes.split(",") if s], args.repeat)
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["metrics"]
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"created": datetime.now().strftime(src.DATE_FORMAT), "machine": platform.platform(),
+                       "python": platform.python_version(), "metrics": {**baseline, **results}}, f, indent=4)
+        print(f"Baseline saved to {BASELINE_PATH}")
+
+    if args.check and regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,61 @@
-import pandas as pd
 import json
+import html
 import time
-from tqdm import tqdm
 from typing import *
 import re
 import os
-from IPython.display import clear_output
+import sys
 import shutil
+import threading
+from queue import Queue
+from collections import deque
 from datetime import datetime, timedelta
 import warnings
 import random as rd
-# Scrapping and crawling modules
-import undetected_chromedriver as uc
-from requests.utils import quote, unquote
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+import base64
+import hashlib
+import gzip
+import bisect
+import heapq
+import itertools
+import contextlib
+from array import array
+pa = pq = None              # pyarrow, imported by `_import_pyarrow` once saveFormat "parquet" or "arrow" is used
+Fernet = InvalidToken = None    # cryptography, imported by `_import_fernet` for the session cache, which is off without it
+lxml_html = None            # Imported by `_import_lxml`, only needed for extractionMode "snapshot" and `parse_snapshots`
+from urllib.parse import quote, unquote
+# Scrapping and crawling modules. pandas, undetected_chromedriver, selenium's waits, tqdm and IPython are heavy, they're only
+# imported where they're used so `import src` stays quick for the CLI and offline parsing. So are sqlite3, multiprocessing,
+# http.server and cProfile, which only some options need
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
-print(F'Timezone: {time.strftime("%z", time.gmtime())}')
+SESSION_DIR = "Credentials/Sessions"    # Encrypted cookies/localStorage per username, see `twitterScrapper._save_session`
+ROW_GROUP_SIZE = 10_000                 # Posts per Parquet row group / Arrow record batch written during the scrape
+PIPELINE_DEPTH = 4                      # Raw batches the browser thread can get ahead of the parse/save thread
+# What the light driver profile (`twitterScrapper(lightProfile=True)`) blocks through CDP: media, avatars and fonts the
+# scraper never reads. Emojis are <img> too, but their alt text (what `_parse_post` reads) is in the DOM either way
+BLOCKED_URLS = ["*pbs.twimg.com/media/*", "*pbs.twimg.com/profile_images/*", "*pbs.twimg.com/profile_banners/*",
+                "*pbs.twimg.com/card_img/*", "*pbs.twimg.com/ext_tw_video_thumb/*", "*pbs.twimg.com/amplify_video_thumb/*",
+                "*pbs.twimg.com/tweet_video_thumb/*", "*video.twimg.com/*", "*.mp4*", "*.m3u8*", "*.m4s*",
+                "*.woff", "*.woff2", "*.ttf", "*.otf"]
+# Viewport of the light profile in CSS pixels: tall, so every scroll renders more timeline cells (what zooming the browser out
+# to 25% did by hand), with a low scale factor so painting it stays cheap
+LIGHT_VIEWPORT = {"width": 1280, "height": 4000, "deviceScaleFactor": 0.25, "mobile": False}
+MANIFEST_VERSION = 1                    # Layout of `Savepoints/manifest.json`, see `twitterScrapper._write_manifest`
+FOLLOW_OVERLAP = 900                    # Seconds a follow run looks back past the high-water mark, for posts X indexed late
+METRICS_INTERVAL = 60                   # Seconds between lines of `Process/<processDir>/metrics.jsonl`
+METRICS_HOST = "127.0.0.1"              # Interface the metrics endpoint listens on, only this machine by default
+SNAPSHOT_LIMIT = 512 * 1024 ** 2        # Bytes of gzipped HTML snapshots kept per processDir, the oldest ones go first
+POST_COLUMNS = ["User", "Date", "post_text", "quotedPost_text", "Reply_count", "Repost_count", "Like_count", "View_count", "Post_id"]
+COUNT_COLUMNS = ("Reply_count", "Repost_count", "Like_count", "View_count")
+DATE_FORMAT = "%Y-%m-%d-%H:%M:%S"       # Exported dates, in local time. In memory they're unix timestamps, see `postBuffer`
+TWITTER_EPOCH_MS = 1288834974657        # Epoch of X's Snowflake ids, in unix milliseconds
 
+# Every search filter `start()` understands, with the value that leaves it out of the query
+SEARCH_FILTERS = {"all_these_words": "", "this_exact_phrase": "", "any_of_these_words": "", "none_of_these_words": "",
+                  "these_hashtags": "", "from_accounts": "", "to_accounts": "", "mentioning_accounts": "", "language": "",
+                  "Minimum_replies": "", "Minimum_likes": "", "Minimum_retweets": "", "links": True, "replies": True}
 
 lang_codes = {'Arabic': 'ar',
             'Arabic (Feminine)': 'ar-x-fm',
@@ -65,6 +101,179 @@ lang_codes = {'Arabic': 'ar',
             'Urdu': 'ur',
             'Vietnamese': 'vi'}
 
+# Shared by the in-page extractors below. Mirrors the XPaths used by `_extract_post_data`, `_parse_post` and the role="group"
+# metrics loop. `extractCell` returns null for ads, "show more" rows and half-rendered cells.
+POST_JS_HELPERS = r'''
+const first = (root, path) => document.evaluate(path, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const all = (root, path) => {
+    const snap = document.evaluate(path, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+    return out;
+};
+const parsePost = (el) => {
+    let text = "";
+    for (const p of all(el, ".//span | .//img | .//a[@dir='ltr']")) {
+        const tag = p.tagName.toLowerCase();
+        if (tag === "img") text += p.getAttribute("alt") || "";     // Emojis
+        else if (tag === "a") text += p.innerText + " ";            // Links
+        else text += p.innerText;                                   // Normal text
+    }
+    return text;
+};
+const aria = (group, path) => {
+    const el = group ? first(group, path) : null;
+    return el ? el.getAttribute("aria-label") : "";
+};
+const extractCell = (cell) => {
+    const post = first(cell, './/div[not(@role="link")]/div/div/div/div/div[@data-testid="tweetText"]');
+    const time = first(cell, './/time');
+    const user = first(cell, './/a/div/span');
+    if (!post || !time || !user) return null;
+
+    const quoted = first(cell, './/div[@role="link"]');
+    const group = first(cell, './/div[@role="group"]');
+    const permalink = time.closest("a");
+    const status = permalink ? (permalink.getAttribute("href") || "").match(/\/status\/(\d+)/) : null;
+    return {
+        "Post_id": status ? status[1] : null,      // String, status ids don't fit in a JS number
+        "post_text": parsePost(post),
+        "quotedPost_text": quoted ? all(quoted, './/div[@data-testid="tweetText"]/span').map(s => s.innerText).join("") : "",
+        "User": user.innerText,
+        "Date": time.getAttribute("datetime"),
+        "Reply_count": aria(group, './/div[1]/button'),
+        "Repost_count": aria(group, './/div[2]/button'),
+        "Like_count": aria(group, './/div[3]/button'),
+        "View_count": aria(group, './/div[4]/a'),
+    };
+};
+'''
+
+# Runs in the browser and pulls every visible post in one go, so we don't pay a WebDriver round-trip per span/img/link.
+EXTRACT_POSTS_JS = POST_JS_HELPERS + r'''
+const cells = all(document, '//div[@aria-label="Timeline: Search timeline"]/div/div').slice(0, -1);
+return cells.map(extractCell).filter(post => post !== null);
+'''
+
+# Installs (once per page load) a MutationObserver on the search timeline that marks every cell that gets added or changed, so cells
+# X recycles while scrolling are picked up too. Marked cells are extracted shortly after they settle and each post is queued exactly once.
+# Every call drains the queue, so one round-trip per scroll step only returns the posts that are new since the previous one.
+OBSERVE_POSTS_JS = POST_JS_HELPERS + r'''
+const CELL = 'div[data-testid="cellInnerDiv"]';
+const TIMELINE = '[aria-label="Timeline: Search timeline"]';
+
+if (!window.__postObserver) {
+    const state = window.__postObserver = {queue: [], queued: new Set(), dirty: new Set(), timer: null, timeline: null};
+    state.harvest = () => {
+        state.timer = null;
+        for (const cell of state.dirty) {
+            state.dirty.delete(cell);               // Not a post (yet)? Its next mutation marks it again
+            if (!cell.isConnected || cell.closest(TIMELINE) === null) continue;
+            const post = extractCell(cell);
+            if (!post) continue;
+            const key = post.Post_id || [post.User, post.Date, post.post_text].join("\u0000");
+            if (state.queued.has(key)) continue;
+            state.queued.add(key);
+            state.queue.push(post);
+        }
+    };
+    // A change inside a cell marks that cell, an added subtree marks the cells in it
+    const cellOf = (node) => {
+        if (node.nodeType !== Node.ELEMENT_NODE) node = node.parentElement;
+        return node ? node.closest(CELL) : null;
+    };
+    const mark = (node) => {
+        const cell = cellOf(node);
+        if (cell) state.dirty.add(cell);
+        else if (node.nodeType === Node.ELEMENT_NODE) node.querySelectorAll(CELL).forEach(c => state.dirty.add(c));
+    };
+    state.observer = new MutationObserver((records) => {
+        for (const record of records) {
+            const cell = cellOf(record.target);
+            if (cell) state.dirty.add(cell);
+            record.addedNodes.forEach(mark);
+        }
+        if (state.timer === null) state.timer = setTimeout(state.harvest, 50);
+    });
+    // Only the timeline is watched. It may not have rendered yet, or X may have swapped it, so it's looked up again every call
+    state.attach = () => {
+        const timeline = document.querySelector(TIMELINE);
+        if (timeline === state.timeline) return;
+        state.observer.disconnect();
+        state.timeline = timeline;
+        if (timeline === null) return;
+        state.observer.observe(timeline, {childList: true, subtree: true});
+        timeline.querySelectorAll(CELL).forEach(c => state.dirty.add(c));     // Whatever rendered before the observer
+    };
+}
+
+const state = window.__postObserver;
+state.attach();
+state.harvest();
+const out = state.queue;
+state.queue = [];
+return out;
+'''
+
+# Raw HTML of the search timeline, parsed off the browser by `parse_timeline_html`.
+TIMELINE_HTML_JS = r'''
+const timeline = document.querySelector('div[aria-label="Timeline: Search timeline"]');
+return timeline ? timeline.outerHTML : "";
+'''
+
+# Cheap snapshot of the page polled by `_wait_for_page_change`: timeline cells, page height, the detection message and how many
+# resources were fetched since the previous poll (the buffer is cleared every call, so it can't fill up and look idle).
+# Counts the page's fetch/XHR requests until their body is in, injected into every document (see `_build_driver`). A resource
+# timing entry only shows up once a request is done, so a SearchTimeline request still loading would look like a quiet network
+INFLIGHT_TRACKER_JS = r'''
+(() => {
+    if (window.__xscraperInflight !== undefined) return;
+    window.__xscraperInflight = 0;
+    const done = () => { window.__xscraperInflight = Math.max(0, window.__xscraperInflight - 1); };
+    const fetch = window.fetch;
+    window.fetch = function (...args) {
+        window.__xscraperInflight++;
+        return fetch.apply(this, args).then(
+            (response) => { response.clone().arrayBuffer().then(done, done); return response; },
+            (error) => { done(); throw error; });
+    };
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        window.__xscraperInflight++;
+        this.addEventListener("loadend", done, {once: true});
+        return send.apply(this, args);
+    };
+})();
+'''
+
+PAGE_STATE_JS = r'''
+const error = document.evaluate('//div[@aria-label="Home timeline"]/div/div/div/span', document, null,
+                                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const requests = performance.getEntriesByType("resource").length;
+performance.clearResourceTimings();
+return {
+    "cells": document.querySelectorAll('div[data-testid="cellInnerDiv"]').length,
+    "height": document.body.scrollHeight,
+    "requests": requests,
+    "inflight": window.__xscraperInflight || 0,
+    "error": error !== null,
+};
+'''
+
+# Requests the next page of a search for the network backend, the way X's own infinite scroll does: the last SearchTimeline
+# request again (same url and headers), with the bottom cursor of the previous response in its variables. Run through
+# `execute_async_script`, it calls back once the body is in, and Chrome logs the response like any other (`_capture_network_bodies`).
+NEXT_PAGE_JS = r'''
+const [url, headers, cursor, done] = arguments;
+const next = new URL(url);
+const variables = JSON.parse(next.searchParams.get("variables"));
+variables.cursor = cursor;
+next.searchParams.set("variables", JSON.stringify(variables));
+fetch(next.toString(), {headers: headers, credentials: "include"})
+    .then((response) => response.text().then(() => done(response.status)))
+    .catch(() => done(0));
+'''
+
 def getTime(str: str) -> datetime:
 
     '''
@@ -104,10 +313,48 @@ def safelyTurnStrToUnixTime(str: str) -> int:
     - int
         unix timestamp of the given datetime string
     '''
-    dt = datetime.strptime(str, "%Y-%m-%d-%H:%M:%S")
+    dt = datetime.strptime(str, DATE_FORMAT)
     unix_timestamp = int(dt.timestamp())
     return unix_timestamp
 
+
+def iso_to_unix(iso: str) -> int:
+    '''
+    Turn an ISO 8601 datetime, like the `datetime` attribute of a post's <time> ("2026-01-19T06:19:18.000Z"), to a unix timestamp.
+    '''
+    return int(datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp())
+
+
+def format_date(timestamp: int) -> str:
+    '''
+    Format a unix timestamp the way dates are exported, "YYYY-MM-DD-HH:MM:SS" in local time (`DATE_FORMAT`).
+    '''
+    return "%04d-%02d-%02d-%02d:%02d:%02d" % time.localtime(timestamp)[:6]     # Same as strftime(DATE_FORMAT), a lot quicker
+
+
+def format_dates(timestamps: Iterable[int]) -> list[str]:
+    '''
+    `format_date` over many timestamps, calling `localtime` once per quarter hour only (UTC offsets are multiples of 15 minutes,
+    so minutes and seconds within a quarter hour carry over as they are).
+    '''
+    quarters = {}
+    dates = []
+    for timestamp in timestamps:
+        quarter, rest = divmod(timestamp, 900)
+        prefix = quarters.get(quarter)
+        if prefix is None:
+            local = time.localtime(quarter * 900)
+            prefix = quarters[quarter] = ("%04d-%02d-%02d-%02d:" % local[:4], local[4])
+        dates.append("%s%02d:%02d" % (prefix[0], prefix[1] + rest // 60, rest % 60))
+    return dates
+
+
+def date_to_unix(value: Union[int, str]) -> int:
+    '''
+    Unix timestamp of a post date, either kept in memory (already one) or exported ("YYYY-MM-DD-HH:MM:SS", e.g. read back from a file).
+    '''
+    return value if isinstance(value, int) else safelyTurnStrToUnixTime(value)
+
 def minOneDay(time: int) -> int:
     '''
     This function is used to subtract one day from the given date
@@ -128,6 +375,159 @@ def minOneDay(time: int) -> int:
     
     return date_time_obj
 
+def plan_shards(start: int, end: int, shard_days: int = 7) -> list[tuple[int, int]]:
+    '''
+    Split the [end, start] date range into consecutive windows, newest first.
+
+    Parameters
+    -----------
+    - start: int
+        unix timestamp of the latest date (upper limit)
+    - end: int
+        unix timestamp of the earliest date (lower limit)
+    - shard_days: int
+        Length of each window in days
+
+    Returns
+    -----------
+    - list[tuple[int, int]]
+        List of (since, until) unix timestamps
+    '''
+    windows = []
+    until = start
+    while until > end:
+        since = max(end, until - shard_days * 86400)
+        windows.append((since, until))
+        until = since
+    return windows
+
+def split_accounts(credentials: list[str], workers: int) -> list[list[str]]:
+    '''
+    Deal the credentials files out to the shard workers, so no account is logged in by two workers at once.
+
+    Parameters
+    -----------
+    - credentials: list[str]
+        Paths to the credentials files of the pool
+    - workers: int
+        Number of worker processes
+
+    Returns
+    -----------
+    - list[list[str]]
+        One non-empty slice of the credentials per worker
+
+    Raises
+    -----------
+    - ValueError
+        If there are more workers than accounts
+    '''
+    if workers > len(credentials):
+        raise ValueError(f"workers={workers} needs at least {workers} credentials files, got {len(credentials)}. "
+                         "Every worker logs in with its own accounts.")
+    return [credentials[i::workers] for i in range(workers)]
+
+def build_query(filters: dict) -> str:
+    '''
+    Compose the X search query of the given filters (see `twitterScrapper.start`), without the date operators.
+
+    Parameters
+    -----------
+    - filters: dict
+        The filters, left out keys default to `SEARCH_FILTERS` (not used in the query). The dict isn't touched.
+
+    Returns
+    -----------
+    - str
+        The URL-quoted query
+    '''
+    filters = {**SEARCH_FILTERS, **filters}     # Left out filters aren't used, the caller's dict isn't touched
+
+    # Adjust filters values
+    filters["this_exact_phrase"] = f'\"{filters["this_exact_phrase"]}\"' if filters["this_exact_phrase"] != "" else ""
+    _any_terms = []
+    _any_raw = filters["any_of_these_words"].strip()
+    if _any_raw:
+        for g1, g2, g3 in re.findall(r'"([^"]+)"|\'([^\']+)\'|(\S+)', _any_raw):
+            _any_terms.append(g1 or g2 or g3)
+    filters["any_of_these_words"] = (
+        f'({" OR ".join(_any_terms)})' if _any_terms else ""
+    )
+    filters["none_of_these_words"] = f'{" ".join(f"-{i}" for i in filters["none_of_these_words"].split())}' if filters["none_of_these_words"] != "" else ""
+    filters["these_hashtags"] = f'({" OR ".join(f"{i}" for i in filters["these_hashtags"].split())})' if filters["these_hashtags"] != "" else ""
+
+    filters["from_accounts"] = f'({" OR ".join(f"from:{i}" for i in filters["from_accounts"].split())})' if filters["from_accounts"] != "" else ""
+    filters["to_accounts"] = f'({" OR ".join(f"to:{i}" for i in filters["to_accounts"].split())})' if filters["to_accounts"] != "" else ""
+    filters["mentioning_accounts"] = f'({" OR ".join(f"@{i}" for i in filters["mentioning_accounts"].split())})' if filters["mentioning_accounts"] != "" else ""
+
+    filters["language"] = f'lang:{lang_codes[filters["language"]]}' if filters["language"] != "" else ""
+    filters["replies"] = "" if filters["replies"] else "-filter:replies" 
+    filters["links"] = "" if filters["links"] else "-filter:links"
+
+    filters["Minimum_replies"] = f'min_replies:{filters["Minimum_replies"]}' if filters["Minimum_replies"] != "" else ""
+    filters["Minimum_likes"] = f'min_faves:{filters["Minimum_likes"]}' if filters["Minimum_likes"] != "" else ""
+    filters["Minimum_retweets"] = f'min_retweets:{filters["Minimum_retweets"]}' if filters["Minimum_retweets"] != "" else ""
+
+    FILTERS_COMBINATION = ""
+    for _, value in filters.items():
+        if value != "":
+            FILTERS_COMBINATION += f'{value} '
+
+    return quote(FILTERS_COMBINATION.strip())
+
+def refresh_priority(posted: int, last: tuple[int, int], previous: tuple[int, int], now: int) -> float:
+    '''
+    How urgently the counts of a post need refreshing (see `twitterScrapper.refresh`): the interactions (replies + reposts + likes)
+    it gained per hour between its two latest snapshots, plus a small bonus for recent posts so ties go to the newest.
+
+    Parameters
+    -----------
+    - posted: int
+        unix timestamp of the post
+    - last: tuple[int, int]
+        (unix timestamp, interactions) of the latest snapshot
+    - previous: tuple[int, int]
+        (unix timestamp, interactions) of the snapshot before, or (posted, 0) if there's none
+    - now: int
+        unix timestamp of now
+
+    Returns
+    -----------
+    - float
+        The priority, higher goes first
+    '''
+    hours = max((last[0] - previous[0]) / 3600, 1)
+    return (last[1] - previous[1]) / hours + 1 / max((now - posted) / 3600, 1)
+
+def plan_refresh_windows(dates: list[int], selected: Iterable[int], window_posts: int = 200) -> list[tuple[int, int]]:
+    '''
+    Group the posts to refresh into search windows, newest first, each holding at most `window_posts` posts of the dataset.
+    The posts in between that weren't selected get refreshed too, they're on the page anyway.
+
+    Parameters
+    -----------
+    - dates: list[int]
+        Sorted unix timestamps of every post of the dataset
+    - selected: Iterable[int]
+        unix timestamps of the posts to refresh
+    - window_posts: int
+        Most posts of the dataset per window (unless a single second holds more)
+
+    Returns
+    -----------
+    - list[tuple[int, int]]
+        List of (since, until) unix timestamps, `until` excluded
+    '''
+    windows = []
+    for date in sorted(selected, reverse=True):
+        if windows and date >= windows[-1][0]:
+            continue        # Already in the window
+        if windows and bisect.bisect_left(dates, windows[-1][1]) - bisect.bisect_left(dates, date) <= window_posts:
+            windows[-1] = (date, windows[-1][1])
+        else:
+            windows.append((date, date + 1))
+    return windows
+
 def wait(timeout: int = 10) -> None:
     '''
     just a glorified simple function to wait for a certain amount of time with a progress bar.
@@ -137,9 +537,96 @@ def wait(timeout: int = 10) -> None:
     - timeout: int
         Time to wait in seconds
     '''
+    from tqdm import tqdm
     for _ in tqdm(range(timeout), desc="Waiting"):
         time.sleep(1)
-    clear_output()
+    if "IPython" in sys.modules:    # Running in a notebook, clear the bar
+        from IPython.display import clear_output
+        clear_output()
+
+
+def wait_for_xpath(driver, timeout: float, xpath: str):
+    '''
+    Wait until an element matching `xpath` is on the page, see selenium's `WebDriverWait`.
+
+    Parameters
+    -----------
+    - driver : WebDriver
+        The driver.
+    - timeout : float
+        Longest wait in seconds.
+    - xpath : str
+        XPath of the element.
+
+    Returns
+    -------
+    - WebElement
+        The element.
+
+    Raises
+    ------
+    - TimeoutException
+        If it didn't show up in time.
+    '''
+    # selenium's wait module pulls in the whole webdriver package, only load it once there's a browser to wait on
+    from selenium.webdriver.support.wait import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.XPATH, xpath)))
+
+
+def _atomic_write_json(path: str, obj) -> None:
+    '''
+    Write `obj` as JSON to `path` through a temp file that is fsynced before it replaces `path`, so a crash leaves either the
+    old file or the new one, never a torn or empty one.
+    '''
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{path}.tmp", path)
+
+
+def _import_pyarrow() -> bool:
+    '''
+    Import pyarrow into the module globals `pa` and `pq` on first use. Returns False if it's not installed.
+    '''
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            return False
+        pa, pq = pyarrow, pyarrow.parquet
+    return True
+
+
+def _import_fernet() -> bool:
+    '''
+    Import cryptography's `Fernet` and `InvalidToken` into the module globals on first use. Returns False if it's not installed.
+    '''
+    global Fernet, InvalidToken
+    if Fernet is None:
+        try:
+            from cryptography.fernet import Fernet as fernet, InvalidToken as invalid_token
+        except ImportError:
+            return False
+        Fernet, InvalidToken = fernet, invalid_token
+    return True
+
+
+def _import_lxml() -> bool:
+    '''
+    Import `lxml.html` into the module global `lxml_html` on first use. Returns False if it's not installed.
+    '''
+    global lxml_html
+    if lxml_html is None:
+        try:
+            import lxml.html
+        except ImportError:
+            return False
+        lxml_html = lxml.html
+    return True
 
 
 def safe_int_from_aria(aria_label: str) -> int:
@@ -160,329 +647,3209 @@ def safe_int_from_aria(aria_label: str) -> int:
     return int(match.group(0)) if match else 0
 
 
+def status_id_from_href(href: str) -> Optional[int]:
+    '''
+    Get the status id out of a post permalink ("/<user>/status/<id>" or the full url). Returns None if there's none.
+    '''
+    match = re.search(r"/status/(\d+)", href or "")
+    return int(match.group(1)) if match else None
 
-class twitterScrapper:
+
+def snowflake_to_unix(post_id: int) -> float:
     '''
-    This class is used to scrape posts from X (formerly known as Twitter) based on given filters and date range.
-    
-    Methods
+    Get the creation time of a post out of its Snowflake status id (the top 41 bits are milliseconds since `TWITTER_EPOCH_MS`).
+
+    Parameters
     ----------
-    - login()
-        - Logs into Twitter using the provided credentials
-    - start()
-        - Starts the scraping process based on the given filters and date range
+    - post_id : int
+        The status id of the post.
+
+    Returns
+    -------
+    - float
+        unix timestamp of when the post was created.
+    '''
+    return ((post_id >> 22) + TWITTER_EPOCH_MS) / 1000
+
+
+class compactIdSet:
+    '''
+    Set of 64-bit post keys, 8 bytes per key instead of a Python object per key.
+
+    Keys live in a sorted `array('q')` and are looked up by bisection. New keys go to a small pending set first, which is merged
+    into the array once it grows past 1/8 of it, so merging stays O(n log n) overall.
+    '''
+    def __init__(self, keys: Iterable[int] = ()):
+        self._sorted = array("q", sorted(set(keys)))
+        self._pending = set()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+
+    def __contains__(self, key: int) -> bool:
+        if key in self._pending:
+            return True
+        i = bisect.bisect_left(self._sorted, key)
+        return i < len(self._sorted) and self._sorted[i] == key
+
+    def add(self, key: int) -> None:
+        if key in self:
+            return
+        self._pending.add(key)
+        if len(self._pending) > max(4096, len(self._sorted) >> 3):
+            self._sorted.extend(self._pending)
+            self._sorted = array("q", sorted(self._sorted))
+            self._pending = set()
+
+
+class postBuffer:
+    '''
+    Columnar in-memory buffer of collected posts, what `twitterScrapper.theDict` is.
+
+    Dates, counts and ids are typed `array('q')` columns (8 bytes per value instead of a boxed int per value), with dates as unix
+    timestamps that are only formatted on export. User handles are interned: an `array('I')` index per post into the list of
+    distinct handles. Texts stay Python strings. A missing post id is kept as `NO_ID`.
+
+    Posts go in as dicts keyed by `POST_COLUMNS` (dates as unix timestamps or formatted strings) and come out the same way.
     '''
+    NO_ID = -1
+    INT_COLUMNS = ("Date", *COUNT_COLUMNS, "Post_id")
 
-    def __init__(self, credentials: str = "Credentials/twitter.json"):
+    def __init__(self, posts: Iterable[dict] = ()):
+        self._users = []            # Distinct handles
+        self._user_index = {}       # Handle -> index in self._users
+        self._columns = {"User": array("I"), "post_text": [], "quotedPost_text": [], **{col: array("q") for col in self.INT_COLUMNS}}
+        for post in posts:
+            self.append(post)
+
+    @classmethod
+    def from_columns(cls, data: dict[str, list]) -> "postBuffer":
         '''
-        This function is used to initialize the class and will also login to twitter
-        
-        Parameters
-        ----------
-        credentials : str
-            - Path to the twitter credentials json file
-            - The json file should be in the following format:
-            ```
-            {   "username" : "your_username",
-                "password" : "your_password",
-                "email"    : "your_email"}
-            ```
+        Build a buffer out of a dict of columns, e.g. a file read back with pandas.
         '''
-        
-        # Bunch of checkers and loaders for credentials
-        if not os.path.exists(credentials):
-            raise FileNotFoundError("Credentials file not found!")
-        with open(credentials, "r") as f:
-            credentials = json.load(f)
-            try:
-                username = credentials["username"]
-                password = credentials["password"]
-                email = credentials["email"]
-            except KeyError:
-                raise KeyError("Credentials file is not in the correct format!")
-        
-        # Check if any of those credentials is None
-        if username is None or password is None:
-            raise ValueError("Username or password can't be empty!")
-        if email is None:
-            warnings.warn("Email is not provided, this shit might not work if suspicious login attempt is detected!", UserWarning)
+        return cls(dict(zip(POST_COLUMNS, row)) for row in zip(*(data[col] for col in POST_COLUMNS)))
 
-        self.username = username
-        self.password = password
-        self.email = email
+    def __len__(self) -> int:
+        return len(self._columns["Date"])
 
-        # For storing all the data during scraping
-        self.theDict = { "User" : [], "Date" : [], "post_text" : [], "quotedPost_text" : [],
-                         "Reply_count": [], "Repost_count": [], "Like_count": [], "View_count": []}
-        
-        self.login()
+    def __getitem__(self, col: str) -> list:
+        return self.column(col)
 
-    # Utilities for this class
-    def _build_search_url(self, date_limit: str) -> str:
+    def append(self, post: dict) -> None:
+        user = post.get("User") or ""
+        index = self._user_index.get(user)
+        if index is None:
+            index = self._user_index[user] = len(self._users)
+            self._users.append(user)
+
+        columns = self._columns
+        columns["User"].append(index)
+        columns["Date"].append(date_to_unix(post["Date"]))
+        columns["post_text"].append(post.get("post_text"))
+        columns["quotedPost_text"].append(post.get("quotedPost_text"))
+        for col in COUNT_COLUMNS:
+            columns[col].append(int(post.get(col) or 0))
+        columns["Post_id"].append(self.NO_ID if post.get("Post_id") is None else int(post["Post_id"]))
+
+    def column(self, col: str, start: int = 0, stop: Optional[int] = None, formatted: bool = True) -> list:
         '''
-        Build the search URL based on the Filters and given datelimit
+        Values of one column for rows [start, stop): handles for "User", None for a missing "Post_id" and dates formatted with
+        `format_date` (unix timestamps with `formatted=False`).
+        '''
+        values = self._columns[col][start:stop]
+        if col == "User":
+            return [self._users[i] for i in values]
+        if col == "Date" and formatted:
+            return format_dates(values)
+        if col == "Post_id":
+            return [None if v == self.NO_ID else v for v in values]
+        return values.tolist() if isinstance(values, array) else values
 
-        Parameters
-        ----------
-        - date_limit : str
-            The date limit for the search in the format "YYYY-MM-DD".
-        
-        Returns
-        -------
-        - str
-            The constructed search URL.
+    def to_dict(self, start: int = 0, stop: Optional[int] = None, formatted: bool = True) -> dict[str, list]:
         '''
-        return f"{self.SEARCH_URL}{self.FILTERS_COMBINATION}{quote(f' until_time:{date_limit}')}&f=live&src=typed_query"
+        Rows [start, stop) as a dict of columns, see `column`.
+        '''
+        return {col: self.column(col, start, stop, formatted) for col in POST_COLUMNS}
 
-    def _scrape_detected(self) -> bool:
+    def rows(self, start: int = 0, stop: Optional[int] = None, formatted: bool = True) -> Iterator[dict]:
         '''
-        Check if scraping is detected by looking for the "Something went wrong. Try reloading." message. 
+        Rows [start, stop) as one dict per post, see `column`.
+        '''
+        data = self.to_dict(start, stop, formatted)
+        for row in zip(*data.values()):
+            yield dict(zip(POST_COLUMNS, row))
 
-        Returns
-        -------
-        - bool
-            True if scraping is detected (based on the presence of the error message), False otherwise.
+    def keys(self) -> list[str]:
         '''
-        
-        try:
-            sumthingwrong = WebDriverWait(self.driver, self.WAIT_LONG).until(
-                 EC.presence_of_element_located((By.XPATH, '//div[@aria-label="Home timeline"]/div/div/div/span'))
-            )
-            sumthingwrong.text == "Something went wrong. Try reloading."
-            return True
-        
-        except TimeoutException:
-            return False
+        Column names, like the dict of lists `theDict` used to be. The dedupe keys of the posts are `dedupe_keys`.
+        '''
+        return list(POST_COLUMNS)
 
-    def _wait_for_posts(self, current_date: int, counter: int) -> tuple[int, int, bool]:
+    def __iter__(self) -> Iterator[str]:
+        return iter(POST_COLUMNS)
+
+    def dedupe_keys(self, start: int = 0) -> Iterator[int]:
+        '''
+        Dedupe key (`post_key`) of every post from row `start` on, straight from the id column unless a post has no id.
         '''
-        Wait for posts to load on the page. If no posts are found within the timeout period, step back one day and increment the counter.
+        for i, post_id in enumerate(self._columns["Post_id"][start:], start):
+            yield post_id if post_id != self.NO_ID else post_key(next(self.rows(i, i + 1, formatted=False)))
 
-        The counter tracks the number of consecutive days with no posts found. If the counter exceeds the maximum allowed empty pages, the function indicates that all posts have been reached.
+    def has_idless(self, start: int = 0) -> bool:
+        '''
+        Whether a post from row `start` on has no id, i.e. is keyed on its `idless_key`.
+        '''
+        return self.NO_ID in self._columns["Post_id"][start:]
+
+    def last_date(self) -> Optional[int]:
+        return self._columns["Date"][-1] if len(self) else None
+
+    def min_date(self) -> Optional[int]:
+        return min(self._columns["Date"]) if len(self) else None
+
+    def max_date(self) -> Optional[int]:
+        return max(self._columns["Date"]) if len(self) else None
+
+    def update_counts(self, counts: dict[int, Sequence[int]]) -> int:
+        '''
+        Overwrite the Reply/Repost/Like/View counts of the posts whose dedupe key is in `counts`, leaving every other column be.
 
-        Parameters
-        ----------
-        - current_date : int
-            unix timestamp representing the current date being checked for posts.
-        - counter : int
-            The number of consecutive days with no posts found.
-        
         Returns
         -------
-        - tuple[int, int, bool]
-            A tuple containing the updated current date, the updated counter, and a boolean indicating whether the maximum number of empty pages has been reached.
+        - int
+            How many posts had a count change.
+        '''
+        changed = 0
+        for i, key in enumerate(self.dedupe_keys()):
+            new = counts.get(key)
+            if new is None:
+                continue
+            row_changed = False
+            for col, value in zip(COUNT_COLUMNS, new):
+                if self._columns[col][i] != value:
+                    self._columns[col][i] = value
+                    row_changed = True
+            changed += row_changed
+        return changed
+
+
+def _session_key(password: str, salt: bytes) -> bytes:
+    return base64.urlsafe_b64encode(hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 200_000))
+
+
+def encrypt_session(session: dict, password: str) -> bytes:
+    '''
+    Encrypt a browser session (cookies and localStorage) with a key derived from the account password.
+
+    Parameters
+    ----------
+    - session : dict
+        The session to encrypt, must be JSON serializable.
+    - password : str
+        The account password.
+
+    Returns
+    -------
+    - bytes
+        16 bytes of salt followed by the Fernet token.
+    '''
+    if not _import_fernet():
+        raise ImportError("The session cache needs cryptography, install it with `pip install cryptography`.")
+    salt = os.urandom(16)
+    return salt + Fernet(_session_key(password, salt)).encrypt(json.dumps(session).encode("utf-8"))
+
+
+def decrypt_session(blob: bytes, password: str) -> dict:
+    '''
+    Decrypt a session written by `encrypt_session`.
+
+    Raises
+    ------
+    - ValueError
+        If the password is wrong or the file is corrupted.
+    '''
+    if not _import_fernet():
+        raise ImportError("The session cache needs cryptography, install it with `pip install cryptography`.")
+    try:
+        return json.loads(Fernet(_session_key(password, blob[:16])).decrypt(blob[16:]))
+    except InvalidToken:
+        raise ValueError("Session can't be decrypted!")
+
+
+def _tweet_text(tweet: dict) -> str:
+    '''
+    Get the displayed text of a tweet object from X's GraphQL response.
+
+    Long posts keep their full text in `note_tweet`, the rest in `legacy.full_text`. t.co links are swapped with their display url
+    and media links are dropped, so the text matches what the DOM scraper would have read.
+    '''
+    legacy = tweet.get("legacy", {})
+    note = tweet.get("note_tweet", {}).get("note_tweet_results", {}).get("result", {})
+    text = note.get("text") or legacy.get("full_text", "")
+    entities = note.get("entity_set") or legacy.get("entities", {})
+
+    for url in entities.get("urls", []):
+        if url.get("url"):
+            text = text.replace(url["url"], url.get("display_url", ""))
+    for media in legacy.get("entities", {}).get("media", []):
+        if media.get("url"):
+            text = text.replace(media["url"], "")
+
+    return html.unescape(text).strip()
+
+
+def _unwrap_tweet(result: dict) -> Optional[dict]:
+    '''
+    Unwrap `TweetWithVisibilityResults` and drop tombstones (deleted/withheld posts), which have no `legacy` field.
+    '''
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet", {})
+    return result if "legacy" in result else None
+
+
+def _timeline_entries(payload: dict) -> list[dict]:
+    '''
+    The timeline entries (posts, modules and cursors) of a SearchTimeline payload, in order.
+    '''
+    instructions = (payload.get("data", {}).get("search_by_raw_query", {}).get("search_timeline", {})
+                    .get("timeline", {}).get("instructions", []))
+
+    entries = []
+    for instruction in instructions:
+        if instruction.get("type") == "TimelineAddEntries":
+            entries.extend(instruction.get("entries", []))
+        elif instruction.get("type") == "TimelineReplaceEntry":
+            entries.append(instruction.get("entry", {}))
+    return entries
+
+
+def search_timeline_cursor(payload: dict) -> tuple[Optional[str], int]:
+    '''
+    The bottom cursor of a SearchTimeline payload and how many post entries it has, without parsing the posts (see
+    `parse_search_timeline`). The last page of a search only has its cursors.
+    '''
+    cursor = None
+    entries = 0
+    for entry in _timeline_entries(payload):
+        content = entry.get("content", {})
+        if content.get("cursorType") == "Bottom":
+            cursor = content.get("value")
+        elif content.get("itemContent") or content.get("items"):
+            entries += 1
+    return cursor, entries
+
+
+def parse_search_timeline(payload: dict) -> tuple[list[dict], Optional[str]]:
+    '''
+    Parse the JSON payload of X's SearchTimeline GraphQL response.
+
+    Parameters
+    ----------
+    - payload : dict
+        The decoded JSON body of a SearchTimeline response.
+
+    Returns
+    -------
+    - tuple[list[dict], Optional[str]]
+        A tuple containing the posts (keyed the same way as `twitterScrapper.theDict`, plus "Post_id") and the bottom cursor, if any.
+    '''
+    posts = []
+    cursor = None
+    for entry in _timeline_entries(payload):
+        content = entry.get("content", {})
+        if content.get("cursorType") == "Bottom":
+            cursor = content.get("value")
+            continue
+
+        # Plain posts sit in `itemContent`, threads/conversations are modules with `items`
+        item_contents = [content.get("itemContent", {})] + [i.get("item", {}).get("itemContent", {}) for i in content.get("items", [])]
+        for item in item_contents:
+            tweet = _unwrap_tweet(item.get("tweet_results", {}).get("result", {}))
+            if tweet is None:
+                continue
+
+            legacy = tweet["legacy"]
+            user = tweet.get("core", {}).get("user_results", {}).get("result", {})
+            screen_name = user.get("core", {}).get("screen_name") or user.get("legacy", {}).get("screen_name", "")
+            quoted = _unwrap_tweet(tweet.get("quoted_status_result", {}).get("result", {}))
+            created_at = datetime.strptime(legacy["created_at"], "%a %b %d %H:%M:%S %z %Y")
+
+            posts.append({
+                "Post_id": int(tweet.get("rest_id") or legacy.get("id_str")),
+                "User": f"@{screen_name}",
+                "Date": int(created_at.timestamp()),
+                "post_text": _tweet_text(tweet),
+                "quotedPost_text": _tweet_text(quoted) if quoted else "",
+                "Reply_count": int(legacy.get("reply_count", 0)),
+                "Repost_count": int(legacy.get("retweet_count", 0)),
+                "Like_count": int(legacy.get("favorite_count", 0)),
+                "View_count": int(tweet.get("views", {}).get("count", 0)),
+            })
+
+    return posts, cursor
+
+
+
+def post_key(post: dict) -> int:
+    '''
+    Get the identity of a post used for deduplication as a 64-bit int: its status id, or a 63 bit digest of (text, date, user)
+    when the id couldn't be read.
+    '''
+    if post.get("Post_id") is not None:
+        return int(post["Post_id"])
+    return idless_key(post)
+
+
+def idless_key(post: dict) -> int:
+    '''
+    The key `post_key` gives a post without an id: a 63 bit digest of (text, date, user). Rows collected before post ids were
+    read (or without a permalink) are keyed on it, so a post read with its id again is only a duplicate of them under this key.
+    '''
+    date = format_date(post["Date"]) if isinstance(post["Date"], int) else post["Date"]     # Same key as before dates were ints
+    key = "\x00".join(str(k) for k in (post["post_text"], date, post["User"]))
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+def convert_extracted_posts(raws: list[dict]) -> list[dict]:
+    '''
+    Convert raw extracted posts (from `EXTRACT_POSTS_JS`, `OBSERVE_POSTS_JS` or `parse_timeline_html`) to the
+    `twitterScrapper.theDict` layout: int status ids, unix timestamp dates and int counts. Posts without a readable date are dropped.
+    '''
+    posts = []
+    for raw in raws:
+        raw["Post_id"] = int(raw["Post_id"]) if raw.get("Post_id") else None
+        try:
+            if raw["Post_id"] is not None:     # The id already carries the timestamp, no need to parse <time>
+                raw["Date"] = int(snowflake_to_unix(raw["Post_id"]))
+            else:
+                raw["Date"] = iso_to_unix(raw["Date"])
+        except (TypeError, ValueError, AttributeError):
+            continue
+        for col in COUNT_COLUMNS:
+            raw[col] = safe_int_from_aria(raw[col])
+        posts.append(raw)
+    return posts
+
+
+def _first(node, path: str):
+    found = node.xpath(path)
+    return found[0] if found else None
+
+
+_UNRENDERED_TAGS = {"script", "style", "noscript", "template"}
+
+
+def _hidden(element) -> bool:
+    return element.get("hidden") is not None or "display:none" in (element.get("style") or "").replace(" ", "").lower()
+
+
+def _inner_text(element) -> str:
+    '''
+    lxml stand-in for the `innerText` the in-page extractors read, so snapshots parse to the same text as a live page.
+
+    Unlike lxml's `text_content()`, `<br>` is a line break, CRLF/CR become LF, and elements that aren't rendered (script, style,
+    `hidden`, inline `display: none`) are left out. X renders post text and names with `white-space: pre-wrap`, so the rest of
+    the whitespace is kept as it is, which is what `innerText` gives there too.
+    '''
+    if not len(element):                    # A leaf, like most of the spans a post is made of
+        parts = ["\n" if element.tag == "br" else "", element.text or ""]
+    else:
+        parts = []
+
+        def walk(node) -> None:
+            if node.tag == "br":
+                parts.append("\n")
+            parts.append(node.text or "")
+            for child in node:
+                tag = child.tag
+                if tag.__class__ is str and tag not in _UNRENDERED_TAGS and not (child.attrib and _hidden(child)):
+                    walk(child)
+                parts.append(child.tail or "")      # Text after a child belongs to this node, rendered or not
+
+        walk(element)
+    text = "".join(parts)
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+
+def _html_post_text(element) -> str:
+    '''
+    lxml version of `twitterScrapper._parse_post`.
+    '''
+    text = ""
+    for p in element.xpath(".//span | .//img | .//a[@dir='ltr']"):
+        if p.tag == "img":                  # Emojis
+            text += p.get("alt") or ""
+        elif p.tag == "a":                  # Links (Not shortened with t.co domain)
+            text += _inner_text(p) + " "
+        else:                               # Normal text
+            text += _inner_text(p)
+    return text
+
+
+def parse_timeline_html(page: str) -> list[dict]:
+    '''
+    Parse the posts of the search timeline out of raw HTML, offline: `driver.page_source` or the timeline's `outerHTML`
+    (see `TIMELINE_HTML_JS`).
+
+    Reads the same fields as `_extract_post_data` and `_extract_metrics`, with the same XPaths, through lxml's C parser. So
+    snapshots can be parsed in other processes, or parsed again later after X changes its markup.
+
+    Parameters
+    ----------
+    - page : str
+        The raw HTML.
+
+    Returns
+    -------
+    - list[dict]
+        One dict per post, keyed the same way as `twitterScrapper.theDict`.
+    '''
+    return convert_extracted_posts(_timeline_html_raws(page))
+
+
+def _timeline_html_raws(page: str) -> list[dict]:
+    '''
+    Raw fields of every post of a timeline HTML, unconverted, the same as what `EXTRACT_POSTS_JS` returns.
+    '''
+    if not _import_lxml():
+        raise ImportError("Parsing HTML snapshots needs lxml, install it with `pip install lxml`.")
+    if not page:
+        return []
+
+    raws = []
+    root = lxml_html.fromstring(page)
+    for cell in root.xpath('//div[@aria-label="Timeline: Search timeline"]/div/div')[:-1]:
+        post = _first(cell, './/div[not(@role="link")]/div/div/div/div/div[@data-testid="tweetText"]')
+        time_element = _first(cell, './/time')
+        user = _first(cell, './/a/div/span')
+        if post is None or time_element is None or user is None:
+            continue        # Ads, "show more" rows, half-rendered cells
+
+        quoted = _first(cell, './/div[@role="link"]')
+        group = _first(cell, './/div[@role="group"]')
+        permalink = _first(time_element, './ancestor::a[1]')
+        post_id = status_id_from_href(permalink.get("href")) if permalink is not None else None
+
+        def aria(path):
+            element = _first(group, path) if group is not None else None
+            return element.get("aria-label") if element is not None else ""
+
+        raws.append({
+            "Post_id": post_id,
+            "post_text": _html_post_text(post),
+            "quotedPost_text": "".join(_inner_text(s) for s in quoted.xpath('.//div[@data-testid="tweetText"]/span'))
+                               if quoted is not None else "",
+            "User": _inner_text(user),
+            "Date": time_element.get("datetime"),
+            "Reply_count": aria('.//div[1]/button'),
+            "Repost_count": aria('.//div[2]/button'),
+            "Like_count": aria('.//div[3]/button'),
+            "View_count": aria('.//div[4]/a'),
+        })
+    return raws
+
+
+def _parse_snapshot_file(path: str) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return parse_timeline_html(f.read())
+
+
+def parse_snapshots(directory: str, workers: int = 1) -> dict[str, list]:
+    '''
+    Parse every HTML snapshot stored by `extractionMode="snapshot"` (`Process/<processDir>/Snapshots`) again, without re-scraping.
+
+    Parameters
+    ----------
+    - directory : str
+        The Snapshots directory.
+    - workers : int
+        Number of processes to parse with. Default is 1.
+
+    Returns
+    -------
+    - dict[str, list]
+        The posts in capture order without duplicates, as a dict of columns with formatted dates (see `postBuffer.to_dict`).
+    '''
+    paths = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".html.gz"))
+    if workers > 1:
+        import multiprocessing
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            batches = pool.map(_parse_snapshot_file, paths)
+    else:
+        batches = map(_parse_snapshot_file, paths)
+
+    data = postBuffer()
+    seen = compactIdSet()
+    for posts in batches:
+        for post in posts:
+            key = post_key(post)
+            if key in seen:
+                continue
+            seen.add(key)
+            data.append(post)
+    return data.to_dict()
+
+
+class postPipeline:
+    '''
+    Runs `consume(*batch)` for every batch put in a bounded queue on a worker thread, so the browser thread can keep scrolling
+    while the posts are parsed, deduped and saved. `put` blocks while `depth` batches are already waiting (backpressure).
+
+    Batches are consumed in order by a single thread, which keeps dedupe and the row order of `theDict` the same as a
+    sequential run. The overlap comes from the browser's waits and the savepoint/disk writes, which release the GIL.
+    An error in `consume` is raised again by the next `put` or `join`.
+    '''
+
+    def __init__(self, consume: Callable, depth: int = PIPELINE_DEPTH):
+        self._consume = consume
+        self._queue = Queue(maxsize=depth)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="post-pipeline", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    return
+                if self._error is None:     # After an error, skip the rest until the browser thread picks it up
+                    self._consume(*batch)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def put(self, *batch) -> None:
+        self._raise()
+        self._queue.put(batch)
+
+    def join(self) -> None:
+        '''
+        Wait until every batch put so far is consumed.
+        '''
+        self._queue.join()
+        self._raise()
+
+    def close(self) -> None:
+        '''
+        Consume what's left and stop the worker thread. Errors are dropped, call `join` first to get them.
+        '''
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+class scrapeMetrics:
+    '''
+    Counters and timers of one scrape run, updated from both the browser thread and the pipeline thread.
+
+    Timers add up the wall time spent in each phase of the run: "page_load", "detection_check", "throttle_wait", "scroll_wait",
+    "capture" (browser side) and "parse", "save" (pipeline side). With `pipeline=True` the two sides overlap, so they don't add
+    up to the elapsed time.
+    '''
+    COUNTERS = ("pages", "posts", "duplicates", "detections", "commands", "savepoints", "spills", "refreshed")
+    TIMERS = ("page_load", "detection_check", "throttle_wait", "scroll_wait", "capture", "parse", "save")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.counts = dict.fromkeys(self.COUNTERS, 0)
+            self.seconds = dict.fromkeys(self.TIMERS, 0.0)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += n
+
+    @contextlib.contextmanager
+    def timer(self, name: str):
+        '''
+        Add the time spent in the `with` block to the `name` timer.
+        '''
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.seconds[name] += elapsed
+
+    def snapshot(self) -> dict:
+        '''
+        Get the current counters, timers and the rates derived from them.
+
+        Returns
+        -------
+        - dict
+            elapsed seconds, posts_per_sec, commands_per_post, dedupe_hit_rate (share of harvested posts that were duplicates),
+            plus the raw `counts` and `seconds`.
+        '''
+        with self._lock:
+            counts, seconds = dict(self.counts), dict(self.seconds)
+        elapsed = time.time() - self.started
+        harvested = counts["posts"] + counts["duplicates"]
+        return {"elapsed": round(elapsed, 3),
+                "posts_per_sec": round(counts["posts"] / elapsed, 3) if elapsed > 0 else 0.0,
+                "commands_per_post": round(counts["commands"] / counts["posts"], 3) if counts["posts"] else None,
+                "dedupe_hit_rate": round(counts["duplicates"] / harvested, 4) if harvested else None,
+                "counts": counts,
+                "seconds": {name: round(value, 3) for name, value in seconds.items()}}
+
+    def prometheus(self, labels: dict) -> str:
+        '''
+        Render the snapshot in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        - labels : dict
+            Labels added to every sample, e.g. the process directory.
+        '''
+        snapshot = self.snapshot()
+
+        def escape(value):
+            # Label values are quoted, so backslashes, quotes and newlines (e.g. in a processDir) have to be escaped
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def sample(name, value, extra=None):
+            tags = ",".join(f'{k}="{escape(v)}"' for k, v in {**labels, **(extra or {})}.items())
+            return f"{name}{{{tags}}} {value if value is not None else 'NaN'}"
+
+        lines = []
+        for name in self.COUNTERS:
+            metric = "xscraper_webdriver_commands_total" if name == "commands" else f"xscraper_{name}_total"
+            lines += [f"# TYPE {metric} counter", sample(metric, snapshot["counts"][name])]
+        lines.append("# TYPE xscraper_phase_seconds_total counter")
+        lines += [sample("xscraper_phase_seconds_total", value, {"phase": phase}) for phase, value in snapshot["seconds"].items()]
+        for name in ("elapsed", "posts_per_sec", "commands_per_post", "dedupe_hit_rate"):
+            lines += [f"# TYPE xscraper_{name} gauge", sample(f"xscraper_{name}", snapshot[name])]
+        return "\n".join(lines) + "\n"
+
+
+class windowPlanner:
+    '''
+    Plans the `since_time`/`until_time` window of each search page from the post density seen so far.
+
+    Every page aims at about `target_posts` posts: windows over sparse periods widen exponentially while they keep coming back
+    empty, dense periods get split down to hour slices. Until something was observed, pages are only bounded by `floor`.
+    '''
+    HOUR = 3600
+    DAY = 86400
+
+    def __init__(self, target_posts: int = 200, max_span: int = 32 * 86400):
+        self.target_posts = target_posts
+        self.max_span = max_span
+        self.span = None            # Window length in seconds, None until the first page was seen
+        self.density = None         # Posts per second, smoothed over the windows seen
+        self.empty_span = 0         # Seconds covered by consecutive empty windows
+
+    def state(self) -> dict:
+        return {"span": self.span, "density": self.density, "empty_span": self.empty_span}
+
+    def restore(self, state: dict) -> None:
+        '''
+        Carry on from a `state()` saved by an earlier run (see `twitterScrapper._write_manifest`).
+        '''
+        self.span, self.density, self.empty_span = state["span"], state["density"], state["empty_span"]
+
+    def next_window(self, until: int, floor: Optional[int] = None) -> Optional[int]:
+        '''
+        Get the lower limit (`since_time`) of the window ending at `until`, never going below `floor` if given. None means unbounded.
+        '''
+        if self.span is None:
+            return floor
+        since = until - self.span
+        return since if floor is None else max(since, floor)
+
+    def step_back(self, since: Optional[int], until: int) -> int:
+        '''
+        Where the cursor goes after a window without new posts: its lower limit, or one day back if it was unbounded.
+        '''
+        return since if since is not None else until - self.DAY
+
+    def next_cursor(self, since: Optional[int], until: int, posts: int, oldest: Optional[int] = None) -> int:
+        '''
+        Where the cursor goes after a finished window (same parameters as `record`).
+
+        A window that gave a page worth of posts (or was unbounded) only got scrolled as far as its oldest new post, so the next
+        one carries on from there. One that ran out before that was drained down to its lower limit: starting below `oldest`
+        again would only load the rest of it a second time, so the cursor steps past the whole window (see `step_back`).
+        '''
+        if posts and oldest is not None and (since is None or posts >= self.target_posts):
+            return oldest
+        return self.step_back(since, until)
+
+    def record(self, since: Optional[int], until: int, posts: int, oldest: Optional[int] = None) -> None:
+        '''
+        Learn from a finished window.
+
+        Parameters
+        ----------
+        - since : int, optional
+            Lower limit of the window that was loaded, None if it was unbounded.
+        - until : int
+            Upper limit of the window that was loaded.
+        - posts : int
+            Number of new posts collected from it.
+        - oldest : int, optional
+            unix timestamp of the oldest of them.
+        '''
+        if posts == 0 or oldest is None:
+            self.empty_span += until - self.step_back(since, until)
+            self.span = min((self.span or self.DAY) * 2, self.max_span)     # Nothing here, look further back in one go
+            return
+
+        self.empty_span = 0
+        # Less than a page worth of posts means the scroll drained the window, otherwise it only got as far as `oldest`
+        covered = until - since if since is not None and posts < self.target_posts else until - oldest
+        rate = posts / max(covered, 1)
+        self.density = rate if self.density is None else (self.density + rate) / 2
+        span = self.target_posts / self.density
+        self.span = int(min(max(span // self.HOUR, 1) * self.HOUR, self.max_span))
+
+
+class rateLimiter:
+    '''
+    Paces the page loads of one account and backs off when X throttles it.
+
+    Page loads take tokens from a bucket refilled at `rate` per second (no pacing while `rate` is None). A scraping detection halves
+    the rate and cools the account down for an exponentially growing, jittered delay. Every `recover_after` clean page loads undo
+    one step: the backoff level drops and the rate grows back towards `max_rate`, but never past 90% of the rate that got throttled.
+    '''
+    MIN_RATE = 1 / 600              # Never slower than a page per 10 minutes
+
+    def __init__(self, max_rate: Optional[float] = None, backoff_base: float = 60, backoff_max: float = 900,
+                 recover_after: int = 10, burst: int = 3):
+        self.configure(max_rate, backoff_base, backoff_max, recover_after, burst)
+        self.rate = max_rate        # Page loads per second, None means no pacing
+        self.tokens = float(burst)
+        self.updated = time.time()
+        self.level = 0              # Number of backoff steps, one per detection, undone by clean page loads
+        self.successes = 0          # Clean page loads since the last step
+        self.cooldown_until = 0.0
+        self.detections = 0
+        self.ceiling = None         # 90% of the last rate that got throttled
+
+    def configure(self, max_rate: Optional[float], backoff_base: float, backoff_max: float, recover_after: int, burst: int = 3) -> None:
+        '''
+        Set the limits (from `start()`'s scraping_Params). What was learned so far is kept, only capped to the new `max_rate`.
+        '''
+        self.max_rate = max_rate
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.recover_after = recover_after
+        self.burst = burst
+        if max_rate is not None and (getattr(self, "rate", None) is None or self.rate > max_rate):
+            self.rate = max_rate
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready_at(self) -> float:
+        '''
+        Get the time (as `time.time()`) at which the next page load is allowed by the cool-down and the token bucket.
+        '''
+        now = time.time()
+        self._refill(now)
+        ready = max(now, self.cooldown_until)
+        if self.rate is not None and self.tokens < 1:
+            ready = max(ready, now + (1 - self.tokens) / self.rate)
+        return ready
+
+    def take(self) -> None:
+        self._refill(time.time())
+        if self.rate is not None:
+            self.tokens -= 1
+
+    def success(self) -> bool:
+        '''
+        Record a clean page load. Returns True if it completed a recovery step.
+        '''
+        self.successes += 1
+        caps = [cap for cap in (self.max_rate, self.ceiling) if cap is not None]
+        at_cap = self.rate is None or (caps and self.rate >= min(caps))
+        if self.successes < self.recover_after or (self.level == 0 and at_cap):
+            return False
+        self.successes = 0
+        self.level = max(0, self.level - 1)
+        if self.rate is not None:
+            self.rate *= 1.25
+            if caps:
+                self.rate = max(min(self.rate, min(caps)), self.MIN_RATE)
+        return True
+
+    def detected(self, observed_rate: float) -> float:
+        '''
+        Record a scraping detection: halve the rate (or the observed rate, if there was no pacing yet) and start the cool-down.
+
+        Parameters
+        ----------
+        - observed_rate : float
+            Page loads per second the account actually made recently.
+
+        Returns
+        -------
+        - float
+            The cool-down in seconds.
+        '''
+        now = time.time()
+        self.detections += 1
+        self.level += 1
+        self.successes = 0
+        delay = min(self.backoff_base * 2 ** (self.level - 1), self.backoff_max)
+        delay = delay / 2 + rd.uniform(0, delay / 2)        # Jitter, so throttled accounts don't all come back at once
+        self.cooldown_until = now + delay
+
+        # No page load in the budget window (observed rate 0) would make a ceiling of 0, the rate has to stay positive
+        current = self.rate if self.rate is not None else observed_rate
+        self.ceiling = max(current * 0.9, self.MIN_RATE)
+        self.rate = max(current / 2, self.MIN_RATE)
+        self.tokens = 0.0
+        self.updated = now
+        return delay
+
+    def state(self) -> dict:
+        '''
+        Get the pacing and backoff state, for monitoring.
+        '''
+        now = time.time()
+        self._refill(now)
+        return {"pages_per_min": None if self.rate is None else round(self.rate * 60, 2),
+                "tokens": round(self.tokens, 2),
+                "backoff_level": self.level,
+                "cooldown_left": max(0, int(self.cooldown_until - now)),
+                "detections": self.detections}
+
+
+class accountSession:
+    '''
+    One X account of the scraper's pool: its credentials, its browser and its request budget.
+
+    Page loads are tracked in a sliding window of `budget_window` seconds. An account is available when it's not cooling down
+    from a scraping detection and has made less than `requests_per_window` page loads in the window.
+    '''
+
+    def __init__(self, credentials: str):
+        '''
+        Load the credentials of one account.
+
+        Parameters
+        ----------
+        credentials : str
+            - Path to the twitter credentials json file (see `twitterScrapper.__init__`)
+        '''
+        # Bunch of checkers and loaders for credentials
+        if not os.path.exists(credentials):
+            raise FileNotFoundError("Credentials file not found!")
+        with open(credentials, "r") as f:
+            credentials = json.load(f)
+            try:
+                username = credentials["username"]
+                password = credentials["password"]
+                email = credentials["email"]
+            except KeyError:
+                raise KeyError("Credentials file is not in the correct format!")
+
+        # Check if any of those credentials is None
+        if username is None or password is None:
+            raise ValueError("Username or password can't be empty!")
+        if email is None:
+            warnings.warn("Email is not provided, this shit might not work if suspicious login attempt is detected!", UserWarning)
+
+        self.username = username
+        self.password = password
+        self.email = email
+        self.driver = None
+
+        self.requests = deque()         # Timestamps of the page loads made in the current budget window
+        self.limiter = rateLimiter()    # Pacing and detection backoff
+        self.pending_requests = set()   # SearchTimeline request ids of this browser whose body hasn't finished loading yet
+        self.search_request = None      # Url and headers of this browser's last SearchTimeline request, see `NEXT_PAGE_JS`
+
+    def _trim(self, now: float, window: int) -> None:
+        while self.requests and self.requests[0] <= now - window:
+            self.requests.popleft()
+
+    def available_at(self, requests_per_window: Optional[int], window: int) -> float:
+        '''
+        Get the time (as `time.time()`) at which this account can make its next page load.
+        '''
+        now = time.time()
+        self._trim(now, window)
+        ready = max(now, self.limiter.ready_at())
+        if requests_per_window is not None and len(self.requests) >= requests_per_window:
+            ready = max(ready, self.requests[-requests_per_window] + window)
+        return ready
+
+    def record_request(self) -> None:
+        self.requests.append(time.time())
+        self.limiter.take()
+
+    def observed_rate(self, window: int) -> float:
+        '''
+        Page loads per second since the oldest one still in the budget window (counted over at least a minute).
+        '''
+        now = time.time()
+        self._trim(now, window)
+        if not self.requests:
+            return 0.0
+        return len(self.requests) / max(now - self.requests[0], 60)
+
+    def status(self, window: int) -> dict:
+        '''
+        Get the request rate and cool-down state of this account.
+
+        Returns
+        -------
+        - dict
+            username, page loads per minute over the budget window and the limiter state (see `rateLimiter.state`).
+        '''
+        return {"username": self.username,
+                "requests_per_min": round(self.observed_rate(window) * 60, 2),
+                **self.limiter.state()}
+
+
+class twitterScrapper:
+    '''
+    This class is used to scrape posts from X (formerly known as Twitter) based on given filters and date range.
+    
+    Methods
+    ----------
+    - login()
+        - Logs into Twitter using the provided credentials
+    - start()
+        - Starts the scraping process based on the given filters and date range
+    '''
+
+    def __init__(self, credentials: Union[str, list[str]] = "Credentials/twitter.json", networkCapture: bool = False,
+                 user_multi_procs: bool = False, sessionCache: bool = True, headless: bool = False, lightProfile: bool = True):
+        '''
+        This function is used to initialize the class and will also login to twitter
+        
+        Parameters
+        ----------
+        credentials : str | list[str]
+            - Path to the twitter credentials json file, or a list of them to scrape with a pool of accounts
+            - Every account gets its own logged-in browser. Search pages go to whichever account still has budget,
+              and a throttled account cools down while the others keep working.
+            - The json file should be in the following format:
+            ```
+            {   "username" : "your_username",
+                "password" : "your_password",
+                "email"    : "your_email"}
+            ```
+        networkCapture : bool
+            - Whether to start Chrome with performance logging, so X's SearchTimeline responses can be read through CDP.
+            - Required for `start(..., backend="network")`.
+            - Default is False.
+        user_multi_procs : bool
+            - Passed to `uc.Chrome`, so several processes don't patch the same chromedriver binary at once.
+            - Set by the shard workers of `start(..., workers=N)`, you normally don't need it.
+            - Default is False.
+        sessionCache : bool
+            - Whether to keep each account's cookies and localStorage in `Credentials/Sessions/<username>.session`, encrypted
+              with the account password, and reuse them on the next start instead of doing the bot-check and typed login.
+            - Falls back to the full login if the cached session is missing, can't be decrypted, or X no longer accepts it.
+            - Needs the `cryptography` package.
+            - Default is True.
+        headless : bool
+            - Whether to run Chrome without a window (new headless mode, 1920x1080 viewport), e.g. on servers and cron workers.
+            - X is quicker to flag a fresh headless login as a bot, so it's best used together with `sessionCache`, with a session
+              cached by a normal (windowed) login first.
+            - Default is False.
+        lightProfile : bool
+            - Whether to start Chrome with a lightweight rendering profile: images off, media, avatars and fonts blocked through CDP
+              (`BLOCKED_URLS`), no autoplay, and a tall, low-resolution viewport (`LIGHT_VIEWPORT`) so more posts render per
+              scroll without zooming the browser out by hand. Cuts the bandwidth and renderer CPU per page, so more workers
+              fit on one machine.
+            - Default is True.
+        '''
+        
+        # One session per credentials file, the first one is used until it runs out of budget or gets throttled
+        self.credentials_path = credentials
+        self.accounts = [accountSession(path) for path in ([credentials] if isinstance(credentials, str) else credentials)]
+        if not self.accounts:
+            raise ValueError("At least one credentials file is needed!")
+        self._use_account(self.accounts[0])
+
+        self.requests_per_window = None     # Per-account page load budget, set by `start()`
+        self.budget_window = 900
+        self.networkCapture = networkCapture
+        self.user_multi_procs = user_multi_procs
+        self.headless = headless
+        self.lightProfile = lightProfile
+        if sessionCache and not _import_fernet():
+            warnings.warn("cryptography is not installed, session cache is disabled.", UserWarning)
+        self.sessionCache = sessionCache and Fernet is not None
+        self.cursor = None                 # Bottom cursor of the last SearchTimeline page of the network backend
+        self._feed_ended = False           # Whether that page had no posts, i.e. the search has nothing more
+        self._search_throttled = False     # Whether X answered a SearchTimeline request of the current page with an error
+        self._network_pages = []           # SearchTimeline pages that came in while waiting, for the next `_capture_batch`
+        self._idless_rows = False          # Whether a collected post is keyed on its `idless_key`, see `_is_seen`
+        self._journaled = 0                # Number of rows of self.theDict already in the savepoint journal
+        self._journal_bytes = 0            # Size of the journal as of the last savepoint
+        self._keys_written = 0             # Number of dedupe keys in `Savepoints/keys.bin`
+        self._segments = []                # Spilled journal segments, oldest first (see `_spill`)
+        self._earliest_date = None         # Oldest post collected so far, the cursor to resume from
+        self._planner_state = None         # Window planner state to carry on from, set on resume
+        self._columnar_backfill = False    # Whether the streamed Parquet/Arrow file has to start with the segments (after a resume)
+        self._columnar_writer = None       # Open Parquet/Arrow writer of Final.<format>.part
+        self._columnar_rows = 0            # Number of rows of self.theDict already written by it
+        self._columnar_users = {}          # Handle -> index of the User dictionary of that file (Arrow IPC), only ever grows
+        self._columnar_user_values = None  # That dictionary as an Arrow array, so a batch only converts its new handles
+        self._suspend_on_wait = False      # Set by `run_jobs`: give up the turn instead of waiting for a throttled pool
+        self.snapshotLimit = SNAPSHOT_LIMIT
+        self._snapshots = None             # (path, size) of the stored HTML snapshots, oldest first, listed on the first one
+        self.maxPages = None
+        self.maxBufferedPosts = None
+        self.metrics = scrapeMetrics()     # Counters/timers of the current run, see `start(..., metricsInterval, metricsPort)`
+        self._metrics_server = None
+
+        # For storing all the data during scraping
+        self.theDict = postBuffer()
+        
+        self.login()
+
+    # Utilities for this class
+    def _build_search_url(self, date_limit: int, since_limit: Optional[int] = None) -> str:
+        '''
+        Build the search URL based on the Filters and given datelimit
+
+        Parameters
+        ----------
+        - date_limit : int
+            unix timestamp of the upper date limit for the search (`until_time`).
+        - since_limit : Optional[int]
+            unix timestamp of the lower date limit for the search (`since_time`). Not added if None.
+        
+        Returns
+        -------
+        - str
+            The constructed search URL.
+        '''
+        date_filter = f' until_time:{date_limit}'
+        if since_limit is not None:
+            date_filter += f' since_time:{since_limit}'
+        return f"{self.SEARCH_URL}{self.FILTERS_COMBINATION}{quote(date_filter)}&f=live&src=typed_query"
+
+    def _scrape_detected(self, page: Optional[dict] = None) -> bool:
+        '''
+        Check if scraping is detected by looking for the "Something went wrong. Try reloading." message. 
+
+        Parameters
+        ----------
+        - page : dict, optional
+            Page state from `_load_search_page`. If the timeline already rendered without the message there's nothing to wait for.
+            With the network backend nothing is rendered, the page state says whether X answered the search with an error.
+
+        Returns
+        -------
+        - bool
+            True if scraping is detected (based on the presence of the error message), False otherwise.
+        '''
+        if self.backend == "network":
+            return bool(page and page.get("error"))
+        if page and page.get("cells") and not page.get("error"):
+            return False
+
+        try:
+            sumthingwrong = wait_for_xpath(self.driver, self.WAIT_LONG, '//div[@aria-label="Home timeline"]/div/div/div/span')
+            sumthingwrong.text == "Something went wrong. Try reloading."
+            return True
+        
+        except TimeoutException:
+            return False
+
+    def _wait_for_page_change(self, baseline: Optional[dict] = None) -> dict:
+        '''
+        Poll the page (see `PAGE_STATE_JS`) until something happens instead of sleeping a fixed `WAIT_SHORT`.
+
+        Returns as soon as timeline cells show up (without `baseline`, after a page load) or the cell count/page height differs from
+        `baseline` (after a scroll), the detection message shows up, or no resource was fetched for `IDLE_WINDOW` seconds while
+        no fetch/XHR was in flight (see `INFLIGHT_TRACKER_JS`). `WAIT_SHORT` is only the ceiling.
+
+        Parameters
+        ----------
+        - baseline : dict, optional
+            The page state before the scroll.
+
+        Returns
+        -------
+        - dict
+            The last page state.
+        '''
+        deadline = time.time() + self.WAIT_SHORT
+        last_activity = time.time()
+        while True:
+            state = self.driver.execute_script(PAGE_STATE_JS) or {}
+            now = time.time()
+            if state.get("error"):
+                return state
+            if baseline is None and state.get("cells"):
+                return state
+            if baseline is not None and (state.get("cells"), state.get("height")) != (baseline.get("cells"), baseline.get("height")):
+                return state
+
+            if state.get("requests") or state.get("inflight"):     # A slow SearchTimeline response isn't the end of the feed
+                last_activity = now
+            elif now - last_activity >= self.IDLE_WINDOW:   # Network went quiet and nothing new showed up, it's not coming
+                return state
+            if now >= deadline:
+                return state
+            time.sleep(min(self.POLL_INTERVAL, deadline - now))
+
+    def _wait_for_posts(self, current_date: int, counter: int, since_limit: Optional[int],
+                        page: Optional[dict] = None) -> tuple[int, int, bool]:
+        '''
+        Wait for posts to load on the page. If no posts are found within the timeout period, step back past the whole window
+        (which the planner widens for the next page) and increment the counter.
+
+        The counter tracks the number of consecutive empty windows. Once they cover `MAX_EMPTY_PAGES` days, the function indicates that all posts have been reached.
+
+        Parameters
+        ----------
+        - current_date : int
+            unix timestamp representing the current date being checked for posts.
+        - counter : int
+            The number of consecutive empty windows.
+        - since_limit : int, optional
+            unix timestamp of the lower limit of the window (`since_time`), None if it's unbounded.
+        - page : dict, optional
+            Page state from `_load_search_page`. The network backend has no DOM to wait on, its first page already told how many posts there are.
+        
+        Returns
+        -------
+        - tuple[int, int, bool]
+            A tuple containing the updated current date, the updated counter, and a boolean indicating whether the maximum number of empty pages has been reached.
+        '''
+
+        try:
+            # Is there a container for post?
+            if self.backend == "network":
+                if not (page or {}).get("cells"):
+                    raise TimeoutException("No posts on the first SearchTimeline page")
+            else:
+                wait_for_xpath(self.driver, self.WAIT_LONG, "//div[@data-testid='cellInnerDiv']")
+            counter = 0
+            return current_date, counter, False # Yes
+        except TimeoutException:
+            # Nothing left between `since_time` and the cursor, stepping back further would only load empty pages
+            if self.since_date is not None and since_limit <= self.since_date:
+                return current_date, counter, True
+
+            self._planner.record(since_limit, current_date, 0)
+            current_date = self._planner.step_back(since_limit, current_date)
+            counter += 1
+            current_date_str = datetime.fromtimestamp(current_date).strftime("%Y-%m-%d %H:%M")
+            empty_days = self._planner.empty_span / windowPlanner.DAY
+            print(f"No posts found, stepping back to {current_date_str}, {empty_days:.1f}/{self.MAX_EMPTY_PAGES} empty days")
+            return current_date, counter, empty_days >= self.MAX_EMPTY_PAGES    # Nothingburger, skip the whole window
+
+    def _parse_post(self, post_element) -> str:
+        '''
+        Parse the post element to extract the full text of the post.
+
+        NOTE: This only handles text, links, emojis, and such. Media (images, videos, gifs) are not handled ***yet***.
+
+        Parameters
+        ----------
+        - post_element : WebElement
+            The WebElement representing the post.
+        
+        Returns
+        -------
+        - str
+            The full text of the post.
+        '''
+
+        parts = post_element.find_elements(By.XPATH, ".//span | .//img | .//a[@dir='ltr']")
+        text = ""
+        for p in parts:
+            if p.tag_name == "img":                 # Emojis
+                text += p.get_attribute("alt")
+            elif p.tag_name == "a":                 # Links (Not shortened with t.co domain)
+                text += p.text + " "
+            else:                                   # Normal text                 
+                text += p.text
+        return text
+
+    def _extract_post_data(self, element) -> tuple[str, str, str, int, Optional[int]]:
+        '''
+        Extract post data from the given post element.
+
+        Parameters
+        ----------
+        - element : WebElement
+            The WebElement representing the post.
+        
+        Returns
+        ------
+        - tuple[str, str, str, int, Optional[int]]
+            A tuple containing the post text, quoted post text, post user, post date (unix timestamp) and status id (None if
+            there's no permalink).
+        '''
+
+        # Get the entire post element
+        post_element = element.find_element(
+            By.XPATH, './/div[not(@role="link")]/div/div/div/div/div[@data-testid="tweetText"]',
+        )
+        # Post
+        post_text = self._parse_post(post_element)
+
+        # Quoted Post
+        try:
+            quoted_element = element.find_element(By.XPATH, './/div[@role="link"]')
+            quoted_text = ''.join(
+                i.text for i in quoted_element.find_elements(By.XPATH, './/div[@data-testid="tweetText"]/span')
+            )
+        except NoSuchElementException:
+            quoted_text = ""
+
+        time_element = element.find_element(By.XPATH, './/time')
+        try:
+            post_id = status_id_from_href(time_element.find_element(By.XPATH, './ancestor::a[1]').get_attribute("href"))
+        except NoSuchElementException:
+            post_id = None
+        if post_id is not None:
+            post_date = int(snowflake_to_unix(post_id))
+        else:
+            post_date = iso_to_unix(time_element.get_attribute("datetime"))
+        post_user = element.find_element(By.XPATH, './/a/div/span').text
+
+        return post_text, quoted_text, post_user, post_date, post_id
+
+    def _extract_metrics(self, element) -> tuple[int, int, int, int]:
+        '''
+        Extract the reply, repost, like and view counts from the role="group" bar of the given post element.
+
+        Parameters
+        ----------
+        - element : WebElement
+            The WebElement representing the post.
+
+        Returns
+        -------
+        - tuple[int, int, int, int]
+            A tuple containing the reply, repost, like and view count. All zeros if the post has no metrics bar.
+        '''
+        groups = element.find_elements(By.XPATH, './/div[@role="group"]')
+        if not groups:
+            return 0, 0, 0, 0
+
+        group = groups[0]
+        return (
+            safe_int_from_aria(group.find_element(By.XPATH, './/div[1]/button').get_attribute("aria-label")),
+            safe_int_from_aria(group.find_element(By.XPATH, './/div[2]/button').get_attribute("aria-label")),
+            safe_int_from_aria(group.find_element(By.XPATH, './/div[3]/button').get_attribute("aria-label")),
+            safe_int_from_aria(group.find_element(By.XPATH, './/div[4]/a').get_attribute("aria-label")),
+        )
+
+    def _extract_visible_posts(self, script: str = EXTRACT_POSTS_JS) -> list[dict]:
+        '''
+        Extract posts from the search timeline with a single `execute_script` call and convert them to the `self.theDict` layout.
+
+        Parameters
+        ----------
+        - script : str
+            `EXTRACT_POSTS_JS` for every visible post, or `OBSERVE_POSTS_JS` for only the posts that showed up since the previous call.
+
+        Returns
+        -------
+        - list[dict]
+            One dict per post, keyed the same way as `self.theDict`.
+        '''
+        return convert_extracted_posts(self.driver.execute_script(script) or [])
+
+    def _drain_network_posts(self) -> list[dict]:
+        '''
+        Read the SearchTimeline responses captured since the last call from Chrome's performance log and parse them.
+
+        Returns
+        -------
+        - list[dict]
+            The parsed posts, keyed the same way as `self.theDict` (plus "Post_id").
+        '''
+        return self._parse_network_pages(self._capture_network_pages())
+
+    def _capture_network_bodies(self) -> list[str]:
+        '''
+        Fetch the raw bodies of the SearchTimeline responses captured since the last call from Chrome's performance log.
+
+        A response body can only be fetched once Chrome reports `Network.loadingFinished` for it, so request ids seen in
+        `Network.responseReceived` are kept in the pending set of the account's browser until then (request ids are only
+        unique within a browser). The SearchTimeline request itself is kept too, it's the template of the next page (see
+        `_next_network_page`), and an error status means X throttled the search.
+        '''
+        bodies = []
+        pending = self.account.pending_requests
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            params = message.get("params", {})
+
+            if message.get("method") == "Network.requestWillBeSent":
+                request = params.get("request", {})
+                if "/SearchTimeline" in request.get("url", "") and request.get("method", "GET") == "GET":
+                    self.account.search_request = {"url": request["url"], "headers": request.get("headers", {})}
+                continue
+
+            if message.get("method") == "Network.responseReceived":
+                response = params.get("response", {})
+                if "/SearchTimeline" not in response.get("url", ""):
+                    continue
+                if response.get("status", 200) >= 400:
+                    self._search_throttled = True       # Rate limited or locked, no page in that body
+                else:
+                    pending.add(params["requestId"])
+                continue
+
+            if message.get("method") != "Network.loadingFinished" or params.get("requestId") not in pending:
+                continue
+            pending.discard(params["requestId"])
+
+            try:
+                bodies.append(self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})["body"])
+            except (WebDriverException, KeyError):
+                continue        # Body already evicted by Chrome, nothing to salvage
+        return bodies
+
+    def _decode_network_bodies(self, bodies: list[str]) -> list[dict]:
+        '''
+        Decode raw SearchTimeline bodies (see `_capture_network_bodies`) and keep the latest bottom cursor in `self.cursor`.
+        A page without posts is the end of the search.
+        '''
+        pages = []
+        for body in bodies:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                continue        # Not JSON, nothing to salvage
+            cursor, entries = search_timeline_cursor(payload)
+            if cursor:
+                self.cursor = cursor
+            self._feed_ended = not entries
+            pages.append(payload)
+        return pages
+
+    def _capture_network_pages(self) -> list[dict]:
+        '''
+        The SearchTimeline pages that came in since the last call: the ones already read while waiting for a page
+        (`_wait_for_network_page`) and whatever is in the performance log now.
+        '''
+        pages = self._network_pages + self._decode_network_bodies(self._capture_network_bodies())
+        self._network_pages = []
+        return pages
+
+    def _parse_network_pages(self, pages: list[dict]) -> list[dict]:
+        '''
+        Parse decoded SearchTimeline pages (see `_capture_network_pages`) into posts.
+        '''
+        posts = []
+        for payload in pages:
+            posts.extend(parse_search_timeline(payload)[0])
+        return posts
+
+    def _wait_for_network_page(self, timeout: float) -> bool:
+        '''
+        Poll the performance log until a SearchTimeline page comes in (kept for the next `_capture_batch`) or X answers
+        the search with an error.
+
+        Parameters
+        ----------
+        - timeout : float
+            Seconds to wait at most.
+
+        Returns
+        -------
+        - bool
+            True if a page came in.
+        '''
+        deadline = time.time() + timeout
+        while True:
+            pages = self._decode_network_bodies(self._capture_network_bodies())
+            self._network_pages.extend(pages)
+            now = time.time()
+            if pages or self._search_throttled or now >= deadline:
+                return bool(pages)
+            time.sleep(min(self.POLL_INTERVAL, deadline - now))
+
+    def _load_search_page(self, until: Optional[int], since: Optional[int]) -> dict:
+        '''
+        Open the search page of a window and wait for its first batch.
+
+        With the network backend the page itself isn't looked at: the performance log is flushed first (so nothing of
+        the previous window gets in), then the first SearchTimeline page of the new search is awaited.
+
+        Parameters
+        ----------
+        - until : int, optional
+            unix timestamp of the upper limit of the window.
+        - since : int, optional
+            unix timestamp of the lower limit of the window.
+
+        Returns
+        -------
+        - dict
+            The page state, see `_wait_for_page_change`. For the network backend only "cells" (posts on the first page)
+            and "error" (X answered with an error) are set.
+        '''
+        if self.backend != "network":
+            self.driver.get(self._build_search_url(until, since))
+            return self._wait_for_page_change()
+
+        self._capture_network_bodies()
+        self.account.pending_requests.clear()
+        self.cursor = None
+        self._feed_ended = False
+        self._search_throttled = False
+        self._network_pages = []
+        self.driver.get(self._build_search_url(until, since))
+        self._wait_for_network_page(self.WAIT_LONG)
+        cells = sum(search_timeline_cursor(payload)[1] for payload in self._network_pages)
+        return {"cells": cells, "error": self._search_throttled}
+
+    def _next_network_page(self) -> bool:
+        '''
+        Request the next page of the search from the last bottom cursor (see `NEXT_PAGE_JS`) and wait for it.
+
+        Returns
+        -------
+        - bool
+            True if a page with posts came in, False at the end of the search (or if there's nothing to page from).
+        '''
+        request = self.account.search_request
+        if self._feed_ended or not self.cursor or request is None:
+            return False
+        self.driver.execute_async_script(NEXT_PAGE_JS, request["url"], request["headers"], self.cursor)
+        return self._wait_for_network_page(self.WAIT_SHORT) and not self._feed_ended
+
+    def _next_page(self, page: dict) -> Optional[dict]:
+        '''
+        Load the next batch of the current search: the next cursor page for the network backend, a scroll otherwise.
+
+        Parameters
+        ----------
+        - page : dict
+            The page state before, see `_load_search_page`.
+
+        Returns
+        -------
+        - dict or None
+            The new page state, None if the search has nothing more.
+        '''
+        if self.backend == "network":
+            return page if self._next_network_page() else None
+
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        new_page = self._wait_for_page_change(page)
+        if new_page.get("height") == page.get("height"):
+            return None
+        return new_page
+
+    def _collect_posts(self) -> Iterator[dict]:
+        '''
+        Yield the posts currently available, based on `self.backend` and `self.extractionMode` (see `_capture_batch`).
+
+        Yields
+        ------
+        - dict
+            One dict per post, keyed the same way as `self.theDict`.
+        '''
+        yield from self._parse_batch(*self._capture_batch())
+
+    def _capture_batch(self) -> tuple[str, Union[list, str]]:
+        '''
+        Browser side of `_collect_posts`: grab what's currently available without converting it, so it can be parsed on another thread.
+
+        - backend "network" hands over the SearchTimeline pages captured by Chrome, already decoded (their cursor pages the search).
+        - "observer" drains the posts queued by the in-page MutationObserver since the previous step, in one round-trip.
+        - "script" extracts the whole visible batch in one round-trip.
+        - "snapshot" grabs the timeline's raw HTML in one round-trip, parsed with lxml by `parse_timeline_html`.
+        - "webdriver" walks each element through the WebDriver API (slow, but kept as a fallback if the script breaks).
+
+        Returns
+        -------
+        - tuple[str, list | str]
+            The kind of batch ("network", "script", "html" or "posts") and the raw batch, for `_parse_batch`.
+        '''
+        if self.backend == "network":
+            return "network", self._capture_network_pages()
+        if self.extractionMode == "observer":
+            return "script", self.driver.execute_script(OBSERVE_POSTS_JS) or []
+        if self.extractionMode == "script":
+            return "script", self.driver.execute_script(EXTRACT_POSTS_JS) or []
+        if self.extractionMode == "snapshot":
+            return "html", self.driver.execute_script(TIMELINE_HTML_JS) or ""
+        return "posts", list(self._walk_post_elements())
+
+    def _parse_batch(self, kind: str, raw: Union[list, str]) -> list[dict]:
+        '''
+        Convert a batch from `_capture_batch` to posts keyed the same way as `self.theDict`. Doesn't touch the browser.
+        '''
+        if kind == "network":
+            return self._parse_network_pages(raw)
+        if kind == "script":
+            return convert_extracted_posts(raw)
+        if kind == "html":
+            return parse_timeline_html(raw)
+        return raw
+
+    def _store_snapshot(self, page: str) -> str:
+        '''
+        Keep a gzipped copy of a captured timeline HTML in `Process/<processDir>/Snapshots`, so it can be parsed again later
+        (see `parse_snapshots`). File names sort in capture order.
+
+        Once the snapshots take more than `self.snapshotLimit` bytes, the oldest ones are deleted (the latest is always kept).
+
+        Returns
+        -------
+        - str
+            The path to the snapshot.
+        '''
+        directory = f"Process/{self.processDir}/Snapshots"
+        os.makedirs(directory, exist_ok=True)
+        if self._snapshots is None:     # Snapshots of an earlier run of this processDir count too
+            self._snapshots = deque((os.path.join(directory, name), os.path.getsize(os.path.join(directory, name)))
+                                    for name in sorted(os.listdir(directory)) if name.endswith(".html.gz"))
+            self._snapshot_bytes = sum(size for _, size in self._snapshots)
+
+        path = f"{directory}/{time.time_ns()}.html.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(page)
+        self._snapshots.append((path, os.path.getsize(path)))
+        self._snapshot_bytes += self._snapshots[-1][1]
+
+        while self.snapshotLimit is not None and self._snapshot_bytes > self.snapshotLimit and len(self._snapshots) > 1:
+            oldest, size = self._snapshots.popleft()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(oldest)
+            self._snapshot_bytes -= size
+        return path
+
+    def _walk_post_elements(self) -> Iterator[dict]:
+        '''
+        Read every visible post element by element through the WebDriver API.
+        '''
+        elements = self.driver.find_elements(By.XPATH, '//div[@aria-label="Timeline: Search timeline"]/div/div')
+        for element in elements[:-1]:
+            try:
+                post_text, quoted_text, post_user, post_date, post_id = self._extract_post_data(element)
+                reply_count, repost_count, like_count, view_count = self._extract_metrics(element)
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue
+
+            yield {"User": post_user, "Date": post_date, "post_text": post_text, "quotedPost_text": quoted_text,
+                   "Reply_count": reply_count, "Repost_count": repost_count, "Like_count": like_count, "View_count": view_count,
+                   "Post_id": post_id}
+
+    def _write_json(self, filename: str, start_index: Optional[int] = None, chunks: Optional[Iterable[postBuffer]] = None) -> None:
+        '''
+        Write the scraped data to a JSON file, streamed chunk by chunk (see `_final_chunks`).
+
+        The file is the same as `json.dump` of {index: post} with an indent of 4, without holding it all in memory.
+
+        Parameters
+        ----------
+        - filename : str
+            The name of the file to write the JSON data to.
+        - start_index : Optional[int]
+            If given, the posts are appended to the existing file instead (see `start(..., follow=True)`), numbered from this
+            (the number of posts already in it). Only the closing brace is rewritten.
+        - chunks : Iterable[postBuffer], optional
+            The posts to write. Default is every collected post (`_final_chunks`).
+        '''
+        if start_index is None:
+            mode, index = "w", 0
+        else:
+            with open(filename, "r+b") as f:
+                f.seek(-2 if start_index else -1, os.SEEK_END)     # Over the closing "\n}", or the "}" of an empty object
+                f.truncate()
+            mode, index = "a", start_index
+        with open(filename, mode, encoding='utf-8') as f:
+            if start_index is None:
+                f.write("{")
+            for chunk in self._final_chunks() if chunks is None else chunks:
+                for post in chunk.rows():
+                    # Every entry as json.dump would indent it inside the outer object, without its braces
+                    f.write(("," if index else "") + json.dumps({str(index): post}, ensure_ascii=False, indent=4)[1:-2])
+                    index += 1
+            f.write("\n}" if index else "}")
+
+    def _write_csv(self, filename: str, append: bool = False, chunks: Optional[Iterable[postBuffer]] = None,
+                   columns: Optional[list[str]] = None) -> None:
+        '''
+        Write the scraped data to a CSV file, streamed chunk by chunk (see `_final_chunks`).
+
+        Parameters
+        ----------
+        - filename : str
+            The name of the file to write the CSV data to.
+        - append : bool
+            Whether to append the rows (without the header) to the existing file, see `start(..., follow=True)`. The rows get the
+            columns of the existing header, e.g. no Post_id in a file from before post ids were read.
+        - chunks : Iterable[postBuffer], optional
+            The posts to write. Default is every collected post (`_final_chunks`).
+        - columns : list[str], optional
+            The columns to write. Default is `POST_COLUMNS`, or the existing header when appending.
+        '''
+        import pandas as pd
+        if columns is None:
+            columns = pd.read_csv(filename, nrows=0).columns.tolist() if append and os.path.getsize(filename) else POST_COLUMNS
+        with open(filename, "a" if append else "w", encoding="utf-8", newline="") as f:
+            for i, chunk in enumerate(self._final_chunks() if chunks is None else chunks):
+                data = chunk.to_dict()
+                df = pd.DataFrame(data, columns=POST_COLUMNS)
+                df["Post_id"] = pd.array(data["Post_id"], dtype="Int64")     # Ids are past float precision, keep them exact
+                df.reindex(columns=columns).to_csv(f, index=False, header=i == 0 and not append)
+
+    def _columnar_batch(self, buffer: postBuffer, start: int, stop: int, shared_dictionary: bool = False) -> "pa.RecordBatch":
+        '''
+        Build a typed Arrow record batch out of rows [start, stop) of `buffer`.
+
+        Dates stay int64 unix timestamps, counts become int32 and `User` is dictionary-encoded. Parquet keeps a dictionary per
+        row group, so by default the batch gets its own. Arrow IPC files only take dictionary deltas, not a new dictionary per
+        batch, so with `shared_dictionary` the batch is encoded against the one dictionary of the streamed Final file
+        (`self._columnar_users`), which only grows: only the handles it hasn't seen yet are converted and appended to it.
+        '''
+        def text(values):
+            return pa.array([v if isinstance(v, str) else None for v in values], pa.string())
+
+        def count(values):
+            return pa.array(values, pa.int32())
+
+        rows = buffer.to_dict(start, stop, formatted=False)
+        if shared_dictionary:
+            users = self._columnar_users
+            new_users = []
+            user_indices = []
+            for user in rows["User"]:
+                index = users.get(user)
+                if index is None:
+                    index = users[user] = len(users)
+                    new_users.append(user)
+                user_indices.append(index)
+            if new_users or self._columnar_user_values is None:
+                new_values = pa.array(new_users, pa.string())
+                self._columnar_user_values = (new_values if self._columnar_user_values is None
+                                              else pa.concat_arrays([self._columnar_user_values, new_values]))
+            user_column = pa.DictionaryArray.from_arrays(pa.array(user_indices, pa.int32()), self._columnar_user_values)
+        else:
+            user_column = pa.array(rows["User"], pa.string()).dictionary_encode()
+        return pa.record_batch({
+            "User": user_column,
+            "Date": pa.array(rows["Date"], pa.int64()),
+            "post_text": text(rows["post_text"]),
+            "quotedPost_text": text(rows["quotedPost_text"]),
+            "Reply_count": count(rows["Reply_count"]),
+            "Repost_count": count(rows["Repost_count"]),
+            "Like_count": count(rows["Like_count"]),
+            "View_count": count(rows["View_count"]),
+            "Post_id": pa.array(rows["Post_id"], pa.int64()),
+        })
+
+    def _append_columnar(self, buffer: postBuffer, start: int = 0) -> None:
+        '''
+        Write rows [start:] of `buffer` to `Process/<processDir>/Final.<parquet|arrow>.part` as one row group (Parquet) or record
+        batch (Arrow IPC), opening the file first if it isn't yet.
+        '''
+        if self._columnar_writer is None:
+            os.makedirs(f"Process/{self.processDir}", exist_ok=True)
+            part_path = f"Process/{self.processDir}/Final.{self.saveFormat}.part"
+            self._columnar_users = {}
+            self._columnar_user_values = None
+            schema = self._columnar_batch(buffer, 0, 0).schema
+            if self.saveFormat == "parquet":
+                self._columnar_writer = pq.ParquetWriter(part_path, schema)
+            else:
+                self._columnar_writer = pa.ipc.new_file(part_path, schema, options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+            if self._columnar_backfill:
+                # Resumed run: the file closed by `_suspend` is rewritten, the posts collected before the resume go first
+                self._columnar_backfill = False
+                for chunk in self._segment_chunks():
+                    self._append_columnar(chunk)
+
+        if len(buffer) > start:
+            batch = self._columnar_batch(buffer, start, len(buffer), shared_dictionary=self.saveFormat == "arrow")
+            if self.saveFormat == "parquet":
+                self._columnar_writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                self._columnar_writer.write_batch(batch)
+
+    def _write_columnar(self, final: bool, flush: bool = False, path: Optional[str] = None) -> str:
+        '''
+        Stream the rows of `self.theDict` that haven't been written yet to `Process/<processDir>/Final.<parquet|arrow>.part`.
+
+        During the scrape a new row group (Parquet) or record batch (Arrow IPC) is only written once `ROW_GROUP_SIZE` rows are pending,
+        or right away with `flush` (before a spill, see `_spill`). On the final save the rest is written, the file is closed and
+        renamed to `Final.<parquet|arrow>`.
+
+        Parameters
+        ----------
+        - final : bool
+            Whether this is the final save.
+        - flush : bool
+            Whether to write the pending rows even if there's less than `ROW_GROUP_SIZE` of them.
+        - path : Optional[str]
+            Where the finished file goes instead of `Final.<parquet|arrow>`, e.g. a part of a follow dataset (see `_dataset_part_path`).
+
+        Returns
+        -------
+        - str
+            The path to the file.
+        '''
+        final_path = f"Process/{self.processDir}/Final.{self.saveFormat}"
+        part_path = f"{final_path}.part"
+        total = len(self.theDict)
+        if not (final or flush) and total - self._columnar_rows < ROW_GROUP_SIZE:
+            return part_path
+
+        if total > self._columnar_rows or self._columnar_writer is None:
+            self._append_columnar(self.theDict, self._columnar_rows)
+            self._columnar_rows = total
+
+        if not final:
+            return part_path
+
+        self._columnar_writer.close()
+        self._columnar_writer = None
+        if path is None and os.path.isdir(final_path):
+            shutil.rmtree(final_path)       # A follow dataset (see `_dataset_part_path`) this run starts over
+        os.replace(part_path, path or final_path)
+        return path or final_path
+
+    def _read_savefile(self, path: str) -> postBuffer:
+        '''
+        Read a CSV, JSON, Parquet or Arrow file written by `save()` back into the `self.theDict` layout.
+
+        Parameters
+        ----------
+        - path : str
+            Path to the file.
+
+        Returns
+        -------
+        - postBuffer
+            The data.
+        '''
+        if path.endswith((".parquet", ".arrow")):
+            if os.path.isdir(path):     # A follow dataset, one file per run (see `_dataset_part_path`)
+                import pyarrow.dataset as ds
+                table = ds.dataset(path, format="parquet" if path.endswith(".parquet") else "arrow").to_table()
+            else:
+                table = pq.read_table(path) if path.endswith(".parquet") else pa.ipc.open_file(path).read_all()
+            data = table.to_pydict()      # Dates are unix timestamps already
+            data.setdefault("Post_id", [None] * table.num_rows)    # Files from before post ids were captured
+            return postBuffer.from_columns(data)
+
+        import pandas as pd
+        if path.endswith(".csv"):
+            df = pd.read_csv(path, dtype={"Post_id": "Int64"})
+            post_ids = [None if pd.isna(v) else int(v) for v in df["Post_id"]] if "Post_id" in df.columns else None
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            df = pd.DataFrame.from_dict(data, orient="index")
+            post_ids = [row.get("Post_id") for row in data.values()]    # Straight from json, pandas would turn them into floats
+
+        data = {col: df[col].tolist() for col in df.columns}    # Convert DataFrame to dictionary
+        data["Post_id"] = post_ids or [None] * len(df)          # Files from before post ids were captured have none
+        return postBuffer.from_columns(data)
+
+    def _iter_savefile(self, path: str, chunk_rows: int = ROW_GROUP_SIZE) -> Iterator[postBuffer]:
+        '''
+        Read a file written by `save()` back in chunks of at most `chunk_rows` posts, in file order, see `_read_savefile`.
+
+        Parquet row groups, Arrow record batches and CSV rows are streamed. A JSON file is one object, it's parsed whole and only
+        handed out in chunks.
+        '''
+        if path.endswith((".parquet", ".arrow")) and not os.path.isdir(path):
+            if path.endswith(".parquet"):
+                batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_rows)
+            else:
+                reader = pa.ipc.open_file(path)
+                batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            for batch in batches:
+                for start in range(0, batch.num_rows, chunk_rows):     # Arrow record batches can be larger than a chunk
+                    data = batch.slice(start, chunk_rows).to_pydict()
+                    data.setdefault("Post_id", [None] * len(data["Date"]))    # Files from before post ids were captured
+                    yield postBuffer.from_columns(data)
+        elif path.endswith(".csv"):
+            import pandas as pd
+            for df in pd.read_csv(path, dtype={"Post_id": "Int64"}, chunksize=chunk_rows):
+                data = {col: df[col].tolist() for col in df.columns}
+                data["Post_id"] = [None if pd.isna(v) else int(v) for v in df["Post_id"]] if "Post_id" in df.columns else [None] * len(df)
+                yield postBuffer.from_columns(data)
+        elif path.endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                rows = iter(json.load(f).values())
+            for batch in iter(lambda: list(itertools.islice(rows, chunk_rows)), []):
+                yield postBuffer(batch)
+        else:
+            yield self._read_savefile(path)     # A follow dataset directory
+
+    def _load_latest_savepoint(self) -> bool:
+        '''
+        Load the latest savepoint from the Savepoints directory.
+
+        Resumes from the manifest if there's one (see `_resume_from_manifest`), without reading any post. Otherwise (runs from before
+        the manifest) uses the eariest date as the `self.start_date` from the journal, or from the most recently modified file in
+        the Savepoints directory, loads the data into `self.theDict` and writes the dedupe keys and a manifest for next time.
+
+        Returns
+        -------
+        - bool
+            True if a savepoint was loaded, False otherwise.
+        '''
+
+        save_dir = f"Process/{self.processDir}/Savepoints"
+
+        # Checkers if there's any savepoint
+        if not os.path.isdir(save_dir):
+            return False
+
+        manifest = self._read_manifest()
+        if manifest is not None:
+            return self._resume_from_manifest(manifest)
+
+        self._segments = sorted(f for f in os.listdir(save_dir) if f.startswith("segment_") and f.endswith(".jsonl"))
+        if os.path.exists(self._journal_path()):
+            latest_file = "journal.jsonl"
+            self.theDict = self._read_journal()
+            self._journaled = len(self.theDict)
+        else:
+            # Savepoints from before the journal, a full copy per file
+            files = [f for f in os.listdir(save_dir) if f.endswith((".csv", ".json"))]
+            if not files:
+                return False
+
+            # Get the latest savepoint file
+            latest_file = max(files, key=lambda f: os.path.getmtime(os.path.join(save_dir, f)))
+            self.theDict = self._read_savefile(os.path.join(save_dir, latest_file))
+            self._journaled = 0         # So the next savepoint carries everything over into the journal
+
+        # Spilled segments (see `_spill`) stay on disk, they're only streamed through for their dates and keys
+        dates = [chunk.min_date() for chunk in itertools.chain(self._segment_chunks(), [self.theDict]) if len(chunk)]
+        if dates:
+            self.start_date = self._earliest_date = min(dates)
+        self.last_post_date = self.theDict.last_date()
+
+        # What the manifest needs from now on: the keys of everything journaled so far (and whether some are id-less), and the journal's size
+        self._idless_rows = self._idless_rows or any(chunk.has_idless() for chunk in itertools.chain(self._segment_chunks(), [self.theDict]))
+        keys = itertools.chain((key for chunk in self._segment_chunks() for key in chunk.dedupe_keys()),
+                               itertools.islice(self.theDict.dedupe_keys(), self._journaled))
+        with open(self._keys_path(), "wb") as f:
+            self._keys_written = 0
+            for batch in iter(lambda: array("q", itertools.islice(keys, ROW_GROUP_SIZE)), array("q")):
+                batch.tofile(f)
+                self._keys_written += len(batch)
+        self._journal_bytes = os.path.getsize(self._journal_path()) if os.path.exists(self._journal_path()) else 0
+        self._write_manifest()
+
+        print(f"Resumed from savepoint: {latest_file}")
+        return True
+
+    def _manifest_path(self) -> str:
+        return f"Process/{self.processDir}/Savepoints/manifest.json"
+
+    def _keys_path(self) -> str:
+        return f"Process/{self.processDir}/Savepoints/keys.bin"
+
+    def _write_manifest(self) -> None:
+        '''
+        Atomically write `Savepoints/manifest.json`: the cursor, the end date, the window planner state and pointers into the
+        journal, its segments and the dedupe keys (`keys.bin`, 8 bytes per post). Written at every savepoint and spill, after the
+        journal and the keys are fsynced, so it never points past what's on disk.
+        '''
+        planner = getattr(self, "_planner", None)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "written": datetime.now().strftime(DATE_FORMAT),
+            "cursor": min(self.start_date, self._earliest_date) if self._earliest_date is not None else self.start_date,
+            "end_date": self.end_date,
+            "last_post_date": self.last_post_date,
+            "planner": planner.state() if planner is not None else self._planner_state,
+            "segments": self._segments,
+            "journal_rows": self._journaled,
+            "journal_bytes": self._journal_bytes,
+            "keys": self._keys_written,
+            "idless": self._idless_rows,
+        }
+        _atomic_write_json(self._manifest_path(), manifest)
+
+    def _read_manifest(self) -> Optional[dict]:
+        if not os.path.exists(self._manifest_path()):
+            return None
+        with open(self._manifest_path(), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+    def _resume_from_manifest(self, manifest: dict) -> bool:
+        '''
+        Resume from `Savepoints/manifest.json` in constant time: nothing but the manifest is read.
+
+        Whatever was written after the manifest (a crash in the middle of a savepoint) is cut off the journal and the keys, a spill
+        that didn't finish is finished, and the journal becomes a segment of its own. `self.theDict` starts empty, the collected
+        posts stay on disk until the Final output streams them (`_final_chunks`) and `_rebuild_seen` only reads the keys back.
+
+        Returns
+        -------
+        - bool
+            Always True.
+        '''
+        save_dir = f"Process/{self.processDir}/Savepoints"
+        self._segments = list(manifest["segments"])
+        if self._segments and not os.path.exists(os.path.join(save_dir, self._segments[-1])) and os.path.exists(self._journal_path()):
+            os.replace(self._journal_path(), os.path.join(save_dir, self._segments[-1]))     # The spill got cut short
+        if not os.path.exists(self._journal_path()):
+            open(self._journal_path(), "w").close()
+        os.truncate(self._journal_path(), manifest["journal_bytes"])
+        with open(self._keys_path(), "ab") as f:
+            f.truncate(manifest["keys"] * 8)
+
+        self._keys_written = manifest["keys"]
+        self._idless_rows = self._idless_rows or manifest.get("idless", True)    # Manifests before the flag may hold id-less keys
+        self.start_date = manifest["cursor"]
+        self._earliest_date = manifest["cursor"]
+        self.last_post_date = manifest["last_post_date"]
+        self._planner_state = manifest["planner"]
+        self.theDict = postBuffer()
+        self._journaled = 0
+        self._journal_bytes = 0
+        if manifest["journal_rows"]:
+            self._rotate_journal()
+        else:
+            self._write_manifest()
+
+        print(f"Resumed from manifest: cursor at {datetime.fromtimestamp(self.start_date).strftime('%Y-%m-%d %H:%M:%S')}, "
+              f"{self._keys_written} posts collected")
+        return True
+
+    def _read_keys(self) -> array:
+        '''
+        The dedupe keys of every journaled post, as counted by the manifest.
+        '''
+        keys = array("q")
+        if self._keys_written and os.path.exists(self._keys_path()):
+            with open(self._keys_path(), "rb") as f:
+                keys.frombytes(f.read(self._keys_written * 8))
+        return keys
+
+    def _post_key(self, post: dict) -> int:
+        '''
+        Get the identity of a post used for deduplication, see `post_key`.
+        '''
+        return post_key(post)
+
+    def _rebuild_seen(self) -> None:
+        '''
+        Reset `self._seen` to the posts already collected: the journaled ones straight from `Savepoints/keys.bin`, the ones
+        of `self.theDict` that aren't journaled yet and, for a follow run, the ones of the dataset within the overlap. Used for resuming from savepoint (the sqlite storage dedupes against its
+        index instead).
+        '''
+        self._seen = compactIdSet()    # Uniqueness so there won't be a fuckton of duplicates, 8 bytes per post
+        if self.storage == "memory":
+            self._seen = compactIdSet(itertools.chain(self._read_keys(), self.theDict.dedupe_keys(self._journaled), self._follow_keys))
+            self._idless_rows = self._idless_rows or self.theDict.has_idless(self._journaled)
+
+    def _is_seen(self, key: int, post: Optional[dict] = None) -> bool:
+        '''
+        Check if the post was already collected, in memory or (for the sqlite storage) through the unique index of the posts table.
+
+        If some collected posts are keyed on their `idless_key` (see `self._idless_rows`), a `post` read with its id is also
+        looked up under its id-less key, so posts of older savepoints/datasets aren't collected twice.
+        '''
+        keys = (key,)
+        if self._idless_rows and post is not None and post.get("Post_id") is not None:
+            keys = (key, idless_key(post))
+        if any(k in self._seen for k in keys):
+            return True
+        if self.storage == "sqlite":
+            return self._db.execute(f"SELECT 1 FROM posts WHERE post_key IN ({', '.join('?' * len(keys))})", keys).fetchone() is not None
+        return False
+
+    def _add_post(self, post: dict, key: int) -> None:
+        '''
+        Append a new post to `self.theDict` and mark it as seen.
+        '''
+        self._seen.add(key)
+        self._idless_rows = self._idless_rows or post.get("Post_id") is None
+        self.theDict.append(post)
+        self.last_post_date = post["Date"]
+        if self._earliest_date is None or post["Date"] < self._earliest_date:
+            self._earliest_date = post["Date"]
+
+    def _unsaved_rows(self) -> int:
+        '''
+        Number of posts in `self.theDict` that aren't in the journal (or the sqlite storage) yet.
+        '''
+        return len(self.theDict) - self._journaled
+
+    def _open_store(self) -> None:
+        '''
+        Open (or create) the sqlite storage at `Process/<processDir>/posts.sqlite`.
+
+        Posts are deduplicated by a unique index on their identity and upserted, so a post seen again only gets its counts refreshed.
+        The `progress` table keeps the cursor, so resuming doesn't need to read any post back.
+        '''
+        import sqlite3
+        os.makedirs(f"Process/{self.processDir}", exist_ok=True)
+        # Written from the pipeline thread too, never at the same time as the browser thread (see `scrape`)
+        self._db = sqlite3.connect(f"Process/{self.processDir}/posts.sqlite", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute('''CREATE TABLE IF NOT EXISTS posts (
+                                id INTEGER PRIMARY KEY,
+                                post_key INTEGER NOT NULL,
+                                User TEXT, Date TEXT, post_text TEXT, quotedPost_text TEXT,
+                                Reply_count INTEGER, Repost_count INTEGER, Like_count INTEGER, View_count INTEGER,
+                                Post_id INTEGER)''')
+        if "Post_id" not in {row[1] for row in self._db.execute("PRAGMA table_info(posts)")}:    # Storage from before post ids
+            self._db.execute("ALTER TABLE posts ADD COLUMN Post_id INTEGER")
+        self._db.execute("CREATE UNIQUE INDEX IF NOT EXISTS posts_key ON posts (post_key)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS progress (name TEXT PRIMARY KEY, value)")
+        self._db.commit()
+
+    def _flush_store(self) -> str:
+        '''
+        Upsert the posts in `self.theDict` into the sqlite storage in one transaction, save the cursor and empty `self.theDict`.
+
+        Returns
+        -------
+        - str
+            The path to the database.
+        '''
+        columns = POST_COLUMNS
+        data = self.theDict.to_dict()       # The posts table keeps formatted dates
+        rows = list(zip(self.theDict.dedupe_keys(), *data.values()))
+
+        with self._db:
+            self._db.executemany(
+                f'''INSERT INTO posts (post_key, {", ".join(columns)}) VALUES ({", ".join("?" * (len(columns) + 1))})
+                    ON CONFLICT(post_key) DO UPDATE SET Reply_count = excluded.Reply_count, Repost_count = excluded.Repost_count,
+                                                        Like_count = excluded.Like_count, View_count = excluded.View_count''',
+                rows)
+            progress = {"start_date": self.start_date, "end_date": self.end_date, "last_post_date": self.last_post_date}
+            if len(self.theDict):
+                earliest = self.theDict.min_date()
+                stored = self._db.execute("SELECT value FROM progress WHERE name = 'earliest_date'").fetchone()
+                progress["earliest_date"] = min(earliest, stored[0]) if stored else earliest
+            self._db.executemany("INSERT INTO progress (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                                 list(progress.items()))
+
+        self.theDict = postBuffer()
+        self._journaled = 0
+        self._seen = compactIdSet()     # Flushed posts are found through the index from now on
+        return f"Process/{self.processDir}/posts.sqlite"
+
+    def _load_store_progress(self) -> bool:
+        '''
+        Resume from the `progress` table of the sqlite storage. Constant time, no post is read back.
+
+        Returns
+        -------
+        - bool
+            True if there was progress to resume from, False otherwise.
+        '''
+        progress = dict(self._db.execute("SELECT name, value FROM progress").fetchall())
+        if "earliest_date" not in progress:
+            return False
+        self.start_date = progress["earliest_date"]
+        last_post_date = progress.get("last_post_date")      # A formatted date in storages from before `postBuffer`
+        self.last_post_date = date_to_unix(last_post_date) if last_post_date is not None else None
+        print(f"Resumed from sqlite storage, cursor at {datetime.fromtimestamp(self.start_date).strftime('%Y-%m-%d %H:%M:%S')}")
+        return True
+
+    def _journal_path(self) -> str:
+        return f"Process/{self.processDir}/Savepoints/journal.jsonl"
+
+    def _append_journal(self) -> str:
+        '''
+        Append the posts that aren't in the savepoint journal yet, one JSON line per post (dates as unix timestamps), and fsync the file.
+
+        Every call only writes the new rows, so a crash loses at most the posts collected since the previous call. Their dedupe
+        keys are appended to `Savepoints/keys.bin`, then the manifest is updated (see `_write_manifest`).
+
+        Returns
+        -------
+        - str
+            The path to the journal.
+        '''
+        os.makedirs(f"Process/{self.processDir}/Savepoints", exist_ok=True)
+        with open(self._journal_path(), "a", encoding="utf-8") as f:
+            for row in self.theDict.rows(self._journaled, formatted=False):
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+            self._journal_bytes = f.tell()
+        keys = array("q", self.theDict.dedupe_keys(self._journaled))
+        with open(self._keys_path(), "ab") as f:
+            keys.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        self._keys_written += len(keys)
+        self._journaled = len(self.theDict)
+        self._write_manifest()
+        return self._journal_path()
+
+    def _read_journal(self) -> postBuffer:
+        '''
+        Read the savepoint journal back into the `self.theDict` layout.
+
+        Returns
+        -------
+        - postBuffer
+            The data.
+        '''
+        return next(self._iter_journal(self._journal_path(), sys.maxsize), postBuffer())
+
+    def _iter_journal(self, path: str, chunk_rows: int = ROW_GROUP_SIZE) -> Iterator[postBuffer]:
+        '''
+        Read a savepoint journal (or a spilled segment of one) back in chunks of `chunk_rows` posts.
+
+        A torn last line (crash in the middle of a write) is dropped. Journals from before `postBuffer` have formatted dates,
+        they're read all the same.
+        '''
+        chunk = postBuffer()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    break
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    yield chunk
+                    chunk = postBuffer()
+        if len(chunk):
+            yield chunk
+
+    def _segment_paths(self) -> list[str]:
+        '''
+        The spilled segments of the savepoint journal, in the order they were written.
+        '''
+        return [f"Process/{self.processDir}/Savepoints/{name}" for name in self._segments]
+
+    def _segment_chunks(self) -> Iterator[postBuffer]:
+        for path in self._segment_paths():
+            yield from self._iter_journal(path)
+
+    def _spill(self) -> str:
+        '''
+        Move every post in memory to disk and empty `self.theDict`, see `start(..., maxBufferedPosts)`.
+
+        The rows are appended to the journal (and written to the streamed Parquet/Arrow file), then the journal becomes the next
+        segment (see `_rotate_journal`). Segments are only read back in chunks, to stream the Final output.
+
+        Returns
+        -------
+        - str
+            The path to the new segment.
+        '''
+        with self.metrics.timer("save"):
+            self._append_journal()
+            if self.saveFormat in {"parquet", "arrow"}:
+                self._write_columnar(final=False, flush=True)
+            self.theDict = postBuffer()
+            self._journaled = 0
+            self._columnar_rows = 0
+            segment = self._rotate_journal()
+        self.metrics.count("spills")
+        return segment
+
+    def _rotate_journal(self) -> str:
+        '''
+        Rename the journal to the next `segment_<n>.jsonl` and start a new, empty one. Every post of the journal has to be out of
+        `self.theDict` already.
+
+        The manifest lists the segment before the rename, so a crash in between is finished on resume (`_resume_from_manifest`).
+
+        Returns
+        -------
+        - str
+            The path to the new segment.
+        '''
+        self._segments.append(f"segment_{len(self._segments) + 1:05d}.jsonl")
+        self._journal_bytes = 0
+        self._write_manifest()
+        segment = self._segment_paths()[-1]
+        os.replace(self._journal_path(), segment)
+        open(self._journal_path(), "w").close()     # So a resume right after still finds a journal
+        return segment
+
+    def _final_chunks(self) -> Iterator[postBuffer]:
+        '''
+        Every collected post for the Final output in the order they were collected, at most `ROW_GROUP_SIZE` posts at a time
+        except for `self.theDict`: the sqlite storage, or the spilled segments followed by `self.theDict`.
+        '''
+        if self.storage == "sqlite":
+            cursor = self._db.execute(f"SELECT {', '.join(POST_COLUMNS)} FROM posts ORDER BY id")
+            while rows := cursor.fetchmany(ROW_GROUP_SIZE):
+                yield postBuffer(dict(zip(POST_COLUMNS, row)) for row in rows)
+            return
+        yield from self._segment_chunks()
+        yield self.theDict
+
+    def save(self, type: Literal["final", "savepoint"]) -> str:
+        '''
+        Save the current progress to a file.
+
+        Savepoints are appended to `Process/<processDir>/Savepoints/journal.jsonl`, only the rows since the previous savepoint.
+        The final file extension and format is based on `self.saveFormat`. "parquet" and "arrow" are also streamed in row groups
+        while scraping (see `_write_columnar`).
+
+        Parameters
+        ----------
+        - type : Literal["final", "savepoint"]
+            The type of save to perform. "final" for final save, "savepoint" for intermediate savepoint.
+
+        Returns
+        -------
+        - str
+            The path to the saved file.
+        '''
+        if type not in {"final", "savepoint"}:
+            raise ValueError("Save type must be 'final' or 'savepoint'.")
+
+        with self.metrics.timer("save"):
+            if type == "savepoint":
+                self.metrics.count("savepoints")
+            return self._write_save(type)
+
+    def _write_save(self, type: Literal["final", "savepoint"]) -> str:
+        '''
+        Body of `save()`, without the metrics.
+        '''
+        if type == "savepoint":
+            if self.storage == "sqlite":
+                return self._flush_store()
+            journal_path = self._append_journal()
+            if self.saveFormat in {"parquet", "arrow"}:
+                self._write_columnar(final=False)
+            return journal_path
+
+        if self.storage == "sqlite":
+            self._flush_store()     # Empties self.theDict, the Final output streams out of the storage (see `_final_chunks`)
+
+        os.makedirs(f"Process/{self.processDir}", exist_ok=True)
+        save_path = f"Process/{self.processDir}/Final"
+        # A follow run merges into the existing dataset, any other run replaces it (and what follow.json knew about it)
+        merge = self._follow is not None and self._follow["merge"]
+        if self._follow is None and os.path.exists(self._follow_path()):
+            os.remove(self._follow_path())
+
+        if self.saveFormat == "csv":
+            self._write_csv(f"{save_path}.csv", append=merge)
+        elif self.saveFormat == "json":
+            self._write_json(f"{save_path}.json", self._follow["rows"] if merge else None)
+        elif self.saveFormat == "both":
+            self._write_csv(f"{save_path}.csv", append=merge)
+            self._write_json(f"{save_path}.json", self._follow["rows"] if merge else None)
+        elif self.saveFormat in {"parquet", "arrow"}:
+            if self.storage == "sqlite":
+                for chunk in self._final_chunks():
+                    self._append_columnar(chunk)
+            if merge and not self._collected_rows():
+                # Nothing new since the last follow run, no empty part
+                if self._columnar_writer is not None:
+                    self._columnar_writer.close()
+                    self._columnar_writer = None
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(f"{save_path}.{self.saveFormat}.part")
+                return f"{save_path}.{self.saveFormat}"
+            return self._write_columnar(final=True, path=self._dataset_part_path() if merge else None)
+        else:
+            raise ValueError("saveFormat must be 'csv', 'json', 'both', 'parquet' or 'arrow'.")
+
+        return save_path    # This ain't used, but yeah.
+
+    def _collected_rows(self) -> int:
+        '''
+        Number of posts collected by this run (memory storage): the journaled ones, counted by their keys, plus the unsaved ones.
+        '''
+        return self._keys_written + self._unsaved_rows()
+
+    def _follow_path(self) -> str:
+        return f"Process/{self.processDir}/follow.json"
+
+    def _final_paths(self) -> list[str]:
+        '''
+        The Final file(s) of `self.saveFormat`.
+        '''
+        extensions = ["csv", "json"] if self.saveFormat == "both" else [self.saveFormat]
+        return [f"Process/{self.processDir}/Final.{extension}" for extension in extensions]
+
+    def _read_follow(self) -> dict:
+        if not os.path.exists(self._follow_path()):
+            return {"dataset": None, "queries": {}}
+        with open(self._follow_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_follow(self, state: dict) -> None:
+        '''
+        Atomically write `Process/<processDir>/follow.json`: the high-water mark of every followed query, and the size of the
+        dataset the follow runs merge into. It's the commit point of a follow run, whatever the Final files hold past what it
+        records is rolled back by the next run (see `_rollback_dataset`).
+        '''
+        _atomic_write_json(self._follow_path(), state)
+
+    def _dataset_files(self) -> dict[str, int]:
+        '''
+        What follow.json keeps of each Final file: the size in bytes of a CSV/JSON file, the number of parts of a Parquet/Arrow one.
+        '''
+        files = {}
+        for path in self._final_paths():
+            if path.endswith((".parquet", ".arrow")):
+                files[os.path.basename(path)] = len(os.listdir(path)) if os.path.isdir(path) else int(os.path.exists(path))
+            elif os.path.exists(path):
+                files[os.path.basename(path)] = os.path.getsize(path)
+        return files
+
+    def _dataset_part_path(self) -> str:
+        '''
+        Path of the next part of a Parquet/Arrow follow dataset.
+
+        The first merge turns `Final.<parquet|arrow>` into a directory with one file per run, the old file moved in (not rewritten)
+        as `part-00000`. `pq.read_table` and `pyarrow.dataset` read the directory as one table, and so does `_read_savefile`.
+        '''
+        final_path = f"Process/{self.processDir}/Final.{self.saveFormat}"
+        if os.path.isfile(final_path):
+            os.replace(final_path, f"{final_path}.first")
+        if os.path.exists(f"{final_path}.first"):
+            os.makedirs(final_path, exist_ok=True)
+            os.replace(f"{final_path}.first", f"{final_path}/part-00000.{self.saveFormat}")
+        return f"{final_path}/part-{len(os.listdir(final_path)):05d}.{self.saveFormat}"
+
+    def _rollback_dataset(self, dataset: dict) -> None:
+        '''
+        Cut the Final files back to what follow.json recorded, undoing the merge of a follow run that stopped before recording it.
+        '''
+        for path in self._final_paths():
+            recorded = dataset["files"].get(os.path.basename(path))
+            if recorded is None or not os.path.exists(path) and not os.path.exists(f"{path}.first"):
+                continue
+            if path.endswith((".parquet", ".arrow")):
+                if os.path.exists(f"{path}.first"):
+                    self._dataset_part_path()       # Stopped while turning the file into a directory
+                if os.path.isdir(path):
+                    for name in os.listdir(path):
+                        if int(name.split("-")[1].split(".")[0]) >= max(recorded, 1):
+                            os.remove(os.path.join(path, name))
+            elif os.path.getsize(path) != recorded:
+                print(f"Rolling {path} back to the last recorded follow run")
+                with open(path, "r+b") as f:
+                    f.truncate(recorded)
+                    if path.endswith(".json"):
+                        # A stop in the middle of the append may have cut the closing brace already
+                        closing = b"\n}" if dataset["rows"] else b"}"
+                        f.seek(recorded - len(closing))
+                        f.write(closing)
+
+    def _follow_mark(self, chunks: Iterable[postBuffer], query_state: Optional[dict], overlap: int, known_since: int) -> tuple[dict, int]:
+        '''
+        The state of a followed query after adding the posts of `chunks` to it, every post since `known_since` being either in
+        `chunks` or in the previous state.
+
+        Returns
+        -------
+        - tuple[dict, int]
+            The state: the newest post date as the high-water mark, the [key, date] of the posts within "covered" seconds of it
+            (`overlap`, or less if fewer are known), which the next run skips as duplicates, and whether some of these are keyed
+            on their `idless_key` ("idless"). Then the number of posts in `chunks`.
+        '''
+        mark = query_state["high_water"] if query_state else None
+        # States from before "idless" may hold id-less keys
+        recent = [(key, date, query_state.get("idless", True)) for key, date in query_state["recent"]] if query_state else []
+        rows = 0
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+            rows += len(chunk)
+            newest = chunk.max_date()
+            mark = newest if mark is None else max(mark, newest)
+            # Newest first, so only a handful of posts past the mark's overlap get kept and dropped below
+            recent.extend((key, date, post_id is None)
+                          for key, date, post_id in zip(chunk.dedupe_keys(), chunk.column("Date", formatted=False), chunk.column("Post_id"))
+                          if date >= mark - overlap)
+        covered = min(overlap, mark - known_since) if mark is not None else 0
+        kept = [post for post in recent if post[1] >= mark - covered] if mark is not None else []
+        state = {
+            "high_water": mark,
+            "high_water_date": format_date(mark) if mark is not None else None,
+            "covered": covered,
+            "recent": [[key, date] for key, date, _ in kept],
+            "idless": any(idless for _, _, idless in kept),
+            "runs": (query_state["runs"] if query_state else 0) + 1,
+            "updated": datetime.now().strftime(DATE_FORMAT),
+        }
+        return state, rows
+
+    def _prepare_follow(self, overlap: int) -> None:
+        '''
+        Set up a follow run (see `start(..., follow=True)`) from `Process/<processDir>/follow.json`.
+
+        The Final files are rolled back to what follow.json last recorded, then `self.end_date` moves up to the query's high-water
+        mark minus `overlap`, and the posts already collected within that overlap are kept aside for `_rebuild_seen`. A Final
+        output from before follow mode is read once to find its mark. Without a mark the run goes back to `endDate` as usual.
+        '''
+        state = self._read_follow()
+        dataset = state["dataset"]
+        if dataset is not None:
+            if dataset["format"] != self.saveFormat:
+                raise ValueError(f"follow=True needs the saveFormat of the dataset it follows ('{dataset['format']}').")
+            self._rollback_dataset(dataset)
+        elif all(os.path.exists(path) for path in self._final_paths()):
+            # Final output of a run before follow mode, taken to be of this query
+            data = self._read_savefile(self._final_paths()[0])
+            query_state, rows = self._follow_mark([data], None, overlap, 0)
+            dataset = {"format": self.saveFormat, "rows": rows, "files": self._dataset_files()}
+            state = {"dataset": dataset, "queries": {self._follow_query: query_state}}
+            self._write_follow(state)
+
+        self._follow = {"overlap": overlap, "merge": dataset is not None, "rows": dataset["rows"] if dataset else 0}
+        self._follow_keys = []
+        query_state = state["queries"].get(self._follow_query)
+        if query_state is not None and query_state["high_water"] is not None:
+            # Only as far back as the posts skipped as duplicates go, e.g. if `followOverlap` grew since the last run
+            self.end_date = self.since_date = max(self.end_date, query_state["high_water"] - min(overlap, query_state["covered"]))
+            self._follow_keys = [key for key, _ in query_state["recent"]]
+            self._idless_rows = query_state.get("idless", True)     # A dataset from before post ids, see `_is_seen`
+            print(f"Following from {query_state['high_water_date']} ({dataset['rows']} posts so far)")
+
+    def _record_follow(self) -> None:
+        '''
+        Record a finished follow run in follow.json once its posts are merged into the Final files: the query's new high-water
+        mark and the new size of the dataset.
+        '''
+        state = self._read_follow()
+        query_state, rows = self._follow_mark(self._final_chunks(), state["queries"].get(self._follow_query), self._follow["overlap"],
+                                              self.end_date)
+        state["dataset"] = {"format": self.saveFormat, "rows": self._follow["rows"] + rows, "files": self._dataset_files()}
+        state["queries"][self._follow_query] = query_state
+        self._write_follow(state)
+        print(f"Followed {rows} new posts, high-water mark at {query_state['high_water_date']}")
+
+    def _run_sharded(self, filters: dict, workers: int, shard_days: int, resume: bool, start_kwargs: dict,
+                     open_ended: bool = False) -> None:
+        '''
+        Scrape [self.end_date, self.start_date] as date windows spread over a pool of worker processes, then merge them.
+
+        Each shard is a normal `start()` run on its own driver in `Process/<processDir>/Shards/<since>_<until>`. The plan is written
+        to `Process/<processDir>/shards.json` and every finished shard is marked there, so an interrupted run picks up where it left off
+        (see `_shard_plan`).
+
+        Parameters
+        ----------
+        - filters : dict
+            The filters as given to `start()`, before adjustment.
+        - workers : int
+            Number of worker processes.
+        - shard_days : int
+            Length of each shard window in days.
+        - resume : bool
+            Whether to reuse an existing shard plan (and the shards' savepoints).
+        - start_kwargs : dict
+            The rest of the `start()` arguments, passed to every shard.
+        - open_ended : bool
+            Whether `startDate` was left empty, i.e. the range runs up to whenever the plan was made.
+        '''
+        os.makedirs(f"Process/{self.processDir}", exist_ok=True)
+        plan_path = f"Process/{self.processDir}/shards.json"
+        until = None if open_ended else self.start_date
+        plan = self._shard_plan(plan_path, until, shard_days, resume)
+        _atomic_write_json(plan_path, {"since": self.end_date, "until": until, "shards": plan})
+
+        jobs = [{"index": i, "networkCapture": self.networkCapture, "headless": self.headless,
+                 "lightProfile": self.lightProfile, "filters": filters,
+                 "start_kwargs": {**start_kwargs, "startDate": shard["until"], "endDate": shard["since"],
+                                  "processDir": shard["processDir"], "resume_from_savepoint": resume}}
+                for i, shard in enumerate(plan) if not shard["done"]]
+
+        # spawn, so every worker gets a clean interpreter (and its own Chrome) even when launched from a notebook.
+        # Each worker takes one slice of the accounts when it starts and keeps it for every shard it runs, so this session's
+        # browsers are closed first: an account shouldn't be logged in twice at once. They log back in when used again
+        if jobs:
+            self.quit()
+            import multiprocessing
+            context = multiprocessing.get_context("spawn")
+            credentials = [self.credentials_path] if isinstance(self.credentials_path, str) else list(self.credentials_path)
+            slices = split_accounts(credentials, min(workers, len(jobs)))
+            account_slices = context.Queue()
+            for accounts in slices:
+                account_slices.put(accounts)
+            with context.Pool(len(slices), initializer=_init_shard_worker, initargs=(account_slices,)) as pool:
+                for index in pool.imap_unordered(_run_shard, jobs):
+                    plan[index]["done"] = True
+                    _atomic_write_json(plan_path, {"since": self.end_date, "until": until, "shards": plan})
+                    print(f"Shard {index + 1}/{len(plan)} done")
+
+        self._merge_shards(plan)
+
+    def _shard_plan(self, plan_path: str, until: Optional[int], shard_days: int, resume: bool) -> list[dict]:
+        '''
+        Get the shards of [self.end_date, self.start_date]: the saved plan when resuming one made for the same range, a new plan otherwise.
+
+        Parameters
+        ----------
+        - plan_path : str
+            Path to the saved plan, `Process/<processDir>/shards.json`.
+        - until : int, optional
+            unix timestamp of the requested upper limit, None if `startDate` was left empty (then any saved upper limit goes).
+        - shard_days : int
+            Length of each shard window in days, for a new plan.
+        - resume : bool
+            Whether a saved plan may be reused.
+
+        Returns
+        -------
+        - list[dict]
+            One dict per shard, newest first: "since", "until", "processDir" and whether it's "done".
+        '''
+        if resume and os.path.exists(plan_path):
+            with open(plan_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if isinstance(saved, list):     # Plans from before the range was saved with them, it's whatever the shards cover
+                saved = {"since": min(s["since"] for s in saved), "until": max(s["until"] for s in saved) if until is not None else None,
+                         "shards": saved}
+            if saved["since"] == self.end_date and saved["until"] == until:
+                plan = saved["shards"]
+                print(f"Resumed shard plan: {sum(s['done'] for s in plan)}/{len(plan)} shards done")
+                return plan
+            print("The saved shard plan is for another date range, planning the shards again")
+
+        return [{"since": since, "until": until, "done": False,
+                 "processDir": f"{self.processDir}/Shards/{datetime.fromtimestamp(since).strftime('%Y-%m-%d_%H-%M-%S')}"
+                               f"_{datetime.fromtimestamp(until).strftime('%Y-%m-%d_%H-%M-%S')}"}
+                for since, until in plan_shards(self.start_date, self.end_date, shard_days)]
+
+    def _merge_shards(self, plan: list[dict]) -> None:
+        '''
+        Merge the Final files of every shard (newest first, without duplicates) into the Final output.
+
+        The shards are streamed in chunks (see `_iter_savefile`) through this session's own storage: with "memory" the buffer
+        is spilled to journal segments every `maxBufferedPosts` (or `ROW_GROUP_SIZE`) posts, with "sqlite" it's flushed into
+        the posts table. Only the dedupe keys of the merged posts stay in memory, 8 bytes per post.
+
+        Parameters
+        ----------
+        - plan : list[dict]
+            The shard plan made by `_run_sharded`.
+        '''
+        extension = self.saveFormat if self.saveFormat in {"json", "parquet", "arrow"} else "csv"
+        # The merge starts over every time, whatever a merge that got cut short left behind goes
+        shutil.rmtree(f"Process/{self.processDir}/Savepoints", ignore_errors=True)
+        if self.storage == "sqlite":
+            self._open_store()
+            with self._db:
+                self._db.execute("DELETE FROM posts")
+                self._db.execute("DELETE FROM progress")
+        buffered = self.maxBufferedPosts or ROW_GROUP_SIZE
+        seen = compactIdSet()
+
+        for shard in plan:
+            path = f"Process/{shard['processDir']}/Final.{extension}"
+            if not os.path.exists(path):
+                continue
+            for chunk in self._iter_savefile(path, buffered):
+                for key, post in zip(chunk.dedupe_keys(), chunk.rows(formatted=False)):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    self.theDict.append(post)
+                if len(self.theDict) < buffered:
+                    continue
+                if self.storage == "sqlite":
+                    self._flush_store()
+                else:
+                    self._spill()
+
+        self.save("final")
+        shutil.rmtree(f"Process/{self.processDir}/Savepoints", ignore_errors=True)
+        print(f"Merged {len(plan)} shards into {len(seen)} posts")
+
+    def run_jobs(self, queue: str, slicePages: int = 20) -> dict[str, bool]:
+        '''
+        Run a queue of scraping jobs on the already logged-in browsers of this session, each job in its own `processDir`.
+
+        The queue is a JSONL file with one job per line: the `start()` arguments, with the filters under "filters". E.g,
+        ```
+        {"processDir": "MBG", "filters": {...}, "startDate": "2026-01-16", "endDate": "2026-01-15", "saveFormat": "both"}
+        {"processDir": "Sawit _minLikes10", "filters": {...}, "credentials": ["Credentials/other.json"]}
+        ```
+        Jobs take turns of `slicePages` search pages. When every account of a job's pool is throttled, the job is suspended with a
+        savepoint and the next job takes the turn, so a cool-down is filled with another job's work. The runner only waits when
+        no job can go on. A job with its own "credentials" gets its own pool, logged in once and shared by every job using it.
+
+        Progress is kept in `<queue>.state.json`, so an interrupted queue picks up where it left off. It's removed once every job is done.
+
+        Parameters
+        ----------
+        - queue : str
+            Path to the JSONL job queue.
+        - slicePages : int
+            Search pages per turn. Default is 20.
+
+        Returns
+        -------
+        - dict[str, bool]
+            Whether each job (by processDir) is done.
+        '''
+        jobs = []
+        with open(queue, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                job = json.loads(line)
+                if "filters" not in job:
+                    raise ValueError(f"Job on line {number} of {queue} has no filters!")
+                job.setdefault("processDir", f"{os.path.splitext(os.path.basename(queue))[0]}_{number}")
+                jobs.append(job)
+        if len({job["processDir"] for job in jobs}) != len(jobs):
+            raise ValueError("Every job of the queue needs its own processDir!")
+
+        state_path = f"{queue}.state.json"
+        state = {}
+        if os.path.exists(state_path):
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            print(f"Resumed job queue: {sum(job['done'] for job in state.values())}/{len(jobs)} jobs done")
+
+        # Logged-in sessions by credentials, so every pool pays for the browser startup and login once
+        sessions = {json.dumps(self.credentials_path): self}
+
+        def session_for(job: dict) -> "twitterScrapper":
+            key = json.dumps(job.get("credentials", self.credentials_path))
+            if key not in sessions:
+                sessions[key] = twitterScrapper(job["credentials"], networkCapture=self.networkCapture,
+                                                user_multi_procs=self.user_multi_procs, sessionCache=self.sessionCache,
+                                                headless=self.headless, lightProfile=self.lightProfile)
+            return sessions[key]
+
+        pending = [job for job in jobs if not state.get(job["processDir"], {}).get("done")]
+        try:
+            while pending:
+                progressed = False
+                for job in list(pending):
+                    session = session_for(job)
+                    if session.pool_ready_at() > time.time():
+                        continue        # Its pool is cooling down, someone else's turn
+
+                    progress = state.setdefault(job["processDir"], {"done": False, "turns": 0})
+                    kwargs = {"maxPages": slicePages, **{k: v for k, v in job.items() if k not in {"filters", "credentials"}}}
+                    if progress["turns"]:
+                        kwargs["resume_from_savepoint"] = True
+                    print(f"Job {job['processDir']}: turn {progress['turns'] + 1}")
+
+                    session._suspend_on_wait = True
+                    try:
+                        progress["done"] = session.start(dict(job["filters"]), **kwargs)
+                    finally:
+                        session._suspend_on_wait = False
+                    progress["turns"] += 1
+                    _atomic_write_json(state_path, state)
+                    progressed = True
+                    if progress["done"]:
+                        pending.remove(job)
+
+                if pending and not progressed:
+                    print("Every job is throttled, waiting for the first pool to free up...")
+                    wait(max(int(min(session_for(job).pool_ready_at() for job in pending) - time.time()), 1))
+        finally:
+            for session in sessions.values():
+                if session is not self:
+                    session.quit()
+
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        return {job["processDir"]: state.get(job["processDir"], {}).get("done", True) for job in jobs}
+
+    def refresh(self, filters, processDir: str, saveFormat: Literal["csv", "json", "both", "parquet", "arrow"] = "csv",
+                scraping_Params = {"wait_short": 10, "wait_long": 30, "detection_wait": 900, "max_empty_pages": 2},
+                maxPosts: Optional[int] = 1000, maxAgeDays: Optional[float] = 7, minInterval: int = 3600,
+                extractionMode: Literal["observer", "script", "snapshot", "webdriver"] = "observer",
+                backend: Literal["dom", "network"] = "dom") -> int:
+        '''
+        Re-poll the Reply/Repost/Like/View counts of the posts already in `Process/<processDir>/Final.<saveFormat>`, without
+        scraping the whole query again. The counts captured by `start()` are taken moments after posting, this catches up on them.
+
+        Posts are picked by `refresh_priority`: the interactions gained per hour between their two latest snapshots (since
+        posting for a post never refreshed), with ties going to the newest. The `maxPosts` first ones are grouped into search
+        windows of at most `window_posts` posts of the dataset (`plan_refresh_windows`), and each window is loaded once with the
+        same filters, so a page refreshes every post it shows.
+
+        Every refreshed count is appended with the time it was checked to `Process/<processDir>/engagement.jsonl`, one line per
+        post per refresh, which keeps the history. Once every window is done, the latest counts are written into the Final files,
+        leaving the other columns as they are (a Parquet/Arrow follow dataset keeps its parts, see `start(..., follow=True)`).
+
+        Parameters
+        ----------
+        - filters : dict
+            The filters the dataset was scraped with, see `start`.
+        - processDir : str
+            The directory of the dataset.
+        - saveFormat : Literal["csv", "json", "both", "parquet", "arrow"]
+            The format of the dataset. Default is "csv".
+        - scraping_Params : dict
+            Waits, pacing and budgets, see `start`. `window_posts` sizes the search windows.
+        - maxPosts : int, optional
+            Most posts picked per refresh. None picks every post. Default is 1000.
+        - maxAgeDays : float, optional
+            Only posts younger than this are picked. None picks any post. Default is 7.
+        - minInterval : int
+            Posts refreshed less than this many seconds ago aren't picked. Default is 3600.
+        - extractionMode, backend :
+            How posts are read from the page, see `start`.
+
+        Returns
+        -------
+        - int
+            How many posts got refreshed.
+        '''
+        print(f'Timezone: {time.strftime("%z")}')     # Dates are read back in local time
+        if saveFormat not in {"csv", "json", "both", "parquet", "arrow"}:
+            raise ValueError("saveFormat must be 'csv', 'json', 'both', 'parquet' or 'arrow'.")
+        if saveFormat in {"parquet", "arrow"} and not _import_pyarrow():
+            raise ImportError(f"saveFormat='{saveFormat}' needs pyarrow, install it with `pip install pyarrow`.")
+        self.SEARCH_URL = "https://x.com/search?q="
+        self.FILTERS_COMBINATION = build_query(filters)
+        self.processDir = processDir
+        self.saveFormat = saveFormat
+        self._configure_scraping(scraping_Params)
+        self._configure_capture(extractionMode, backend)
+        self.metrics.reset()
+
+        paths = self._final_paths()
+        if not all(os.path.exists(path) for path in paths):
+            raise FileNotFoundError(f"There's no Final.{saveFormat} dataset in Process/{processDir} to refresh.")
+        data = self._read_savefile(paths[0])
+        history = self._read_engagement()
+
+        # Pick the posts whose counts most likely moved since they were last seen
+        now = int(time.time())
+        keys = list(data.dedupe_keys())
+        dates = data.column("Date", formatted=False)
+        interactions = [sum(counts) for counts in zip(*(data.column(col) for col in COUNT_COLUMNS[:3]))]
+        candidates = []
+        for i, (key, date) in enumerate(zip(keys, dates)):
+            if maxAgeDays is not None and now - date > maxAgeDays * 86400:
+                continue
+            snapshots = history.get(key, [])
+            if snapshots and now - snapshots[-1][0] < minInterval:
+                continue
+            points = [(snapshot[0], sum(snapshot[1:4])) for snapshot in snapshots]
+            last = points[-1] if points else (now, interactions[i])
+            previous = points[-2] if len(points) > 1 else (date, 0)
+            candidates.append((refresh_priority(date, last, previous, now), i))
+        picked = [i for _, i in (heapq.nlargest(maxPosts, candidates) if maxPosts is not None else candidates)]
+
+        order = sorted(range(len(data)), key=dates.__getitem__)
+        sorted_dates = [dates[i] for i in order]
+        windows = plan_refresh_windows(sorted_dates, (dates[i] for i in picked), self.WINDOW_POSTS)
+        print(f"Refreshing {len(picked)} of {len(data)} posts in {len(windows)} search windows")
+
+        refreshed = 0
+        for number, (since, until) in enumerate(windows, start=1):
+            expected = {keys[i] for i in order[bisect.bisect_left(sorted_dates, since):bisect.bisect_left(sorted_dates, until)]}
+            found = self._refresh_window(since, until, expected)
+            self._append_engagement(found)
+            refreshed += len(found)
+            self.metrics.count("refreshed", len(found))
+            print(f"Window {number}/{len(windows)}: {len(found)}/{len(expected)} posts refreshed")
+
+        changed = self._update_dataset_counts({key: snapshots[-1][1:] for key, snapshots in self._read_engagement().items()})
+        print(f"Refreshed {refreshed} posts, {changed} with new counts")
+        return refreshed
+
+    def _refresh_window(self, since: int, until: int, expected: set[int]) -> dict[int, dict]:
+        '''
+        Load the search page of [since, until) and page through it until every post of `expected` (dedupe keys) showed up, or the page ends.
+
+        Returns
+        -------
+        - dict[int, dict]
+            The posts of `expected` found on the page, by dedupe key.
         '''
+        while True:
+            self._acquire_account()
+            self.metrics.count("pages")
+            with self.metrics.timer("page_load"):
+                page = self._load_search_page(until, since)
+            with self.metrics.timer("detection_check"):
+                detected = self._scrape_detected(page)
+            if not detected:
+                break
+            self.metrics.count("detections")
+            delay = self.account.limiter.detected(self.account.observed_rate(self.budget_window))
+            self._log_rate("detected")
+            print(f"Scraping detected, cooling down @{self.account.username} for {int(delay)} seconds. Pool: {self.pool_status()}")
+        if self.account.limiter.success():
+            self._log_rate("recovered")
 
-        try:
-            # Is there a container for post?
-            WebDriverWait(self.driver, self.WAIT_LONG).until(
-                EC.presence_of_element_located((By.XPATH, "//div[@data-testid='cellInnerDiv']"))
-            )
-            counter = 0
-            return current_date, counter, False # Yes
-        except TimeoutException:
-            current_date = minOneDay(current_date)
-            counter += 1
-            current_date_str = datetime.fromtimestamp(current_date).strftime("%Y-%m-%d")
-            print(f"No posts found, stepping back to {current_date_str}, attempt {counter + 1}/{self.MAX_EMPTY_PAGES}")
-            return current_date, counter, counter >= self.MAX_EMPTY_PAGES    # Nothingburger and minus by one day
+        found = {}
+        while True:
+            with self.metrics.timer("capture"):
+                batch = self._capture_batch()
+            with self.metrics.timer("parse"):
+                posts = self._parse_batch(*batch)
+            for post in posts:
+                key = self._post_key(post)
+                if key not in expected and post.get("Post_id") is not None:
+                    key = idless_key(post)      # Rows of a dataset from before post ids are keyed on it
+                if key in expected:
+                    found[key] = post
+            if len(found) == len(expected):
+                return found
 
-    def _parse_post(self, post_element) -> str:
+            with self.metrics.timer("scroll_wait"):
+                new_page = self._next_page(page)
+            if new_page is None:
+                return found        # Deleted or no longer matching posts don't show up
+            page = new_page
+
+    def _engagement_path(self) -> str:
+        return f"Process/{self.processDir}/engagement.jsonl"
+
+    def _append_engagement(self, posts: dict[int, dict]) -> None:
         '''
-        Parse the post element to extract the full text of the post.
+        Append the counts of refreshed posts to the engagement history, with the time they were checked, and fsync it.
+        '''
+        checked = int(time.time())
+        with open(self._engagement_path(), "a", encoding="utf-8") as f:
+            for key, post in posts.items():
+                post_id = post.get("Post_id")
+                f.write(json.dumps({"key": key, "Post_id": int(post_id) if post_id else None, "checked": checked,
+                                    **{col: int(post.get(col) or 0) for col in COUNT_COLUMNS}}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
 
-        NOTE: This only handles text, links, emojis, and such. Media (images, videos, gifs) are not handled ***yet***.
+    def _read_engagement(self) -> dict[int, list[tuple[int, int, int, int, int]]]:
+        '''
+        The two latest snapshots of every post in the engagement history, oldest first, as (checked, replies, reposts, likes, views).
+        '''
+        history = {}
+        if not os.path.exists(self._engagement_path()):
+            return history
+        with open(self._engagement_path(), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue        # Torn by a crash in the middle of a write
+                history[row["key"]] = [*history.get(row["key"], [])[-1:], (row["checked"], *(row[col] for col in COUNT_COLUMNS))]
+        return history
+
+    def _update_dataset_counts(self, counts: dict[int, Sequence[int]]) -> int:
+        '''
+        Write `counts` (Reply/Repost/Like/View by dedupe key) into the Final files, file by file (part by part for a Parquet/Arrow
+        follow dataset). Only files with a changed count are rewritten, to a temporary file first that then replaces it.
 
-        Parameters
-        ----------
-        - post_element : WebElement
-            The WebElement representing the post.
-        
         Returns
         -------
-        - str
-            The full text of the post.
+        - int
+            How many posts had a count change (in the first Final file, with `saveFormat="both"`).
         '''
+        changed = None
+        for path in self._final_paths():
+            files = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+            path_changed = 0
+            for file in files:
+                data = self._read_savefile(file)
+                file_changed = data.update_counts(counts)
+                if not file_changed:
+                    continue
+                path_changed += file_changed
+                if file.endswith((".parquet", ".arrow")):
+                    batch = self._columnar_batch(data, 0, len(data))
+                    if file.endswith(".parquet"):
+                        pq.write_table(pa.Table.from_batches([batch]), f"{file}.tmp", row_group_size=ROW_GROUP_SIZE)
+                    else:
+                        with pa.ipc.new_file(f"{file}.tmp", batch.schema) as writer:
+                            writer.write_batch(batch)
+                elif file.endswith(".csv"):
+                    import pandas as pd
+                    self._write_csv(f"{file}.tmp", chunks=[data], columns=pd.read_csv(file, nrows=0).columns.tolist())
+                else:
+                    self._write_json(f"{file}.tmp", chunks=[data])
+                os.replace(f"{file}.tmp", file)
+            changed = path_changed if changed is None else changed
 
-        parts = post_element.find_elements(By.XPATH, ".//span | .//img | .//a[@dir='ltr']")
-        text = ""
-        for p in parts:
-            if p.tag_name == "img":                 # Emojis
-                text += p.get_attribute("alt")
-            elif p.tag_name == "a":                 # Links (Not shortened with t.co domain)
-                text += p.text + " "
-            else:                                   # Normal text                 
-                text += p.text
-        return text
+        state = self._read_follow()
+        if state["dataset"] is not None:
+            # The CSV/JSON sizes changed, so the next follow run doesn't take the rewrite for a merge to roll back
+            state["dataset"]["files"] = self._dataset_files()
+            self._write_follow(state)
+        return changed or 0
 
-    def _extract_post_data(self, element) -> tuple[str, str, str, str]:
+    def _suspend(self) -> None:
         '''
-        Extract post data from the given post element.
+        Save a savepoint so `start()` can resume, and close the streamed Parquet/Arrow file (it's rewritten from the savepoint on resume).
+        '''
+        self.save("savepoint")
+        if self._columnar_writer is not None:
+            self._columnar_writer.close()
+            self._columnar_writer = None
+
+    def _use_account(self, account: accountSession) -> None:
+        '''
+        Make the given account the active one (`self.driver`, `self.username`, ...).
+        '''
+        self.account = account
+        self.username = account.username
+        self.password = account.password
+        self.email = account.email
+        self.driver = account.driver
+
+    def _acquire_account(self) -> bool:
+        '''
+        Pick the account for the next page load and record the request against its budget.
+
+        Sticks to the active account while it's available, otherwise switches to the account that's available the soonest.
+        If every account is cooling down or out of budget, waits for the first one to free up, unless the session is run by
+        `run_jobs`, which would rather give another job the turn.
 
-        Parameters
-        ----------
-        - element : WebElement
-            The WebElement representing the post.
-        
         Returns
-        ------
-        - tuple[str, str, str, str]
-            A tuple containing the post text, quoted post text, post user, and post date.
+        -------
+        - bool
+            True if a page can be loaded, False if the job should be suspended instead of waiting.
         '''
+        window = self.budget_window
+        ready_at = {id(a): a.available_at(self.requests_per_window, window) for a in self.accounts}
+        account = self.account if ready_at[id(self.account)] <= time.time() else min(self.accounts, key=lambda a: ready_at[id(a)])
 
-        # Get the entire post element
-        post_element = element.find_element(
-            By.XPATH, './/div[not(@role="link")]/div/div/div/div/div[@data-testid="tweetText"]',
-        )
-        # Post
-        post_text = self._parse_post(post_element)
+        if account is not self.account:
+            print(f"Switching account: @{self.account.username} -> @{account.username}")
+            self._use_account(account)
 
-        # Quoted Post
-        try:
-            quoted_element = element.find_element(By.XPATH, './/div[@role="link"]')
-            quoted_text = ''.join(
-                i.text for i in quoted_element.find_elements(By.XPATH, './/div[@data-testid="tweetText"]/span')
-            )
-        except NoSuchElementException:
-            quoted_text = ""
+        idle = ready_at[id(account)] - time.time()
+        with self.metrics.timer("throttle_wait"):
+            if idle >= 1:
+                print(f"All accounts are throttled or out of budget: {self.pool_status()}")
+                # Pacing waits are short, only a real cool-down is worth handing the turn to another job
+                if self._suspend_on_wait and idle > self.WAIT_LONG:
+                    return False
+                wait(int(idle))
+            time.sleep(max(0, ready_at[id(account)] - time.time()))      # What's left under a second
 
-        post_date = getTime(element.find_element(By.XPATH, './/time').get_attribute("datetime")).strftime("%Y-%m-%d-%H:%M:%S")
-        post_user = element.find_element(By.XPATH, './/a/div/span').text
+        if account.driver is None:      # Its browser was closed for the shard workers (see `_run_sharded`)
+            self._login_account()
+            account.driver = self.driver
+        account.record_request()
+        return True
 
-        return post_text, quoted_text, post_user, post_date
-    
-    def _write_json(self, filename: str) -> None:
+    def pool_ready_at(self) -> float:
         '''
-        Write the scraped data to a JSON file.
-        
-        Parameters
-        ----------
-        - filename : str
-            The name of the file to write the JSON data to.
+        Get the unix time at which the first account of the pool can load a page again (now or earlier if one already can).
         '''
-        # theDict conversion to a list of dictionaries
-        theDict_JSON = {i: {
-                j: self.theDict[j][i] for j in self.theDict.keys()
-            } for i in range(len(self.theDict["post_text"]))
-            }
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(theDict_JSON, f, ensure_ascii=False, indent=4)
+        return min(a.available_at(self.requests_per_window, self.budget_window) for a in self.accounts)
 
-    def _write_csv(self, filename: str) -> None:
+    def _log_rate(self, event: str) -> None:
         '''
-        Write the scraped data to a CSV file.
+        Append the rate limiter state of the active account to `Process/<processDir>/ratecontrol.jsonl`, for monitoring.
 
         Parameters
         ----------
-        - filename : str
-            The name of the file to write the CSV data to.
+        - event : str
+            What changed it, "detected" or "recovered".
         '''
-        df = pd.DataFrame(self.theDict)
-        df.to_csv(filename, index=False)
+        os.makedirs(f"Process/{self.processDir}", exist_ok=True)
+        entry = {"time": datetime.now().strftime(DATE_FORMAT), "event": event, **self.account.status(self.budget_window)}
+        with open(f"Process/{self.processDir}/ratecontrol.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        if event == "recovered":
+            print(f"@{self.account.username} recovered a step: {entry['pages_per_min']} pages/min, backoff level {entry['backoff_level']}")
 
-    def _load_latest_savepoint(self) -> bool:
+    def _report_metrics(self, final: bool = False) -> None:
         '''
-        Load the latest savepoint from the Savepoints directory.
+        Append a snapshot of `self.metrics` to `Process/<processDir>/metrics.jsonl` once `metricsInterval` seconds went by since the
+        previous one. The final one (end of the run) is always written, and summed up on screen.
+        '''
+        if final:
+            snapshot = self.metrics.snapshot()
+            print(f"Run metrics: {snapshot['counts']['posts']} new posts in {snapshot['elapsed']:.0f}s "
+                  f"({snapshot['posts_per_sec']} posts/sec, {snapshot['commands_per_post']} WebDriver commands/post, "
+                  f"dedupe hit rate {snapshot['dedupe_hit_rate']}, {snapshot['counts']['detections']} detections)")
+        now = time.time()
+        if self.metricsInterval is None or (not final and now - self._metrics_reported < self.metricsInterval):
+            return
+        self._metrics_reported = now
 
-        Uses the eariest date as the `self.start_date` from the most recently modified file in the Savepoints directory and loads the data into `self.theDict`.
+        os.makedirs(f"Process/{self.processDir}", exist_ok=True)
+        entry = {"time": datetime.now().strftime(DATE_FORMAT), "final": final, **self.metrics.snapshot()}
+        with open(f"Process/{self.processDir}/metrics.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
 
-        Returns
-        -------
-        - bool
-            True if a savepoint was loaded, False otherwise.
+    def _serve_metrics(self, port: int, host: str = METRICS_HOST) -> None:
+        '''
+        Serve `self.metrics` in the Prometheus text format at `/metrics` on the given host and port, from a daemon thread.
         '''
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        session = self
 
-        save_dir = f"Process/{self.processDir}/Savepoints"
+        class metricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in {"/", "/metrics"}:
+                    self.send_error(404)
+                    return
+                body = session.metrics.prometheus({"process_dir": session.processDir}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
 
-        # Checkers if there's any savepoint
-        if not os.path.isdir(save_dir):
-            return False
-        files = [f for f in os.listdir(save_dir) if f.endswith((".csv", ".json"))]
-        if not files:
-            return False
-        
-        # Get the latest savepoint file
-        latest_file = max(files, key=lambda f: os.path.getmtime(os.path.join(save_dir, f)))
-        latest_path = os.path.join(save_dir, latest_file)
+            def log_message(self, *args):
+                pass        # Don't spam the scrape's output with every poll
 
-        if latest_file.endswith(".csv"):
-            df = pd.read_csv(latest_path)
-        else:
-            with open(latest_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            df = pd.DataFrame.from_dict(data, orient="index")
-        
-        self.theDict = {col: df[col].tolist() for col in df.columns}    # Convert DataFrame to dictionary
-        if "Date" in self.theDict and self.theDict["Date"]:
+        self._stop_metrics_server()
+        self._metrics_server = ThreadingHTTPServer((host, port), metricsHandler)
+        threading.Thread(target=self._metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+        host, port = self._metrics_server.server_address[:2]
+        print(f"Serving metrics at http://{host}:{port}/metrics")
+
+    def _stop_metrics_server(self) -> None:
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
+            self._metrics_server.server_close()
+            self._metrics_server = None
+
+    def _run_profiled(self, profile: Literal["cprofile", "pyinstrument"]) -> bool:
+        '''
+        Run `scrape()` under a profiler and save the profile in `Process/<processDir>`. Only the browser thread is profiled, the
+        pipeline thread's share shows up in `self.metrics` ("parse" and "save").
+        '''
+        os.makedirs(f"Process/{self.processDir}", exist_ok=True)
+        if profile == "pyinstrument":
             try:
-                earliest_dt = min(
-                    datetime.strptime(d, "%Y-%m-%d-%H:%M:%S")
-                    for d in self.theDict["Date"]
-                    if isinstance(d, str)
-                )
-                self.start_date = int(earliest_dt.timestamp())
-            except Exception:
-                pass
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ImportError("profile='pyinstrument' needs pyinstrument, install it with `pip install pyinstrument`.")
+            profiler = Profiler()
+            profiler.start()
+            try:
+                return self.scrape()
+            finally:
+                profiler.stop()
+                path = f"Process/{self.processDir}/scrape_profile.html"
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+                print(f"Profile saved to {path}")
 
-        print(f"Resumed from savepoint: {latest_file}")
-        return True
+        import cProfile, pstats
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(self.scrape)
+        finally:
+            path = f"Process/{self.processDir}/scrape.prof"
+            profiler.dump_stats(path)
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+            print(f"Profile saved to {path}, browse it with `python -m pstats {path}`")
 
-    def save(self, type: Literal["final", "savepoint"]) -> str:
+    def pool_status(self) -> list[dict]:
         '''
-        Save the current progress to a file.
+        Get the request rate and cool-down state of every account of the pool.
 
-        file extension and format is based on `self.saveFormat`.
+        Returns
+        -------
+        - list[dict]
+            One dict per account, see `accountSession.status`.
+        '''
+        return [account.status(self.budget_window) for account in self.accounts]
+
+    def quit(self) -> None:
+        '''
+        Close the browser of every account of the pool.
+        '''
+        for account in self.accounts:
+            if account.driver is not None:
+                account.driver.quit()
+                account.driver = None
+            account.pending_requests.clear()
+            account.search_request = None
+        self.driver = None
+
+    def _build_driver(self) -> "uc.Chrome":
+        '''
+        Create the Chrome driver. If `self.networkCapture` is on, performance logging is enabled so network responses can be read.
+        With `self.headless` Chrome runs without a window, with `self.lightProfile` it gets the lightweight rendering profile.
 
-        Parameters
-        ----------
-        - type : Literal["final", "savepoint"]
-            The type of save to perform. "final" for final save, "savepoint" for intermediate savepoint.
-        
         Returns
         -------
-        - str
-            The path to the saved file.
+        - uc.Chrome
+            The driver.
         '''
-        if type not in {"final", "savepoint"}:
-            raise ValueError("Save type must be 'final' or 'savepoint'.")
+        import undetected_chromedriver as uc
+        options = uc.ChromeOptions()
+        if self.networkCapture:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        if self.headless:
+            options.add_argument("--window-size=1920,1080")     # Headless defaults to 800x600, too few posts per scroll
+        if self.lightProfile:
+            options.add_argument("--autoplay-policy=user-gesture-required")
+            options.add_argument("--mute-audio")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        driver = uc.Chrome(options=options, user_multi_procs=self.user_multi_procs, headless=self.headless)
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INFLIGHT_TRACKER_JS})
+        if self.lightProfile:
+            # Both stick to the tab across page loads
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+            driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", LIGHT_VIEWPORT)
 
-        os.makedirs(f"Process/{self.processDir}/Savepoints", exist_ok=True)
-        
-        if type == "savepoint":
-            save_path = f"Process/{self.processDir}/Savepoints/{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
-        else:
-            save_path = f"Process/{self.processDir}/Final"
+        # Every WebDriver command (driver and element calls alike) goes through `execute`, count them for `self.metrics`
+        execute = driver.execute
+        def counted_execute(*args, **kwargs):
+            self.metrics.count("commands")
+            return execute(*args, **kwargs)
+        driver.execute = counted_execute
+        return driver
 
-        if self.saveFormat == "csv":
-            self._write_csv(f"{save_path}.csv")
-        elif self.saveFormat == "json":
-            self._write_json(f"{save_path}.json")
-        elif self.saveFormat == "both":
-            self._write_csv(f"{save_path}.csv")
-            if type == "final":                         # There's no fucking logic to save both on savepoint, only do it on final save
-                self._write_json(f"{save_path}.json")
-        else:
-            raise ValueError("saveFormat must be 'csv', 'json', or 'both'.")
-        
-        return save_path    # This ain't used, but yeah.
-    
     def login(self) -> None:
         '''
-        Tries to login to the account based from the given credentials
+        Tries to login to every account of the pool, each on its own browser. The first account is the active one afterwards.
+
+        Raises
+        ------
+        - ValueError
+            If email is required due to suspicious login attempt, but email is not provided on credentials.
+        '''
+        for account in self.accounts:
+            self._use_account(account)
+            self._login_account()
+            account.driver = self.driver
+        self._use_account(self.accounts[0])
+
+    def _login_account(self) -> None:
+        '''
+        Tries to login to the active account based from the given credentials
 
         Will use `self.username` and `self.password` only. However, if X detects your login as suspicious, `self.email` will be used.
 
+        If `self.sessionCache` is on, a cached session of the account is tried first and the whole login is skipped if it's still valid.
+
         Raises
         ------
         - ValueError
             If email is required due to suspicious login attempt, but email is not provided on credentials.
         '''
-        # Initialize the driver and check bot detection
-        self.driver = uc.Chrome()
+        # Initialize the driver, reuse the cached session if X still accepts it
+        self.driver = self._build_driver()
+        if self.sessionCache and self._restore_session():
+            print(f"Login sucess! Reused cached session of @{self.username}")
+            return
+
+        # Check bot detection
         self.driver.get('https://www.browserscan.net/bot-detection')
 
         # Check bot detection, 
-        WebDriverWait(self.driver, 30).until(EC.presence_of_element_located((By.XPATH, '//div[@class="_oxrqr1"]')))
+        wait_for_xpath(self.driver, 30, '//div[@class="_oxrqr1"]')
         time.sleep(4)
         botResult = self.driver.find_element(By.XPATH, '//strong[@class="_1ikblmd"]').text
         if botResult != "Normal":
@@ -493,7 +3860,7 @@ class twitterScrapper:
         time.sleep(5)
 
         # Login handling
-        WebDriverWait(self.driver, 30).until(EC.presence_of_element_located((By.XPATH, "//input[@autocomplete = 'username']")))
+        wait_for_xpath(self.driver, 30, "//input[@autocomplete = 'username']")
         time.sleep(3)
         username_input = self.driver.find_element(By.XPATH, "//input[@autocomplete = 'username']")
         for i in self.username:
@@ -517,7 +3884,7 @@ class twitterScrapper:
             pass
 
         # Put password
-        WebDriverWait(self.driver, 30).until(EC.presence_of_element_located((By.XPATH, "//input[@name='password']")))
+        wait_for_xpath(self.driver, 30, "//input[@name='password']")
         password_input = self.driver.find_element(By.XPATH, "//input[@name='password']")
         for i in self.password:
             password_input.send_keys(i)
@@ -525,16 +3892,117 @@ class twitterScrapper:
         self.driver.find_element(By.XPATH, "//button[@data-testid='LoginForm_Login_Button']").click()
         time.sleep(5)
 
-        warnings.warn("Please zoom out te browser to 25%, thus there'll be more posts loaded per scroll", UserWarning)
+        if not self.lightProfile:
+            warnings.warn("Please zoom out te browser to 25%, thus there'll be more posts loaded per scroll", UserWarning)
         print("Login sucess!")
         wait(10)
 
-    def start(self, filters, startDate: str = "", endDate: str = "",
+        if self.sessionCache:
+            self._save_session()
+
+    def _session_path(self) -> str:
+        return f"{SESSION_DIR}/{self.username}.session"
+
+    def _save_session(self) -> None:
+        '''
+        Save the cookies and localStorage of the active account to `Credentials/Sessions/<username>.session`, encrypted with a key
+        derived from the account password.
+        '''
+        self.driver.get("https://x.com/home")
+        session = {"cookies": self.driver.get_cookies(),
+                   "localStorage": self.driver.execute_script("return Object.assign({}, window.localStorage);")}
+
+        os.makedirs(SESSION_DIR, exist_ok=True)
+        with open(self._session_path(), "wb") as f:
+            f.write(encrypt_session(session, self.password))
+
+    def _restore_session(self) -> bool:
+        '''
+        Load the cached session of the active account into the browser and check that X still treats it as logged in.
+
+        Returns
+        -------
+        - bool
+            True if the session was restored and is valid, False if a full login is needed.
+        '''
+        if not os.path.exists(self._session_path()):
+            return False
+        try:
+            with open(self._session_path(), "rb") as f:
+                session = decrypt_session(f.read(), self.password)
+        except ValueError:
+            warnings.warn(f"Cached session of @{self.username} can't be decrypted, logging in again.", UserWarning)
+            return False
+
+        # Cookies and localStorage can only be set from the x.com origin, robots.txt is the cheapest page there
+        self.driver.get("https://x.com/robots.txt")
+        for cookie in session["cookies"]:
+            cookie.pop("sameSite", None)        # Chrome rejects some of the values it hands out itself
+            try:
+                self.driver.add_cookie(cookie)
+            except WebDriverException:
+                continue
+        self.driver.execute_script("for (const [k, v] of Object.entries(arguments[0])) window.localStorage.setItem(k, v);",
+                                   session["localStorage"])
+
+        # Logged in if the account menu shows up on the home timeline
+        self.driver.get("https://x.com/home")
+        try:
+            wait_for_xpath(self.driver, 10, "//button[@data-testid='SideNav_AccountSwitcher_Button']")
+            return True
+        except TimeoutException:
+            self.driver.delete_all_cookies()
+            return False
+
+    def _configure_scraping(self, scraping_Params: dict) -> None:
+        '''
+        Set the waits, pacing and budgets of `scraping_Params` (see `start`).
+        '''
+        self.WAIT_SHORT = scraping_Params["wait_short"]
+        self.WAIT_LONG = scraping_Params["wait_long"]
+        self.DETECTION_WAIT = scraping_Params["detection_wait"]
+        pages_per_min = scraping_Params.get("pages_per_min")
+        for account in self.accounts:
+            account.limiter.configure(pages_per_min / 60 if pages_per_min else None, scraping_Params.get("backoff_base", 60),
+                                      self.DETECTION_WAIT, scraping_Params.get("recover_after", 10))
+        self.MAX_EMPTY_PAGES = scraping_Params["max_empty_pages"]
+        self.requests_per_window = scraping_Params.get("requests_per_window")
+        self.budget_window = scraping_Params.get("budget_window", 900)
+        self.WINDOW_POSTS = scraping_Params.get("window_posts", 200)
+        self.POLL_INTERVAL = scraping_Params.get("poll_interval", 0.25)
+        self.IDLE_WINDOW = scraping_Params.get("idle_window", 1.0)
+
+    def _configure_capture(self, extractionMode: str, backend: str) -> None:
+        '''
+        Check and set how posts are read from the page (see `start`).
+        '''
+        if extractionMode not in {"observer", "script", "snapshot", "webdriver"}:
+            raise ValueError("extractionMode must be 'observer', 'script', 'snapshot' or 'webdriver'.")
+        if extractionMode == "snapshot" and not _import_lxml():
+            raise ImportError("extractionMode='snapshot' needs lxml, install it with `pip install lxml`.")
+        self.extractionMode = extractionMode
+        if backend not in {"dom", "network"}:
+            raise ValueError("backend must be 'dom' or 'network'.")
+        if backend == "network" and not self.networkCapture:
+            raise ValueError("backend='network' needs the session to be created with networkCapture=True.")
+        self.backend = backend
+
+    def start(self, filters, startDate: Union[str, int] = "", endDate: Union[str, int] = "",
               scraping_Params  =  {"wait_short": 10, "wait_long": 30,
                                   "detection_wait": 900, "max_empty_pages": 2},
-                                  saveFormat: Literal["csv", "json", "both"] = "csv", 
+                                  saveFormat: Literal["csv", "json", "both", "parquet", "arrow"] = "csv",
                                   autoSave: bool = False, autoSaveInterval: int = 15, continue_if_timeout: bool = True,
-                                  processDir: str = "", resume_from_savepoint: bool = True) -> None:
+                                  processDir: str = "", resume_from_savepoint: bool = True,
+                                  extractionMode: Literal["observer", "script", "snapshot", "webdriver"] = "observer",
+                                  backend: Literal["dom", "network"] = "dom",
+                                  workers: int = 1, shardDays: int = 7,
+                                  storage: Literal["memory", "sqlite"] = "memory", maxPages: Optional[int] = None,
+                                  pipeline: bool = True, maxBufferedPosts: Optional[int] = None,
+                                  follow: bool = False, followOverlap: int = FOLLOW_OVERLAP,
+                                  metricsInterval: Optional[float] = METRICS_INTERVAL,
+                                  metricsPort: Optional[int] = None, metricsHost: str = METRICS_HOST,
+                                  profile: Optional[Literal["cprofile", "pyinstrument"]] = None,
+                                  snapshotLimit: Optional[int] = SNAPSHOT_LIMIT) -> bool:
         '''
         This function is used to start the scrapping process based on the given filters.
         
@@ -561,13 +4029,15 @@ class twitterScrapper:
                 "replies": True,                
             }
             ```
-        - startDate : str
-            - The latest date for scrapping in the format "YYYY-MM-DD".
+            - Left out keys default to `SEARCH_FILTERS` (not used in the query).
+        - startDate : str | int
+            - The latest date for scrapping in the format "YYYY-MM-DD", or a unix timestamp.
             - If empty, will default to current date.
         
-        - endDate : str
-            - The earliest date for scrapping in the format "YYYY-MM-DD".
+        - endDate : str | int
+            - The earliest date for scrapping in the format "YYYY-MM-DD", or a unix timestamp.
             - If empty, will default to "2006-01-01" (Twitter launch date).
+            - If given, it's also sent to X as `since_time`, so the search stops right at this date.
         
         - scraping_Params : dict
             - A dictionary containing the scrapping parameters.
@@ -581,19 +4051,53 @@ class twitterScrapper:
             }
             ```
         - wait_short : int
-            - Short wait time in seconds for page loading. Used for normal page loads. E.g, scrollig down to load more posts
+            - Longest wait in seconds for page loading. Used for normal page loads. E.g, scrollig down to load more posts
+            - The page is polled and the wait ends as soon as new posts show up or the network goes idle, see `poll_interval` and `idle_window`.
 
         - wait_long : int
             - Long wait time in seconds for page loading. Used for cases where the page takes longer to load. Like after getting into a new page
             
         - detection_wait : int
-            - Wait time in seconds when scraping detection is encountered.
+            - Longest cool-down in seconds when scraping detection is encountered.
+            - The cool-down starts at `backoff_base` and doubles (with jitter) on every detection until it reaches this, then
+              steps back down after `recover_after` clean page loads. Each detection also halves the account's page load rate.
+            - With several accounts, only the throttled account cools down, the others take over its work.
 
         - max_empty_pages : int
-            - Maximum number of consecutive empty pages before stopping scrapping.
+            - How many days of consecutive empty search windows before stopping scrapping.
+
+        - window_posts : int (optional)
+            - How many posts each search page aims at. The time window of every page (`since_time`/`until_time`) is sized from the
+              post density seen so far: widened exponentially over sparse periods, split down to hour slices over dense ones.
+              Default is 200.
+
+        - requests_per_window : int (optional)
+            - Maximum number of search page loads per account within `budget_window`. If not given, accounts have no budget.
+
+        - budget_window : int (optional)
+            - Length in seconds of the sliding window `requests_per_window` is counted over. Default is 900.
+
+        - pages_per_min : float (optional)
+            - Most page loads per minute per account, paced with a token bucket. If not given, there's no pacing until the first
+              detection, which then sets it to half the rate the account was going at.
+
+        - backoff_base : float (optional)
+            - Cool-down in seconds after the first detection. Default is 60.
+
+        - recover_after : int (optional)
+            - Clean page loads needed to undo one backoff step (and speed the pacing back up by 25%). Default is 10.
+
+        - poll_interval : float (optional)
+            - Seconds between page polls while waiting for posts to load. Default is 0.25.
 
-        - saveFormat : Literal["csv", "json", "both"]
-            - The format to save the scrapped data. Can be "csv", "json", or "both".
+        - idle_window : float (optional)
+            - Seconds without any network request after which a page load or scroll counts as done, even if nothing new showed up.
+              Default is 1.0.
+
+        - saveFormat : Literal["csv", "json", "both", "parquet", "arrow"]
+            - The format to save the scrapped data. Can be "csv", "json", "both", "parquet" or "arrow".
+            - "parquet" and "arrow" (Arrow IPC) write typed columns: int64 unix timestamps for Date, int32 counts and
+              dictionary-encoded User. They're written in row groups of `ROW_GROUP_SIZE` posts during the scrape. Needs `pyarrow`.
             - Default is "csv".
 
         - autoSave : bool
@@ -616,75 +4120,233 @@ class twitterScrapper:
             - Whether to resume scrapping from the latest savepoint if available.
             - Default is True.
 
-        '''
-        self.SEARCH_URL = "https://x.com/search?q="
-        
-        # Adjust filters values
-        filters["this_exact_phrase"] = f'\"{filters["this_exact_phrase"]}\"' if filters["this_exact_phrase"] != "" else ""
-        _any_terms = []
-        _any_raw = filters["any_of_these_words"].strip()
-        if _any_raw:
-            for g1, g2, g3 in re.findall(r'"([^"]+)"|\'([^\']+)\'|(\S+)', _any_raw):
-                _any_terms.append(g1 or g2 or g3)
-        filters["any_of_these_words"] = (
-            f'({" OR ".join(_any_terms)})' if _any_terms else ""
-        )
-        filters["none_of_these_words"] = f'{" ".join(f"-{i}" for i in filters["none_of_these_words"].split())}' if filters["none_of_these_words"] != "" else ""
-        filters["these_hashtags"] = f'({" OR ".join(f"{i}" for i in filters["these_hashtags"].split())})' if filters["these_hashtags"] != "" else ""
+        - extractionMode : Literal["observer", "script", "snapshot", "webdriver"]
+            - How posts are read from the page.
+            - "observer" injects a MutationObserver that queues each new (or recycled) timeline cell once, and drains the queue
+              with one `execute_script` call per scroll step. Only posts that are new since the previous step cross over.
+            - "script" grabs every visible post with one `execute_script` call per scroll step.
+            - "snapshot" grabs the raw HTML of the timeline with one call per scroll step and parses it off the browser with lxml
+              (see `parse_timeline_html`). Snapshots are kept gzipped in `Process/<processDir>/Snapshots`, so they can be parsed
+              again with `parse_snapshots` if X changes its markup (up to `snapshotLimit`). Needs `lxml`.
+            - "webdriver" reads each post element by element through WebDriver (the old, slower way).
+            - Default is "observer".
+
+        - backend : Literal["dom", "network"]
+            - Where posts are harvested from.
+            - "dom" reads the rendered timeline (see `extractionMode`).
+            - "network" parses X's SearchTimeline JSON responses captured through CDP, giving exact counts and post ids.
+              Pages through the search with the bottom cursor of each response instead of scrolling, the timeline isn't read at all.
+              Needs the session to be created with `networkCapture=True`.
+            - Default is "dom".
+
+        - workers : int
+            - Number of worker processes for sharded scraping. The accounts of the session are dealt out to the workers, each one opens
+              its own Chrome for its own accounts, so an account's budget and cached session are never shared by two workers.
+            - Needs at least as many credentials files as workers.
+            - If more than 1, [endDate, startDate] is split into `shardDays` windows that are scraped in parallel and merged into one Final.
+            - The shard plan is kept in `Process/<processDir>/shards.json`, so rerunning the same call only scrapes unfinished shards.
+              A plan saved for another date range is replaced by a new one.
+            - Default is 1 (no sharding).
+
+        - shardDays : int
+            - Length of each shard window in days. Only used if `workers` is more than 1.
+            - Default is 7.
 
-        filters["from_accounts"] = f'({" OR ".join(f"from:{i}" for i in filters["from_accounts"].split())})' if filters["from_accounts"] != "" else ""
-        filters["to_accounts"] = f'({" OR ".join(f"to:{i}" for i in filters["to_accounts"].split())})' if filters["to_accounts"] != "" else ""
-        filters["mentioning_accounts"] = f'({" OR ".join(f"@{i}" for i in filters["mentioning_accounts"].split())})' if filters["mentioning_accounts"] != "" else ""
+        - storage : Literal["memory", "sqlite"]
+            - Where collected posts are kept while scraping.
+            - "memory" keeps everything in `self.theDict` (a columnar `postBuffer`) with the savepoint journal as backup.
+            - "sqlite" upserts posts every `autoSaveInterval` posts into `Process/<processDir>/posts.sqlite` (WAL mode), dedupes
+              through a unique index instead of an in-memory set and resumes from its `progress` table without reading posts back.
+            - Default is "memory".
 
-        filters["language"] = f'lang:{lang_codes[filters["language"]]}' if filters["language"] != "" else ""
-        filters["replies"] = "" if filters["replies"] else "-filter:replies" 
-        filters["links"] = "" if filters["links"] else "-filter:links"
+        - maxPages : int, optional
+            - Stop after this many search page loads, with a savepoint, so a later `start()` on the same `processDir` resumes.
+              Used by `run_jobs` to give every job of a queue its turn. Default is None (no limit).
 
-        filters["Minimum_replies"] = f'min_replies:{filters["Minimum_replies"]}' if filters["Minimum_replies"] != "" else ""
-        filters["Minimum_likes"] = f'min_faves:{filters["Minimum_likes"]}' if filters["Minimum_likes"] != "" else ""
-        filters["Minimum_retweets"] = f'min_retweets:{filters["Minimum_retweets"]}' if filters["Minimum_retweets"] != "" else ""
+        - pipeline : bool
+            - Whether to parse, dedupe and save posts on a separate thread, fed through a bounded queue of raw batches
+              (`PIPELINE_DEPTH`), while the browser thread keeps scrolling. Turn off to run everything on one thread.
+            - Default is True.
+
+        - maxBufferedPosts : int, optional
+            - Most posts kept in memory with `storage="memory"`. Once `self.theDict` holds this many, they're appended to the
+              savepoint journal, which is then moved to a numbered segment (`Savepoints/segment_<n>.jsonl`), and `self.theDict`
+              is emptied. The Final output is streamed out of the segments in chunks, so memory stays flat however long the run
+              is. Only the dedupe set keeps growing, at 8 bytes per post.
+            - The merge of `workers=N` streams the shards the same way, spilling every `maxBufferedPosts` (or `ROW_GROUP_SIZE`) posts.
+            - Default is None (everything stays in memory until the Final save).
+
+        - follow : bool
+            - Follow the query: only scrape the posts newer than what the previous follow runs of the same filters collected, and
+              merge them into the existing Final output instead of rewriting it. Meant for rerunning the same filters every few hours.
+            - The high-water mark (newest post date) of each query is kept in `Process/<processDir>/follow.json`, the first run
+              (or a Final output from before follow mode) sets it. Each run goes from `startDate` back to the mark only.
+            - New rows are appended to Final.csv and to the object of Final.json. `Final.<parquet|arrow>` becomes a directory
+              with one part per run, read as one table by `pq.read_table` / `pyarrow.dataset`.
+            - A run is only recorded in follow.json once its rows are merged, a run that stops in between is rolled back.
+            - Needs `storage="memory"`, `workers=1` and the same `saveFormat` every run. A run without `follow` replaces the dataset.
+            - Default is False.
+
+        - followOverlap : int
+            - Seconds a follow run looks back past the high-water mark, to catch posts X indexed late. Posts of the overlap that
+              are already in the dataset are skipped. Default is `FOLLOW_OVERLAP` (900).
+
+        - metricsInterval : float, optional
+            - Seconds between snapshots of the run's metrics appended to `Process/<processDir>/metrics.jsonl`: posts/sec, WebDriver
+              commands per post, dedupe hit rate, page loads, detections, and the time spent loading pages, waiting after scrolls,
+              capturing, parsing and saving (see `scrapeMetrics`). A last snapshot is written when the run ends.
+            - None turns the file off. The same numbers are always in `session.metrics.snapshot()`.
+            - Default is `METRICS_INTERVAL` (60).
+
+        - metricsPort : int, optional
+            - Serve the metrics in the Prometheus text format at `http://<host>:<metricsPort>/metrics` while the run goes on.
+            - Default is None (no endpoint).
+
+        - metricsHost : str, optional
+            - Interface the metrics endpoint listens on. "0.0.0.0" (or "") serves it to the whole network, so only open it up
+              where the port is firewalled: the metrics name the processDir and the run's progress.
+            - Default is `METRICS_HOST` ("127.0.0.1", this machine only).
 
-        FILTERS_COMBINATION = ""
-        for _, value in filters.items():
-            if value != "":
-                FILTERS_COMBINATION += f'{value} '
+        - profile : Literal["cprofile", "pyinstrument"], optional
+            - Profile `scrape()` (the browser thread). "cprofile" writes `Process/<processDir>/scrape.prof` and prints the top
+              functions, "pyinstrument" writes `Process/<processDir>/scrape_profile.html` (needs `pyinstrument`).
+            - Default is None.
 
-        self.FILTERS_COMBINATION = quote(FILTERS_COMBINATION.strip())
+        - snapshotLimit : int, optional
+            - Bytes the gzipped snapshots of `extractionMode="snapshot"` may take in `Process/<processDir>/Snapshots`. Past it the
+              oldest snapshots are deleted. None keeps every snapshot.
+            - Default is `SNAPSHOT_LIMIT` (512 MiB).
+
+        Returns
+        -------
+        - bool
+            True once the whole date range was scraped (and the Final file written), False if the run stopped early to be resumed.
+        '''
+        print(f'Timezone: {time.strftime("%z")}')     # Dates are saved in local time
+        self.SEARCH_URL = "https://x.com/search?q="
+        raw_filters = {**SEARCH_FILTERS, **filters}     # Shard workers need the filters as given
+        self.FILTERS_COMBINATION = build_query(filters)
 
         # Dates handling
-        if startDate == "":
+        self.since_date = None
+        open_ended = startDate == ""
+        if open_ended:
             startDate = int(datetime.now().timestamp())
-        else:
+        elif isinstance(startDate, str):
             startDate = int(datetime.strptime(startDate, "%Y-%m-%d").timestamp())
         if endDate == "":
             endDate = int(datetime(2006, 1, 1).timestamp())   # Twitter launch date
         else:
-            endDate = int(datetime.strptime(endDate, "%Y-%m-%d").timestamp())
+            if isinstance(endDate, str):
+                endDate = int(datetime.strptime(endDate, "%Y-%m-%d").timestamp())
+            self.since_date = endDate
         self.start_date = startDate
         self.end_date = endDate
 
-        # scraping params
-        self.WAIT_SHORT = scraping_Params["wait_short"]
-        self.WAIT_LONG = scraping_Params["wait_long"]
-        self.DETECTION_WAIT = scraping_Params["detection_wait"]
-        self.MAX_EMPTY_PAGES = scraping_Params["max_empty_pages"]
+        self._configure_scraping(scraping_Params)
 
         # Other params
+        if saveFormat not in {"csv", "json", "both", "parquet", "arrow"}:
+            raise ValueError("saveFormat must be 'csv', 'json', 'both', 'parquet' or 'arrow'.")
+        if saveFormat in {"parquet", "arrow"} and not _import_pyarrow():
+            raise ImportError(f"saveFormat='{saveFormat}' needs pyarrow, install it with `pip install pyarrow`.")
         self.saveFormat = saveFormat
+        self._columnar_writer = None
+        self._columnar_rows = 0
         self.autoSave = autoSave
         self.autoSaveInterval = autoSaveInterval
         self.continue_if_timeout = continue_if_timeout
         self.processDir = processDir if processDir != "" else datetime.now().strftime('%Y-%m-%d')
+        self._configure_capture(extractionMode, backend)
+        if snapshotLimit is not None and snapshotLimit < 0:
+            raise ValueError("snapshotLimit can't be negative.")
+        self.snapshotLimit = snapshotLimit
+        self._snapshots = None
+        self.cursor = None
+        if storage not in {"memory", "sqlite"}:
+            raise ValueError("storage must be 'memory' or 'sqlite'.")
+        self.storage = storage
+        self.last_post_date = None
+        self._seen = compactIdSet()
+        self.maxPages = maxPages
+        self.pipeline = pipeline
+        if maxBufferedPosts is not None and maxBufferedPosts < 1:
+            raise ValueError("maxBufferedPosts must be at least 1.")
+        self.maxBufferedPosts = maxBufferedPosts
+        if profile not in {None, "cprofile", "pyinstrument"}:
+            raise ValueError("profile must be None, 'cprofile' or 'pyinstrument'.")
+        self.metricsInterval = metricsInterval
+        self.metrics.reset()
+        self._metrics_reported = time.time()
+        # A session can run several jobs (see `run_jobs`), nothing of the previous one carries over
+        self.theDict = postBuffer()
+        self._journaled = 0
+        self._journal_bytes = 0
+        self._keys_written = 0
+        self._segments = []
+        self._earliest_date = None
+        self._planner_state = None
+        self._planner = None
+        self._columnar_backfill = False
+        self._follow = None
+        self._follow_keys = []
+        self._idless_rows = False
+        if getattr(self, "_db", None) is not None:
+            self._db.close()
+            self._db = None
+        if follow:
+            if workers > 1 or storage != "memory":
+                raise ValueError("follow=True needs workers=1 and storage='memory'.")
+            self._follow_query = unquote(self.FILTERS_COMBINATION)
+            self._prepare_follow(followOverlap)
+
+        if workers > len(self.accounts):
+            raise ValueError(f"workers={workers} needs at least {workers} credentials files, got {len(self.accounts)}.")
+
+        if workers > 1:
+            self._run_sharded(raw_filters, workers, shardDays, resume_from_savepoint, {
+                "scraping_Params": scraping_Params, "saveFormat": saveFormat, "autoSave": autoSave,
+                "autoSaveInterval": autoSaveInterval, "continue_if_timeout": continue_if_timeout,
+                "extractionMode": extractionMode, "backend": backend, "storage": storage, "pipeline": pipeline,
+                "maxBufferedPosts": maxBufferedPosts, "metricsInterval": metricsInterval, "snapshotLimit": snapshotLimit,
+            }, open_ended)
+            return True
+
+        if self.storage == "sqlite":
+            self._open_store()
+            if not resume_from_savepoint:
+                with self._db:
+                    self._db.execute("DELETE FROM posts")
+                    self._db.execute("DELETE FROM progress")
+            else:
+                self._load_store_progress()
+            self._idless_rows = self._db.execute("SELECT 1 FROM posts WHERE Post_id IS NULL LIMIT 1").fetchone() is not None
+        elif resume_from_savepoint:
+            self._columnar_backfill = self._load_latest_savepoint() and self.saveFormat in {"parquet", "arrow"}
+        elif os.path.isdir(f"Process/{self.processDir}/Savepoints"):
+            # Starting over, don't append to an old run's journal
+            for name in os.listdir(f"Process/{self.processDir}/Savepoints"):
+                if name.startswith("segment_") or name in {"journal.jsonl", "keys.bin", "manifest.json"}:
+                    os.remove(f"Process/{self.processDir}/Savepoints/{name}")
+
+        if metricsPort is not None:
+            self._serve_metrics(metricsPort, metricsHost)
+        try:
+            # Immidiately start scraping right here right fucking now
+            return self._run_profiled(profile) if profile else self.scrape()
+        finally:
+            self._report_metrics(final=True)
+            self._stop_metrics_server()
         
-        if resume_from_savepoint:
-            self._load_latest_savepoint()
-        
-        self.scrape()   # Immidiately start scraping right here right fucking now
-        
-    def scrape(self) -> None:
+    def scrape(self) -> bool:
         '''
         Starts the scraping process.
 
+        Returns
+        -------
+        - bool
+            True if all posts were scraped, False if the run was suspended (`maxPages` reached, or a throttled pool under `run_jobs`).
+
         Raises
         ------
         - RuntimeError
@@ -694,15 +4356,16 @@ class twitterScrapper:
         '''
         reached_all_posts = False
         counter = 0
-        seen = set()    # Uniqueness so there won't be a fuckton of duplicates
-
-        # If there's already data on self.theDict, populate seen set. Used for resuming from savepoint
-        if all(k in self.theDict for k in ("post_text", "Date", "User")) and self.theDict["post_text"]:
-            seen = {
-                (self.theDict["post_text"][i], self.theDict["Date"][i], self.theDict["User"][i])
-                for i in range(len(self.theDict["post_text"]))
-            }
+        pages = 0
+        self._rebuild_seen()
+        if len(self.theDict):
+            self.last_post_date = self.theDict.last_date()
         start_date = self.start_date
+        self._planner = windowPlanner(self.WINDOW_POSTS)
+        if self._planner_state is not None:
+            self._planner.restore(self._planner_state)
+        self._reached_end = False
+        pipeline = postPipeline(self._consume_batch) if self.pipeline else None
 
         try:
             while True:
@@ -710,109 +4373,178 @@ class twitterScrapper:
                 # Get the current date upper limit
                 current_date_limit = start_date
                 current_date_limit_str = datetime.fromtimestamp(current_date_limit).strftime("%Y-%m-%d")
+                if self.since_date is not None and current_date_limit <= self.since_date:
+                    reached_all_posts = True
 
                 # If all shits been scraped, will save and break
                 if reached_all_posts:
                     print("All posts have been scraped!")
-                    # Delete all temps aka Savepoints
-                    shutil.rmtree(f'Process/{self.processDir}/Savepoints/')
+                    # Compact everything into Final once, then delete all temps aka Savepoints
                     self.save("final")
-                    break
+                    if self._follow is not None:
+                        self._record_follow()
+                    shutil.rmtree(f'Process/{self.processDir}/Savepoints/', ignore_errors=True)
+                    return True
 
-                self.driver.get(self._build_search_url(current_date_limit))
-                time.sleep(self.WAIT_SHORT)
+                if self.maxPages is not None and pages >= self.maxPages:
+                    print(f"Stopping after {pages} pages, saving progress to resume later...")
+                    self._suspend()
+                    return False
+                if not self._acquire_account():
+                    print("Suspending this job until the pool frees up, saving progress...")
+                    self._suspend()
+                    return False
+                pages += 1
+                self.metrics.count("pages")
+                self._report_metrics()
+                since_limit = self._planner.next_window(current_date_limit, self.since_date)
+                with self.metrics.timer("page_load"):
+                    page = self._load_search_page(current_date_limit, since_limit)
+                with self.metrics.timer("detection_check"):
+                    detected = self._scrape_detected(page)
+                if detected:
+                    self.metrics.count("detections")
 
                 # CHECKER
-                ##  1 CHECKER FOR SCRAPING DETECTION, IF `continue_if_timeout` IS TRUE, WILL WAIT AND CONTINUE, ELSE WILL JUST STOP.
+                ##  1 CHECKER FOR SCRAPING DETECTION, IF `continue_if_timeout` IS TRUE, WILL COOL DOWN THE ACCOUNT AND CONTINUE, ELSE WILL JUST STOP.
                 if self.continue_if_timeout:
-                    if self._scrape_detected():
-                        print("Scraping detected! Auto-saving progress...")
+                    if detected:
+                        print(f"Scraping detected on @{self.account.username}! Auto-saving progress...")
                         self.save("savepoint")
-                        print(f"Waiting for {self.DETECTION_WAIT} seconds")
-                        # Wait for abyssmal amount of time
-                        wait(self.DETECTION_WAIT)
+                        # Backs off exponentially for this account, `_acquire_account` moves on to another one (or waits if there's none)
+                        delay = self.account.limiter.detected(self.account.observed_rate(self.budget_window))
+                        self._log_rate("detected")
+                        print(f"Cooling down @{self.account.username} for {int(delay)} seconds. Pool: {self.pool_status()}")
                         continue
 
                 else:
-                    if self._scrape_detected():
+                    if detected:
                         self.save("savepoint")
                         raise RuntimeError("Scraping detected! All progress have been saved.")
 
+                if self.account.limiter.success():
+                    self._log_rate("recovered")
+
                 ##  2 CHECKER FOR NO POSTS FOUND, IF SHIT HAPPENS WILL ROLE BACK FOR LIKE A DAY. IF SHIT KEEPS HAPPENING TILL `MAX_EMPTY_PAGES``, WILL STOP.
-                start_date, counter, reached_all_posts = self._wait_for_posts(start_date, counter)
+                with self.metrics.timer("page_load"):
+                    start_date, counter, reached_all_posts = self._wait_for_posts(start_date, counter, since_limit, page)
                 if reached_all_posts:
                     print("No more posts found!")
                     continue
 
-                last_height = self.driver.execute_script("return document.body.scrollHeight")
+                if self.backend != "network":
+                    page = self.driver.execute_script(PAGE_STATE_JS) or {}
+                self._window = {"posts": 0, "oldest": None}
 
                 while True:
-                    elements = self.driver.find_elements(By.XPATH, '//div[@aria-label="Timeline: Search timeline"]/div/div')
-
-                    for element in elements[:-1]:
-                        try:
-                            post_text, quoted_text, post_user, post_date = self._extract_post_data(element)
-                        except (NoSuchElementException, StaleElementReferenceException):
-                            continue
+                    # The browser thread only captures, parsing/dedupe/saving happen on the pipeline thread meanwhile
+                    with self.metrics.timer("capture"):
+                        batch = self._capture_batch()
+                    if pipeline is not None:
+                        pipeline.put(*batch)
+                    else:
+                        self._consume_batch(*batch)
 
-                        key = (post_text, post_date, post_user)
-                        if key in seen:
-                            continue
-
-                        # If end date is reached, functional if user specified end_date at self.start()
-    
-                        if self.theDict["Date"] and safelyTurnStrToUnixTime(self.theDict["Date"][-1]) < self.end_date:
-                            reached_all_posts = True
-                            break
-                        
-                        seen.add(key)
-                        self.theDict["post_text"].append(post_text)
-                        self.theDict["quotedPost_text"].append(quoted_text)
-                        self.theDict["User"].append(post_user)
-                        self.theDict["Date"].append(post_date)
-
-                        for group in element.find_elements(By.XPATH, './/div[@role="group"]'):
-                            self.theDict["Reply_count"].append(
-                                safe_int_from_aria(group.find_element(By.XPATH, './/div[1]/button').get_attribute("aria-label"))
-                            )
-                            self.theDict["Repost_count"].append(
-                                safe_int_from_aria(group.find_element(By.XPATH, './/div[2]/button').get_attribute("aria-label"))
-                            )
-                            self.theDict["Like_count"].append(
-                                safe_int_from_aria(group.find_element(By.XPATH, './/div[3]/button').get_attribute("aria-label"))
-                            )
-                            self.theDict["View_count"].append(
-                                safe_int_from_aria(group.find_element(By.XPATH, './/div[4]/a').get_attribute("aria-label"))
-                            )
-
-                        if self.autoSave and len(seen) % self.autoSaveInterval == 0:
-                            self.save("savepoint")
-                        
-                    if reached_all_posts:
+                    if self._reached_end:
                         break
                         
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(self.WAIT_SHORT)
-                    new_height = self.driver.execute_script("return document.body.scrollHeight")
-
-                    if new_height == last_height:
-                        if self.theDict["Date"]:
-                            last_date_only = safelyTurnStrToUnixTime(self.theDict["Date"][-1])
-                            if last_date_only >= current_date_limit:
-                                start_date = minOneDay(last_date_only)
-                            else:
-                                start_date = last_date_only
-                        else:
-                            start_date = current_date_limit
+                    with self.metrics.timer("scroll_wait"):
+                        new_page = self._next_page(page)
+
+                    self._report_metrics()
+                    if new_page is None:
+                        if pipeline is not None:
+                            pipeline.join()     # The planner needs every post of the window
+                        # Carry on below the oldest new post, or past the whole window if it was drained (see `next_cursor`)
+                        window_posts, oldest = self._window["posts"], self._window["oldest"]
+                        self._planner.record(since_limit, current_date_limit, window_posts, oldest)
+                        start_date = self._planner.next_cursor(since_limit, current_date_limit, window_posts, oldest)
 
                         self.start_date = start_date
                         break
 
-                    last_height = new_height
+                    page = new_page
+
+                if pipeline is not None:
+                    pipeline.join()
+                reached_all_posts = self._reached_end
 
         except Exception as e:
+            if pipeline is not None:
+                pipeline.close()        # Let it finish what's queued, so the savepoint has it
             print(f"An error occurred: {e}")
             print("Auto-saving progress before exiting...")
             self.save("savepoint")
-            self.driver.quit()
-            raise e
\ No newline at end of file
+            self.quit()
+            raise e
+
+        finally:
+            if pipeline is not None:
+                pipeline.close()
+
+    def _consume_batch(self, kind: str, raw: Union[list, str]) -> None:
+        '''
+        Parse a batch from `_capture_batch`, dedupe it and add the new posts, saving a savepoint when it's due.
+
+        Runs on the pipeline thread (or inline with `pipeline=False`). Sets `self._reached_end` once the end date is passed and
+        keeps the count and oldest date of the new posts of the current window in `self._window`.
+        '''
+        with self.metrics.timer("parse"):
+            if kind == "html" and raw:
+                self._store_snapshot(raw)
+            posts = self._parse_batch(kind, raw)
+        for post in posts:
+            if self._reached_end:
+                return
+            key = self._post_key(post)
+            if self._is_seen(key, post):
+                self.metrics.count("duplicates")
+                continue
+
+            # If end date is reached, functional if user specified end_date at self.start()
+            if self.last_post_date is not None and self.last_post_date < self.end_date:
+                self._reached_end = True
+                return
+
+            self._add_post(post, key)
+            self.metrics.count("posts")
+            post_time = post["Date"]
+            self._window["posts"] += 1
+            self._window["oldest"] = post_time if self._window["oldest"] is None else min(self._window["oldest"], post_time)
+
+            # The sqlite storage always flushes in batches, it's what keeps self.theDict small
+            if (self.autoSave or self.storage == "sqlite") and self._unsaved_rows() >= self.autoSaveInterval:
+                self.save("savepoint")
+            if self.storage == "memory" and self.maxBufferedPosts is not None and len(self.theDict) >= self.maxBufferedPosts:
+                self._spill()
+
+_SHARD_CREDENTIALS = None      # Credentials files of this shard worker process, see `_init_shard_worker`
+
+def _init_shard_worker(account_slices) -> None:
+    '''
+    Initializer of the shard worker processes of `twitterScrapper._run_sharded`: take this worker's slice of the accounts.
+    '''
+    global _SHARD_CREDENTIALS
+    _SHARD_CREDENTIALS = account_slices.get()
+
+def _run_shard(job: dict) -> int:
+    '''
+    Worker for `twitterScrapper._run_sharded`. Logs in with its own driver and this worker's accounts, and scrapes one shard window.
+
+    Parameters
+    ----------
+    - job : dict
+        The shard job, with the filters and `start()` arguments.
+
+    Returns
+    -------
+    - int
+        The index of the shard in the plan.
+    '''
+    session = twitterScrapper(_SHARD_CREDENTIALS, networkCapture=job["networkCapture"], user_multi_procs=True,
+                              headless=job.get("headless", False), lightProfile=job.get("lightProfile", True))
+    try:
+        session.start(job["filters"], **job["start_kwargs"])
+    finally:
+        session.quit()
+    return job["index"]
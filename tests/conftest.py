@@ -0,0 +1,62 @@
+import contextlib
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark
+import src
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SCRAPING_PARAMS = benchmark.SCRAPING_PARAMS
+
+
+def timeline_posts() -> tuple[str, list[dict]]:
+    '''
+    The benchmark's timeline fixture and its posts as scraped (with their ids), newest first.
+    '''
+    page, _ = benchmark.load_fixtures()
+    return page, src.parse_timeline_html(page)
+
+
+def legacy_rows(posts: list[dict]) -> list[dict]:
+    '''
+    Posts the way runs from before post ids were read kept them: formatted dates, no Post_id.
+    '''
+    return [{col: src.format_date(post["Date"]) if col == "Date" else post[col] for col in src.POST_COLUMNS[:-1]} for post in posts]
+
+
+def write_legacy_csv(path: str, posts: list[dict]) -> None:
+    import pandas as pd
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame(legacy_rows(posts), columns=src.POST_COLUMNS[:-1]).to_csv(path, index=False)
+
+
+def write_legacy_json(path: str, posts: list[dict]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({str(i): row for i, row in enumerate(legacy_rows(posts))}, f, indent=4)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    '''
+    Scratch directory to run sessions in (`start()` writes under `Process/`), with a credentials file.
+    '''
+    monkeypatch.chdir(tmp_path)
+    with open("credentials.json", "w") as f:
+        json.dump({"username": "test", "password": "test", "email": "test@example.com"}, f)
+    return tmp_path
+
+
+@pytest.fixture
+def quiet():
+    '''
+    The scraper is chatty, keep its prints out of the test output.
+    '''
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
@@ -0,0 +1,66 @@
+import json
+import time
+
+import benchmark
+import src
+
+
+def pool_session(workdir, accounts: int = 2) -> benchmark.benchScrapper:
+    '''
+    A session logged in with `accounts` accounts on fake drivers, with a budget of 2 page loads per account.
+    '''
+    paths = ["credentials.json"]
+    for i in range(1, accounts):
+        paths.append(f"account{i}.json")
+        with open(paths[-1], "w") as f:
+            json.dump({"username": f"account{i}", "password": "test", "email": f"account{i}@example.com"}, f)
+    page, _ = benchmark.load_fixtures()
+    session = benchmark.benchScrapper(paths, page)
+    session.requests_per_window = 2
+    session.budget_window = 900
+    session.WAIT_LONG = 0
+    session._suspend_on_wait = True     # Report a throttled pool instead of sleeping through it
+    return session
+
+
+def test_the_pool_switches_account_once_the_budget_is_spent(workdir, quiet):
+    session = pool_session(workdir)
+    first, second = session.accounts
+
+    used = []
+    for _ in range(4):
+        assert session._acquire_account()
+        used.append(session.account)
+    assert used == [first, first, second, second]
+    assert session.driver is second.driver and session.username == "account1"
+
+    # Both budgets spent: the job is suspended rather than waiting for the window to slide
+    assert not session._acquire_account()
+    assert session.pool_ready_at() > time.time() + 800
+
+
+def test_a_cooling_down_account_hands_the_work_to_another_one(workdir, quiet):
+    session = pool_session(workdir)
+    first, second = session.accounts
+    session.requests_per_window = None
+
+    assert session._acquire_account() and session.account is first
+    delay = first.limiter.detected(first.observed_rate(session.budget_window))
+    assert session._acquire_account() and session.account is second
+    assert session._acquire_account() and session.account is second     # Sticks to it, no switching back and forth
+
+    status = {account["username"]: account for account in session.pool_status()}
+    assert status["test"]["detections"] == 1 and status["test"]["backoff_level"] == 1
+    assert 0 < status["test"]["cooldown_left"] <= delay
+    assert status["account1"]["detections"] == 0 and status["account1"]["cooldown_left"] == 0
+    assert status["account1"]["requests_per_min"] > 0
+
+
+def test_every_account_is_logged_in_on_its_own_browser(workdir, quiet):
+    session = pool_session(workdir, accounts=3)
+    drivers = [account.driver for account in session.accounts]
+    assert len({id(driver) for driver in drivers}) == 3
+    assert session.account is session.accounts[0] and session.driver is drivers[0]
+
+    session.quit()
+    assert all(account.driver is None for account in session.accounts) and session.driver is None
@@ -0,0 +1,59 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+
+def streamed_final(save_format: str, posts: list[dict], batch: int) -> benchmark.benchScrapper:
+    '''
+    Stream `posts` into Final.<save_format> `batch` posts per row group / record batch, the way a scrape spills them.
+    '''
+    page, _ = timeline_posts()
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir="columnar", saveFormat=save_format,
+                  resume_from_savepoint=False, maxPages=0)
+    session.theDict = src.postBuffer()
+    for i in range(0, len(posts), batch):
+        for post in posts[i:i + batch]:
+            session.theDict.append(post)
+        session._write_columnar(final=False, flush=True)
+    session.save("final")
+    return session
+
+
+def test_every_parquet_row_group_has_its_own_user_dictionary(workdir, quiet):
+    _, posts = timeline_posts()
+    streamed_final("parquet", posts, 50)
+
+    file = pq.ParquetFile("Process/columnar/Final.parquet")
+    assert file.num_row_groups == -(-len(posts) // 50)
+    for group in range(file.num_row_groups):
+        users = file.read_row_group(group, columns=["User"]).column("User").chunk(0)
+        assert pa.types.is_dictionary(users.type)
+        # Only the handles of this row group, not every handle seen before it
+        assert sorted(users.dictionary.to_pylist()) == sorted({post["User"] for post in posts[group * 50:(group + 1) * 50]})
+    assert pq.read_table("Process/columnar/Final.parquet").column("User").to_pylist() == [post["User"] for post in posts]
+
+
+def test_arrow_batches_only_add_the_new_handles_to_the_file_dictionary(workdir, quiet):
+    _, posts = timeline_posts()
+    session = streamed_final("arrow", posts, 50)
+    handles = list(dict.fromkeys(post["User"] for post in posts))
+    assert session._columnar_user_values.to_pylist() == handles
+
+    with pa.ipc.open_file("Process/columnar/Final.arrow") as reader:
+        assert reader.num_record_batches == -(-len(posts) // 50)
+        table = reader.read_all()
+    assert table.column("User").to_pylist() == [post["User"] for post in posts]
+    assert table.column("Post_id").to_pylist() == [post["Post_id"] for post in posts]
+
+
+@pytest.mark.parametrize("save_format", ["parquet", "arrow"])
+def test_columnar_finals_round_trip(workdir, quiet, save_format):
+    _, posts = timeline_posts()
+    session = streamed_final(save_format, posts, 64)
+    data = session._read_savefile(f"Process/columnar/Final.{save_format}")
+    assert list(data.rows(formatted=False)) == [{col: post[col] for col in src.POST_COLUMNS} for post in posts]
@@ -0,0 +1,44 @@
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+
+def scrape_fixture(mode: str) -> benchmark.benchScrapper:
+    '''
+    A whole `start()` over the replayed fixture timeline with the given extraction mode.
+    '''
+    page, posts = timeline_posts()
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), startDate=max(post["Date"] for post in posts) + 1,
+                  endDate=min(post["Date"] for post in posts), scraping_Params=dict(SCRAPING_PARAMS), processDir=mode,
+                  resume_from_savepoint=False, extractionMode=mode)
+    return session
+
+
+def test_converted_posts_take_their_date_from_the_id_and_counts_from_aria():
+    posts = src.convert_extracted_posts([
+        {"Post_id": "1880000000000000000", "User": "@a", "Date": "2000-01-01T00:00:00.000Z", "post_text": "a",
+         "quotedPost_text": "", "Reply_count": "3 Replies. Reply", "Repost_count": "", "Like_count": "12 Likes. Like",
+         "View_count": "1500 views. View post analytics"},
+        {"Post_id": None, "User": "@b", "Date": "2026-01-19T06:19:18.000Z", "post_text": "b", "quotedPost_text": "",
+         "Reply_count": "", "Repost_count": "", "Like_count": "", "View_count": ""},
+        {"Post_id": None, "User": "@c", "Date": None, "post_text": "c", "quotedPost_text": "",
+         "Reply_count": "", "Repost_count": "", "Like_count": "", "View_count": ""},
+    ])
+    assert [post["User"] for post in posts] == ["@a", "@b"]     # No date to read, no post
+    assert posts[0]["Post_id"] == 1880000000000000000
+    assert posts[0]["Date"] == int(src.snowflake_to_unix(1880000000000000000))
+    assert [posts[0][col] for col in src.COUNT_COLUMNS] == [3, 0, 12, 1500]
+    assert posts[1]["Date"] == src.iso_to_unix("2026-01-19T06:19:18.000Z")
+
+
+def test_script_mode_reads_the_same_posts_in_one_round_trip_per_step(workdir, quiet):
+    webdriver = scrape_fixture("webdriver")
+    script = scrape_fixture("script")
+
+    assert script.theDict.to_dict() == webdriver.theDict.to_dict()
+    posts = len(script.theDict)
+    assert posts == len(timeline_posts()[1])
+    # Every scroll step costs the page state polls, the scroll and one extraction call, not a call per span/img/link
+    assert script.driver.commands / posts < 2
+    assert webdriver.driver.commands / posts > 10 * script.driver.commands / posts
@@ -0,0 +1,47 @@
+import json
+
+import pandas as pd
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts, write_legacy_csv, write_legacy_json
+
+OVERLAP = 86400     # Reaches far into the legacy rows, every one of them within it gets scraped again
+
+
+def follow(page: str, posts: list[dict], save_format: str) -> benchmark.benchScrapper:
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), startDate=posts[0]["Date"] + 1, endDate=posts[-1]["Date"],
+                  scraping_Params=dict(SCRAPING_PARAMS), processDir="legacy", saveFormat=save_format, resume_from_savepoint=False,
+                  follow=True, followOverlap=OVERLAP)
+    return session
+
+
+def identity(df: pd.DataFrame) -> pd.Series:
+    return df["post_text"] + "\x00" + df["Date"] + "\x00" + df["User"]
+
+
+def test_follow_appends_to_a_legacy_csv_in_its_own_columns(workdir, quiet):
+    page, posts = timeline_posts()
+    write_legacy_csv("Process/legacy/Final.csv", posts[150:])
+
+    follow(page, posts, "csv")
+    final = pd.read_csv("Process/legacy/Final.csv")
+    assert final.columns.tolist() == src.POST_COLUMNS[:-1]
+    assert len(final) == len(posts)
+    assert identity(final).is_unique
+
+    # Nothing new, nothing added
+    follow(page, posts, "csv")
+    assert len(pd.read_csv("Process/legacy/Final.csv")) == len(posts)
+
+
+def test_follow_skips_the_overlap_of_a_legacy_json(workdir, quiet):
+    page, posts = timeline_posts()
+    write_legacy_json("Process/legacy/Final.json", posts[150:])
+
+    follow(page, posts, "json")
+    with open("Process/legacy/follow.json", "r", encoding="utf-8") as f:
+        assert json.load(f)["queries"][""]["idless"] is False      # The new posts within the overlap have ids
+    final = pd.read_json("Process/legacy/Final.json", orient="index", dtype=False)
+    assert len(final) == len(posts)
+    assert identity(final).is_unique
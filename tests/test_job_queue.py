@@ -0,0 +1,81 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+
+def write_queue(path: str, jobs: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for job in jobs:
+            f.write(json.dumps(job) + "\n")
+
+
+def fixture_jobs(posts: list[dict]) -> list[dict]:
+    '''
+    Two jobs over the fixture, the second one over its older half. Both reach a few days past the oldest post, so each takes
+    several pages: the one with the posts, then empty windows until the planner gives up on the rest.
+    '''
+    newest = max(post["Date"] for post in posts) + 1
+    middle = sorted(post["Date"] for post in posts)[len(posts) // 2]
+    since = min(post["Date"] for post in posts) - 5 * 86400
+    params = {**SCRAPING_PARAMS, "window_posts": 100}
+    return [{"processDir": "all", "filters": dict(src.SEARCH_FILTERS), "startDate": newest, "endDate": since, "scraping_Params": params},
+            {"processDir": "older", "filters": dict(src.SEARCH_FILTERS), "startDate": middle, "endDate": since, "scraping_Params": params}]
+
+
+def recording_session(page: str) -> tuple[benchmark.benchScrapper, list[str]]:
+    session = benchmark.benchScrapper("credentials.json", page)
+    turns = []
+    start = session.start
+    def recording_start(filters, **kwargs):
+        turns.append(kwargs["processDir"])
+        return start(filters, **kwargs)
+    session.start = recording_start
+    return session, turns
+
+
+def test_jobs_take_turns_until_every_one_is_done(workdir, quiet):
+    page, posts = timeline_posts()
+    jobs = fixture_jobs(posts)
+    write_queue("queue.jsonl", jobs)
+    session, turns = recording_session(page)
+
+    assert session.run_jobs("queue.jsonl", slicePages=1) == {"all": True, "older": True}
+    assert turns[:4] == ["all", "older", "all", "older"]       # One slice each, in turn
+    assert turns.count("all") > 1 and turns.count("older") > 1
+    assert not os.path.exists("queue.jsonl.state.json")
+
+    for job in jobs:
+        final = pd.read_csv(f"Process/{job['processDir']}/Final.csv")
+        assert sorted(final["Post_id"]) == sorted(post["Post_id"] for post in posts if post["Date"] < job["startDate"])
+
+
+def test_an_interrupted_queue_only_runs_the_unfinished_jobs(workdir, quiet):
+    page, posts = timeline_posts()
+    write_queue("queue.jsonl", fixture_jobs(posts))
+    src._atomic_write_json("queue.jsonl.state.json", {"all": {"done": True, "turns": 3}})
+    session, turns = recording_session(page)
+
+    assert session.run_jobs("queue.jsonl", slicePages=100) == {"all": True, "older": True}
+    assert turns == ["older"]
+    assert not os.path.exists("Process/all")
+
+
+def test_jobs_need_filters_and_their_own_process_dir(workdir, quiet):
+    page, posts = timeline_posts()
+    session, turns = recording_session(page)
+    job = fixture_jobs(posts)[0]
+
+    write_queue("queue.jsonl", [job, {**job, "startDate": job["startDate"] - 86400}])
+    with pytest.raises(ValueError, match="its own processDir"):
+        session.run_jobs("queue.jsonl")
+
+    write_queue("queue.jsonl", [job, {"processDir": "nofilters"}])
+    with pytest.raises(ValueError, match="line 2"):
+        session.run_jobs("queue.jsonl")
+    assert turns == []
@@ -0,0 +1,76 @@
+import json
+import os
+
+import pandas as pd
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+JOURNAL = "Process/journal/Savepoints/journal.jsonl"
+
+
+def journal_session(page: str, resume: bool = False, save_format: str = "csv") -> benchmark.benchScrapper:
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir="journal", saveFormat=save_format,
+                  resume_from_savepoint=resume, maxPages=0)
+    return session
+
+
+def test_savepoints_only_append_the_new_posts(workdir, quiet):
+    page, posts = timeline_posts()
+    session = journal_session(page)
+    session.theDict = src.postBuffer(posts[:50])
+    session.save("savepoint")
+    with open(JOURNAL, "rb") as f:
+        first = f.read()
+
+    for post in posts[50:80]:
+        session.theDict.append(post)
+    session.save("savepoint")
+    session.save("savepoint")       # Nothing new, nothing written
+    with open(JOURNAL, "rb") as f:
+        journal = f.read()
+
+    assert journal.startswith(first)        # The first 50 rows weren't rewritten
+    lines = journal.decode("utf-8").splitlines()
+    assert len(lines) == 80
+    assert [json.loads(line)["Post_id"] for line in lines] == [post["Post_id"] for post in posts[:80]]
+    assert json.loads(lines[0])["Date"] == posts[0]["Date"]     # Unix timestamps, not formatted dates
+
+
+def test_a_torn_last_line_is_dropped(workdir, quiet):
+    page, posts = timeline_posts()
+    session = journal_session(page)
+    session.theDict = src.postBuffer(posts[:20])
+    session.save("savepoint")
+    with open(JOURNAL, "a", encoding="utf-8") as f:
+        f.write(json.dumps(posts[20])[:40])     # Crash in the middle of a write
+
+    assert [post["Post_id"] for post in session._read_journal().rows()] == [post["Post_id"] for post in posts[:20]]
+
+    # Same for a run from before the manifest, which reads the journal back in
+    os.remove("Process/journal/Savepoints/manifest.json")
+    session = journal_session(page, resume=True)
+    assert session.theDict.column("Post_id") == [post["Post_id"] for post in posts[:20]]
+    assert session.start_date == min(post["Date"] for post in posts[:20])
+
+
+def test_the_final_save_compacts_the_journal_and_its_segments(workdir, quiet):
+    page, posts = timeline_posts()
+    session = journal_session(page)
+    session.maxBufferedPosts = 40
+    for i in range(0, 100, 20):
+        for post in posts[i:i + 20]:
+            session.theDict.append(post)
+        if len(session.theDict) >= session.maxBufferedPosts:
+            session._spill()
+        else:
+            session.save("savepoint")
+
+    assert sorted(os.listdir("Process/journal/Savepoints")) == ["journal.jsonl", "keys.bin", "manifest.json",
+                                                               "segment_00001.jsonl", "segment_00002.jsonl"]
+    session.save("final")
+    final = pd.read_csv("Process/journal/Final.csv")
+    assert list(final["Post_id"]) == [post["Post_id"] for post in posts[:100]]
+    assert list(final.columns) == src.POST_COLUMNS
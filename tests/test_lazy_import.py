@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Only the options that need them import these, see the top of src.py
+LAZY_MODULES = ["pandas", "IPython", "tqdm", "undetected_chromedriver", "pyarrow", "lxml.html", "cryptography.fernet",
+                "multiprocessing", "sqlite3", "http.server", "cProfile", "pstats"]
+
+
+def test_importing_src_loads_none_of_the_optional_modules():
+    check = f"import sys, src; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    loaded = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert loaded.strip() == ""
+
+
+def test_lazy_imports_fill_the_module_globals():
+    import src
+    assert src._import_lxml() and src.lxml_html.__name__ == "lxml.html"
+    assert src._import_fernet() and src.Fernet.__module__ == "cryptography.fernet"
+    with pytest.raises(ValueError):
+        src.decrypt_session(src.encrypt_session({"cookies": []}, "right")[:-1] + b"!", "right")
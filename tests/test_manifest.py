@@ -0,0 +1,107 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+SAVEPOINTS = "Process/manifest/Savepoints"
+
+
+def manifest_session(page: str, resume: bool = False) -> benchmark.benchScrapper:
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir="manifest",
+                  resume_from_savepoint=resume, maxPages=0)
+    return session
+
+
+def saved_session(page: str, posts: list[dict]) -> benchmark.benchScrapper:
+    '''
+    A session with `posts` collected over three savepoints and a spill in between.
+    '''
+    session = manifest_session(page)
+    for i, post in enumerate(posts):
+        session.theDict.append(post)
+        if i % 25 == 24:
+            session.save("savepoint")
+        if i == 49:
+            session._spill()
+    session.start_date = min(post["Date"] for post in posts)
+    session.save("savepoint")
+    return session
+
+
+def manifest() -> dict:
+    with open(os.path.join(SAVEPOINTS, "manifest.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def final_ids(session: benchmark.benchScrapper) -> list[int]:
+    session.save("final")
+    return list(pd.read_csv("Process/manifest/Final.csv")["Post_id"])
+
+
+def test_resuming_reads_the_manifest_and_keys_but_no_post(workdir, quiet, monkeypatch):
+    page, posts = timeline_posts()
+    saved_session(page, posts[:80])
+    saved = manifest()
+    assert (saved["cursor"], saved["keys"], saved["segments"]) == (min(post["Date"] for post in posts[:80]), 80,
+                                                                 ["segment_00001.jsonl"])
+
+    def no_posts(*args, **kwargs):
+        raise AssertionError("resuming read posts back")
+    with monkeypatch.context() as patched:
+        patched.setattr(benchmark.benchScrapper, "_iter_journal", no_posts)
+        patched.setattr(benchmark.benchScrapper, "_read_savefile", no_posts)
+        session = manifest_session(page, resume=True)
+
+    assert session.start_date == saved["cursor"]
+    assert len(session.theDict) == 0
+    assert len(session._seen) == 80 and all(src.post_key(post) in session._seen for post in posts[:80])
+    assert manifest()["segments"] == ["segment_00001.jsonl", "segment_00002.jsonl"]     # The journal became a segment
+    assert final_ids(session) == [post["Post_id"] for post in posts[:80]]
+
+
+def test_a_crash_after_the_manifest_is_cut_off_the_journal_and_keys(workdir, quiet):
+    page, posts = timeline_posts()
+    saved_session(page, posts[:40])
+    saved = manifest()
+
+    # Crash in the middle of the next savepoint: rows and keys written, the manifest not updated yet
+    with open(os.path.join(SAVEPOINTS, "journal.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(posts[40]) + "\n" + json.dumps(posts[41])[:30])
+    with open(os.path.join(SAVEPOINTS, "keys.bin"), "ab") as f:
+        f.write(b"\x01" * 12)
+
+    session = manifest_session(page, resume=True)
+    assert session._keys_written == saved["keys"] == 40
+    assert os.path.getsize(os.path.join(SAVEPOINTS, "keys.bin")) == 40 * 8
+    assert src.post_key(posts[40]) not in session._seen     # Collected again on the next page
+    assert final_ids(session) == [post["Post_id"] for post in posts[:40]]
+
+
+def test_a_spill_cut_short_is_finished_on_resume(workdir, quiet, monkeypatch):
+    page, posts = timeline_posts()
+    session = saved_session(page, posts[:60])
+
+    # Crash between the manifest listing the new segment and the journal being renamed to it
+    replace = os.replace
+    def crash(src_path, dst_path):
+        if "segment_" in str(dst_path):
+            raise KeyboardInterrupt
+        replace(src_path, dst_path)
+    for post in posts[60:70]:
+        session.theDict.append(post)
+    with monkeypatch.context() as patched, pytest.raises(KeyboardInterrupt):
+        patched.setattr(os, "replace", crash)
+        session._spill()
+    assert "segment_00002.jsonl" in manifest()["segments"]
+    assert not os.path.exists(os.path.join(SAVEPOINTS, "segment_00002.jsonl"))
+
+    session = manifest_session(page, resume=True)
+    assert os.path.exists(os.path.join(SAVEPOINTS, "segment_00002.jsonl"))
+    assert len(session._seen) == 70
+    assert final_ids(session) == [post["Post_id"] for post in posts[:70]]
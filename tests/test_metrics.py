@@ -0,0 +1,30 @@
+import urllib.request
+
+import benchmark
+import src
+from conftest import timeline_posts
+
+
+def test_prometheus_escapes_label_values():
+    metrics = src.scrapeMetrics()
+    metrics.count("posts", 3)
+    text = metrics.prometheus({"processDir": 'MBG "daily"\\run\nb'})
+    assert 'xscraper_posts_total{processDir="MBG \\"daily\\"\\\\run\\nb"} 3' in text.splitlines()
+    assert all(line.startswith(("# TYPE", "xscraper_")) for line in text.splitlines())
+
+
+def test_the_endpoint_only_listens_on_localhost_by_default(workdir, quiet):
+    page, _ = timeline_posts()
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.processDir = "served"
+    session._serve_metrics(0)
+    try:
+        host, port = session._metrics_server.server_address[:2]
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert 'process_dir="served"' in response.read().decode("utf-8")
+
+        session._serve_metrics(0, "0.0.0.0")        # Opened up on purpose
+        assert session._metrics_server.server_address[0] == "0.0.0.0"
+    finally:
+        session._stop_metrics_server()
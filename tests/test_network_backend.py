@@ -0,0 +1,230 @@
+'''
+The network backend end to end: a stand-in for X serves `fixtures/search_timeline.json` over local HTTP, and a stand-in for
+Chrome fetches it when the search page loads or scrolls and reports it in the performance log the way Chrome does, so
+`start(..., backend="network")` goes through the same CDP capture as against the real site.
+'''
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+from urllib.request import urlopen
+
+import pandas as pd
+import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+import src
+from conftest import FIXTURE_DIR
+
+PAGE_SIZE = 8
+SCRAPING_PARAMS = {"wait_short": 2, "wait_long": 0.05, "detection_wait": 900, "max_empty_pages": 2,
+                   "poll_interval": 0.005, "idle_window": 0.02}
+
+
+def load_timeline() -> dict:
+    with open(os.path.join(FIXTURE_DIR, "search_timeline.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def timeline_entries(payload: dict) -> list[dict]:
+    return [entry for instruction in payload["data"]["search_by_raw_query"]["search_timeline"]["timeline"]["instructions"]
+            for entry in instruction.get("entries", [])]
+
+
+class standInX(BaseHTTPRequestHandler):
+    '''
+    SearchTimeline endpoint over the fixture: honours `until_time`/`since_time` of the raw query and pages `PAGE_SIZE`
+    entries per cursor, newest first. The last page only has cursors, like X's.
+    '''
+    entries = [e for e in timeline_entries(load_timeline()) if not e["entryId"].startswith("cursor-")]
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/SearchTimeline"):
+            return self._reply({"data": {}})
+
+        variables = json.loads(parse_qs(url.query)["variables"][0])
+        until = re.search(r"until_time:(\d+)", variables["rawQuery"])
+        since = re.search(r"since_time:(\d+)", variables["rawQuery"])
+        until = int(until.group(1)) if until else float("inf")
+        since = int(since.group(1)) if since else 0
+        matching = [e for e in self.entries if since <= src.snowflake_to_unix(int(e["sortIndex"])) < until]
+
+        offset = int(variables.get("cursor") or 0)
+        page = matching[offset:offset + PAGE_SIZE]
+        cursors = [{"entryId": "cursor-top", "content": {"cursorType": "Top", "value": "0"}},
+                   {"entryId": "cursor-bottom", "content": {"cursorType": "Bottom", "value": str(offset + len(page))}}]
+        self._reply({"data": {"search_by_raw_query": {"search_timeline": {"timeline": {
+            "instructions": [{"type": "TimelineAddEntries", "entries": [cursors[0]] + page + [cursors[1]]}]}}}}})
+
+    def _reply(self, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class standInChrome:
+    '''
+    Loading the search page fires its SearchTimeline XHR (and an unrelated GraphQL call) at the stand-in server, the next
+    pages are only fetched through `NEXT_PAGE_JS`, like X's own scroll handler would with the bottom cursor. Every request
+    lands in the performance log as `Network.requestWillBeSent`, `Network.responseReceived` then `Network.loadingFinished`,
+    and its body is served once by `Network.getResponseBody`. Anything that reads or scrolls the page is recorded in `dom_calls`.
+    '''
+
+    def __init__(self, server: str):
+        self.server = server
+        self.log = []
+        self.bodies = {}
+        self.requests = 0
+        self.dom_calls = []
+
+    def _fetch(self, url: str, headers: dict = None) -> str:
+        with urlopen(url) as response:
+            body = response.read().decode("utf-8")
+        self.requests += 1
+        request_id = f"1000.{self.requests}"
+        self.bodies[request_id] = body
+        for method, params in (("Network.requestWillBeSent", {"requestId": request_id,
+                                                              "request": {"url": url, "method": "GET", "headers": headers or {}}}),
+                               ("Network.responseReceived", {"requestId": request_id, "response": {"url": url, "status": 200}}),
+                               ("Network.loadingFinished", {"requestId": request_id})):
+            self.log.append({"level": "INFO", "message": json.dumps({"message": {"method": method, "params": params}})})
+        return body
+
+    def get(self, url: str) -> None:
+        query = parse_qs(urlparse(url).query)["q"][0]
+        variables = quote(json.dumps({"rawQuery": query, "count": 20, "product": "Latest"}))
+        self._fetch(f"{self.server}/i/api/graphql/qW5u-DAuXpMEG0zA1F7UGQ/UserByScreenName")
+        self._fetch(f"{self.server}/i/api/graphql/gkjsKepM6gl_HmFWoWKfgg/SearchTimeline?variables={variables}",
+                    {"authorization": "Bearer stand-in"})
+
+    def execute_async_script(self, script: str, url: str, headers: dict, cursor: str):
+        assert script == src.NEXT_PAGE_JS and headers == {"authorization": "Bearer stand-in"}
+        parsed = urlparse(url)
+        variables = json.loads(parse_qs(parsed.query)["variables"][0])
+        variables["cursor"] = cursor
+        self._fetch(parsed._replace(query=f"variables={quote(json.dumps(variables))}").geturl(), headers)
+        return 200
+
+    def execute_script(self, script: str, *args):
+        self.dom_calls.append(script)
+
+    def find_element(self, by, path: str):
+        self.dom_calls.append(path)
+        raise NoSuchElementException(path)
+
+    def get_log(self, kind: str) -> list[dict]:
+        log, self.log = self.log, []
+        return log
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        if cmd == "Network.getResponseBody":
+            if params["requestId"] not in self.bodies:
+                raise WebDriverException("No resource with given identifier found")
+            return {"body": self.bodies.pop(params["requestId"])}
+        return {}
+
+    def quit(self) -> None:
+        pass
+
+
+class standInScrapper(src.twitterScrapper):
+    def __init__(self, credentials: str, server: str):
+        self._server = server
+        super().__init__(credentials, networkCapture=True, sessionCache=False)
+
+    def _login_account(self) -> None:
+        self.driver = standInChrome(self._server)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), standInX)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fixture_posts() -> dict[int, dict]:
+    posts, _ = src.parse_search_timeline(load_timeline())
+    return {post["Post_id"]: post for post in posts}
+
+
+def test_capture_reads_only_finished_search_timeline_bodies(workdir, server):
+    session = standInScrapper("credentials.json", server)
+    session.backend = "network"
+    session.driver.get("https://x.com/search?q=mbg&f=live&src=typed_query")
+
+    # The body of a response still loading can't be fetched yet
+    finished = session.driver.log.pop()
+    assert session._drain_network_posts() == []
+    assert session.account.pending_requests == {"1000.2"}
+    assert session.account.search_request["headers"] == {"authorization": "Bearer stand-in"}
+
+    session.driver.log.append(finished)
+    posts = session._drain_network_posts()
+    assert [post["Post_id"] for post in posts] == list(fixture_posts())[:PAGE_SIZE + 1]     # The first page has the self-thread
+    assert session.cursor == str(PAGE_SIZE)
+    assert session.account.pending_requests == set()
+
+    # The next page is the same request with the bottom cursor
+    session.WAIT_SHORT, session.POLL_INTERVAL = 1, 0.005
+    assert session._next_network_page() is True
+    second = [post["Post_id"] for post in session._drain_network_posts()]
+    assert second and second == list(fixture_posts())[PAGE_SIZE + 1:PAGE_SIZE + 1 + len(second)]
+    assert session.cursor == str(2 * PAGE_SIZE)
+
+    # Evicted bodies are skipped
+    request = session.account.search_request
+    session.driver.execute_async_script(src.NEXT_PAGE_JS, request["url"], request["headers"], session.cursor)
+    session.driver.bodies.clear()
+    assert session._drain_network_posts() == []
+
+
+def test_pending_requests_are_kept_per_browser(workdir, server):
+    with open("second.json", "w") as f:
+        json.dump({"username": "second", "password": "test", "email": "second@example.com"}, f)
+    session = standInScrapper(["credentials.json", "second.json"], server)
+    session.backend = "network"
+    first, second = session.accounts
+
+    # Request ids are only unique within a browser: both number their search request "1000.2"
+    session.driver.get("https://x.com/search?q=mbg&f=live&src=typed_query")
+    session.driver.log.pop()
+    session._capture_network_pages()
+    assert first.pending_requests == {"1000.2"}
+
+    session._use_account(second)
+    session.driver.requests = 1
+    session.driver._fetch(f"{server}/i/api/graphql/qW5u-DAuXpMEG0zA1F7UGQ/UserByScreenName")
+    assert session._capture_network_pages() == []   # Not a SearchTimeline response of this browser
+    assert second.pending_requests == set()
+    assert first.pending_requests == {"1000.2"}
+
+
+def test_start_collects_the_timeline_through_cdp(workdir, server, quiet):
+    expected = fixture_posts()
+    newest = max(post["Date"] for post in expected.values())
+    oldest = min(post["Date"] for post in expected.values())
+
+    session = standInScrapper("credentials.json", server)
+    session.start(dict(src.SEARCH_FILTERS), startDate=newest + 1, endDate=oldest, scraping_Params=dict(SCRAPING_PARAMS),
+                  processDir="network", resume_from_savepoint=False, backend="network")
+
+    final = pd.read_csv("Process/network/Final.csv")
+    assert sorted(final["Post_id"]) == sorted(expected)
+    for row in final.to_dict("records"):
+        post = expected[row["Post_id"]]
+        assert (row["User"], row["Like_count"], row["View_count"]) == (post["User"], post["Like_count"], post["View_count"])
+        assert row["post_text"] == post["post_text"]
+    assert session.driver.dom_calls == []       # Paged with the cursor, the timeline is never read or scrolled
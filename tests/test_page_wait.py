@@ -0,0 +1,44 @@
+import time
+
+import src
+
+
+class slowTimeline:
+    '''
+    A page whose next SearchTimeline response takes `delay` seconds: it's in flight all along, and no resource timing entry
+    shows up until it lands and the new cells render.
+    '''
+
+    def __init__(self, delay: float):
+        self.landed = time.time() + delay
+
+    def execute_script(self, script: str, *args):
+        if time.time() < self.landed:
+            return {"cells": 10, "height": 6000, "requests": 0, "inflight": 1, "error": False}
+        return {"cells": 16, "height": 9600, "requests": 1, "inflight": 0, "error": False}
+
+
+def waiting_session(driver) -> src.twitterScrapper:
+    session = src.twitterScrapper.__new__(src.twitterScrapper)
+    session.driver = driver
+    session.WAIT_SHORT = 2
+    session.IDLE_WINDOW = 0.02
+    session.POLL_INTERVAL = 0.005
+    return session
+
+
+def test_a_request_in_flight_is_not_an_idle_network():
+    session = waiting_session(slowTimeline(0.2))
+    state = session._wait_for_page_change({"cells": 10, "height": 6000})
+    assert state["cells"] == 16
+
+
+def test_an_idle_network_ends_the_wait_early():
+    class quietTimeline:
+        def execute_script(self, script, *args):
+            return {"cells": 10, "height": 6000, "requests": 0, "inflight": 0, "error": False}
+
+    session = waiting_session(quietTimeline())
+    started = time.time()
+    session._wait_for_page_change({"cells": 10, "height": 6000})
+    assert time.time() - started < 1
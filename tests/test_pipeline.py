@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+
+def test_batches_are_consumed_in_order_on_another_thread():
+    consumed = []
+    pipeline = src.postPipeline(lambda *batch: consumed.append((batch, threading.current_thread().name)))
+    for i in range(20):
+        pipeline.put("posts", i)
+    pipeline.join()
+    assert consumed == [(("posts", i), "post-pipeline") for i in range(20)]
+    pipeline.close()
+
+
+def test_put_blocks_once_the_queue_is_full():
+    started, release = threading.Event(), threading.Event()
+    def consume(n):
+        started.set()
+        release.wait()
+
+    pipeline = src.postPipeline(consume, depth=2)
+    pipeline.put(0)
+    assert started.wait(1)      # Taken by the worker, which blocks on it
+    pipeline.put(1)
+    pipeline.put(2)
+
+    blocked = threading.Thread(target=pipeline.put, args=(3,))
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()       # Two batches waiting already, the browser thread has to wait too
+    release.set()
+    blocked.join(1)
+    assert not blocked.is_alive()
+    pipeline.join()
+    pipeline.close()
+
+
+def test_an_error_in_the_worker_is_raised_on_the_browser_thread():
+    consumed = []
+    def consume(n):
+        if n == 1:
+            raise ValueError("bad batch")
+        consumed.append(n)
+
+    pipeline = src.postPipeline(consume)
+    for n in range(4):
+        pipeline.put(n)
+    with pytest.raises(ValueError, match="bad batch"):
+        pipeline.join()
+    assert consumed == [0]      # What came after the error was skipped
+    pipeline.put(5)
+    pipeline.join()
+    assert consumed == [0, 5]
+    pipeline.close()
+
+
+@pytest.mark.parametrize("mode", ["observer", "snapshot"])
+def test_the_pipeline_collects_the_same_posts_as_a_sequential_run(workdir, quiet, mode):
+    page, posts = timeline_posts()
+    collected = {}
+    for pipeline in (False, True):
+        session = benchmark.benchScrapper("credentials.json", page)
+        session.start(dict(src.SEARCH_FILTERS), startDate=max(post["Date"] for post in posts) + 1,
+                      endDate=min(post["Date"] for post in posts), scraping_Params=dict(SCRAPING_PARAMS),
+                      processDir=f"{mode}_{pipeline}", resume_from_savepoint=False, extractionMode=mode, pipeline=pipeline)
+        collected[pipeline] = session.theDict.to_dict()
+
+    assert collected[True] == collected[False]
+    assert collected[True]["Post_id"] == [post["Post_id"] for post in posts]
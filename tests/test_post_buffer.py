@@ -0,0 +1,17 @@
+import src
+from conftest import timeline_posts
+
+
+def test_buffer_reads_like_a_dict_of_columns():
+    _, posts = timeline_posts()
+    buffer = src.postBuffer(posts[:10])
+    assert buffer.keys() == list(buffer) == src.POST_COLUMNS
+    assert {col: buffer[col] for col in buffer.keys()} == buffer.to_dict()
+
+
+def test_dedupe_keys_fall_back_to_the_idless_key():
+    _, posts = timeline_posts()
+    buffer = src.postBuffer([posts[0], {**posts[1], "Post_id": None}])
+    assert list(buffer.dedupe_keys()) == [posts[0]["Post_id"], src.idless_key(posts[1])]
+    assert list(buffer.dedupe_keys(1)) == [src.idless_key(posts[1])]
+    assert buffer.has_idless() and not buffer.has_idless(2)
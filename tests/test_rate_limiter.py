@@ -0,0 +1,22 @@
+import time
+
+import src
+
+
+def test_a_detection_without_recent_page_loads_keeps_a_positive_rate():
+    limiter = src.rateLimiter(recover_after=1)
+    limiter.detected(observed_rate=0)
+    limiter.cooldown_until = 0
+    for _ in range(5):
+        limiter.success()
+        assert limiter.rate >= src.rateLimiter.MIN_RATE
+        assert limiter.ready_at() < time.time() + 601
+
+
+def test_recovery_grows_back_to_the_ceiling():
+    limiter = src.rateLimiter(max_rate=1.0, recover_after=1)
+    limiter.detected(observed_rate=0.5)
+    assert limiter.rate == 0.5
+    for _ in range(10):
+        limiter.success()
+    assert limiter.rate == limiter.ceiling == 0.9
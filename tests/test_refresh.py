@@ -0,0 +1,40 @@
+import json
+
+import pandas as pd
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, legacy_rows, timeline_posts, write_legacy_csv
+
+
+def refresh(page: str, save_format: str = "csv") -> int:
+    session = benchmark.benchScrapper("credentials.json", page)
+    return session.refresh(dict(src.SEARCH_FILTERS), "legacy", saveFormat=save_format, scraping_Params=dict(SCRAPING_PARAMS),
+                           maxPosts=None, maxAgeDays=None)
+
+
+def test_refresh_restores_the_counts_of_a_legacy_csv(workdir, quiet):
+    page, posts = timeline_posts()
+    write_legacy_csv("Process/legacy/Final.csv", [{**post, **dict.fromkeys(src.COUNT_COLUMNS, 0)} for post in posts])
+
+    assert refresh(page) == len(posts)
+    final = pd.read_csv("Process/legacy/Final.csv", keep_default_na=False)
+    assert final.columns.tolist() == src.POST_COLUMNS[:-1]
+    assert final.astype(str).to_dict("records") == pd.DataFrame(legacy_rows(posts)).astype(str).to_dict("records")
+
+    with open("Process/legacy/engagement.jsonl", "r", encoding="utf-8") as f:
+        history = [json.loads(line) for line in f]
+    assert {row["key"] for row in history} == {src.idless_key(post) for post in posts}
+    assert {row["Post_id"] for row in history} == {post["Post_id"] for post in posts}
+
+
+def test_writing_counts_back_leaves_the_session_alone(workdir, quiet):
+    page, posts = timeline_posts()
+    write_legacy_csv("Process/legacy/Final.csv", posts)
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.processDir, session.saveFormat, session.storage = "legacy", "csv", "sqlite"
+    buffer, segments = session.theDict, session._segments
+
+    assert session._update_dataset_counts({src.idless_key(posts[0]): (1, 2, 3, 4)}) == 1
+    assert (session.storage, session.theDict, session._segments) == ("sqlite", buffer, segments)
+    assert pd.read_csv("Process/legacy/Final.csv").iloc[0][list(src.COUNT_COLUMNS)].tolist() == [1, 2, 3, 4]
@@ -0,0 +1,51 @@
+import json
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts, write_legacy_csv
+
+
+def resumed_session(page: str) -> benchmark.benchScrapper:
+    '''
+    A session resumed from `Process/legacy` that hasn't scraped a page yet (`maxPages=0`), its dedupe set rebuilt.
+    '''
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir="legacy",
+                  resume_from_savepoint=True, maxPages=0)
+    session._window = {"posts": 0, "oldest": None}
+    return session
+
+
+def test_posts_of_a_savepoint_without_ids_are_not_collected_again(workdir, quiet):
+    page, posts = timeline_posts()
+    write_legacy_csv("Process/legacy/Savepoints/savepoint_1.csv", posts[:100])
+
+    session = resumed_session(page)
+    assert len(session._seen) == len(session.theDict) == 100
+    session._consume_batch("posts", [dict(post) for post in posts[:100]])
+    assert len(session.theDict) == 100
+    assert session.metrics.snapshot()["counts"]["duplicates"] == 100
+
+    # Same once the savepoint is the manifest and the journal it was migrated to
+    with open("Process/legacy/Savepoints/manifest.json", "r", encoding="utf-8") as f:
+        assert json.load(f)["idless"] is True
+    session = resumed_session(page)
+    session._consume_batch("posts", [dict(post) for post in posts[:120]])
+    assert session.theDict.column("Post_id") == [post["Post_id"] for post in posts[100:120]]
+
+
+def test_sqlite_storage_matches_rows_without_ids(workdir, quiet):
+    page, posts = timeline_posts()
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir="legacy", storage="sqlite", maxPages=0)
+    session.theDict = src.postBuffer({**post, "Post_id": None} for post in posts[:50])
+    session._flush_store()
+    session._db.close()
+
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir="legacy", storage="sqlite",
+                  resume_from_savepoint=True, maxPages=0)
+    session._window = {"posts": 0, "oldest": None}
+    assert session._idless_rows
+    session._consume_batch("posts", [dict(post) for post in posts[:60]])
+    assert session.theDict.column("Post_id") == [post["Post_id"] for post in posts[50:60]]
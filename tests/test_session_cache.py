@@ -0,0 +1,114 @@
+import os
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+import src
+
+SESSION = {"cookies": [{"name": "auth_token", "value": "secret", "domain": ".x.com", "sameSite": "None"}],
+           "localStorage": {"theme": "dark"}}
+
+
+class fakeBrowser:
+    '''
+    Keeps the cookies and localStorage it's given, and shows the account menu on the home timeline once the auth cookie is set.
+    '''
+
+    def __init__(self):
+        self.visited = []
+        self.cookies = []
+        self.local_storage = {}
+
+    def get(self, url: str) -> None:
+        self.visited.append(url)
+
+    def get_cookies(self) -> list[dict]:
+        return [dict(cookie) for cookie in self.cookies]
+
+    def add_cookie(self, cookie: dict) -> None:
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self) -> None:
+        self.cookies = []
+
+    def execute_script(self, script: str, *args):
+        if script.startswith("return Object.assign"):
+            return dict(self.local_storage)
+        self.local_storage.update(args[0])
+
+    def find_element(self, by, path: str):
+        if "SideNav_AccountSwitcher_Button" in path and any(c["name"] == "auth_token" for c in self.cookies):
+            return object()
+        raise NoSuchElementException(path)
+
+    def quit(self) -> None:
+        pass
+
+
+class cachedScrapper(src.twitterScrapper):
+    def _build_driver(self) -> fakeBrowser:
+        return fakeBrowser()
+
+
+@pytest.fixture
+def no_waiting(monkeypatch):
+    '''
+    A missing account menu fails right away instead of after the 10 seconds the real login gives it.
+    '''
+    wait_for_xpath = src.wait_for_xpath
+    monkeypatch.setattr(src, "wait_for_xpath", lambda driver, timeout, xpath: wait_for_xpath(driver, 0, xpath))
+
+
+def write_session(session: dict, password: str) -> None:
+    os.makedirs(src.SESSION_DIR, exist_ok=True)
+    with open(f"{src.SESSION_DIR}/test.session", "wb") as f:
+        f.write(src.encrypt_session(session, password))
+
+
+def test_sessions_only_decrypt_with_the_account_password():
+    blob = src.encrypt_session(SESSION, "hunter2")
+    assert b"secret" not in blob
+    assert src.decrypt_session(blob, "hunter2") == SESSION
+    assert src.encrypt_session(SESSION, "hunter2")[:16] != blob[:16]      # Fresh salt every time
+
+    with pytest.raises(ValueError):
+        src.decrypt_session(blob, "hunter3")
+    with pytest.raises(ValueError):
+        src.decrypt_session(blob[:-1] + bytes([blob[-1] ^ 1]), "hunter2")
+
+
+def test_a_valid_cached_session_skips_the_login(workdir, quiet, no_waiting):
+    write_session(SESSION, "test")
+    session = cachedScrapper("credentials.json")
+
+    driver = session.driver
+    assert driver.visited == ["https://x.com/robots.txt", "https://x.com/home"]     # Never went near the login flow
+    assert driver.cookies == [{"name": "auth_token", "value": "secret", "domain": ".x.com"}]
+    assert driver.local_storage == {"theme": "dark"}
+
+    # Saving it again round-trips through the file
+    os.remove(session._session_path())
+    session._save_session()
+    with open(session._session_path(), "rb") as f:
+        saved = src.decrypt_session(f.read(), "test")
+    assert saved["cookies"] == driver.cookies and saved["localStorage"] == {"theme": "dark"}
+
+
+def test_unusable_cached_sessions_fall_back_to_a_full_login(workdir, quiet, no_waiting):
+    write_session(SESSION, "test")
+    session = cachedScrapper("credentials.json")
+    session.driver = fakeBrowser()
+
+    # Written with another password
+    write_session(SESSION, "old password")
+    with pytest.warns(UserWarning, match="can't be decrypted"):
+        assert not session._restore_session()
+    assert session.driver.visited == []
+
+    # X logged the session out: its cookies are dropped so the login starts clean
+    write_session({"cookies": [{"name": "guest_id", "value": "1"}], "localStorage": {}}, "test")
+    assert not session._restore_session()
+    assert session.driver.cookies == []
+
+    os.remove(session._session_path())
+    assert not session._restore_session()
@@ -0,0 +1,130 @@
+import json
+import multiprocessing
+import os
+import queue
+
+import pytest
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+
+def test_split_accounts_gives_every_worker_its_own_accounts():
+    accounts = [f"Credentials/{i}.json" for i in range(5)]
+    slices = src.split_accounts(accounts, 2)
+    assert slices == [accounts[0::2], accounts[1::2]]
+    assert sorted(sum(slices, [])) == accounts
+
+    assert src.split_accounts(accounts[:2], 2) == [[accounts[0]], [accounts[1]]]
+    with pytest.raises(ValueError):
+        src.split_accounts(accounts[:2], 3)
+
+
+def test_start_refuses_more_workers_than_accounts(workdir, quiet):
+    page, _ = benchmark.load_fixtures()
+    session = benchmark.benchScrapper("credentials.json", page)
+    with pytest.raises(ValueError, match="workers=2"):
+        session.start(dict(src.SEARCH_FILTERS), startDate="2026-01-16", endDate="2026-01-01", processDir="sharded", workers=2)
+
+
+@pytest.mark.parametrize("storage", ["memory", "sqlite"])
+@pytest.mark.parametrize("save_format", ["csv", "json", "parquet", "arrow"])
+def test_merge_streams_the_shards_without_duplicates(workdir, quiet, save_format, storage):
+    page, posts = timeline_posts()
+    shards = [posts[:120], posts[100:220], posts[220:]]       # The first two overlap
+    session = benchmark.benchScrapper("credentials.json", page)
+    plan = []
+    for i, shard in enumerate(shards):
+        plan.append({"processDir": f"merged/Shards/{i}", "done": True})
+        session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir=plan[-1]["processDir"],
+                      saveFormat=save_format, maxPages=0)
+        session.theDict = src.postBuffer(shard)
+        session.save("final")
+
+    session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir="merged", saveFormat=save_format,
+                  storage=storage, maxPages=0, maxBufferedPosts=50)
+    session._merge_shards(plan)
+
+    merged = [post for chunk in session._iter_savefile(f"Process/merged/Final.{save_format}") for post in chunk.rows(formatted=False)]
+    assert [post["Post_id"] for post in merged] == [post["Post_id"] for post in posts]
+    assert not os.path.exists("Process/merged/Savepoints")
+    if storage == "memory":
+        assert session.metrics.snapshot()["counts"]["spills"] >= len(posts) // 50 - 1
+
+
+def test_a_saved_shard_plan_is_only_resumed_for_the_same_range(workdir, quiet):
+    page, _ = benchmark.load_fixtures()
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), startDate="2026-01-16", endDate="2026-01-01", processDir="sharded", maxPages=0,
+                  resume_from_savepoint=False)
+    plan_path = "Process/sharded/shards.json"
+    os.makedirs("Process/sharded", exist_ok=True)
+
+    plan = session._shard_plan(plan_path, session.start_date, 7, resume=True)
+    assert [(s["since"], s["until"]) for s in plan] == src.plan_shards(session.start_date, session.end_date, 7)
+    plan[0]["done"] = True
+    src._atomic_write_json(plan_path, {"since": session.end_date, "until": session.start_date, "shards": plan})
+    assert session._shard_plan(plan_path, session.start_date, 7, resume=True) == plan
+    assert not any(s["done"] for s in session._shard_plan(plan_path, session.start_date, 7, resume=False))
+
+    # Same processDir, another range: the done shard isn't of this range
+    session.start(dict(src.SEARCH_FILTERS), startDate="2026-01-10", endDate="2026-01-01", processDir="sharded", maxPages=0,
+                  resume_from_savepoint=False)
+    replanned = session._shard_plan(plan_path, session.start_date, 7, resume=True)
+    assert [(s["since"], s["until"]) for s in replanned] == src.plan_shards(session.start_date, session.end_date, 7)
+    assert not any(s["done"] for s in replanned)
+
+    # Plans from before the range was saved are the bare list of shards
+    src._atomic_write_json(plan_path, plan)
+    assert session._shard_plan(plan_path, session.start_date, 7, resume=True) == replanned
+    assert session._shard_plan(plan_path, plan[0]["until"], 7, resume=True) == plan
+    assert session._shard_plan(plan_path, None, 7, resume=True) == plan     # An empty startDate takes the saved range as is
+
+
+class inlinePool:
+    '''
+    Runs the shard jobs in this process, in order, instead of spawning workers.
+    '''
+
+    def __init__(self, processes, initializer=None, initargs=()):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def imap_unordered(self, worker, jobs):
+        return map(worker, jobs)
+
+
+class inlineContext:
+    Queue = queue.Queue
+    Pool = inlinePool
+
+
+def test_the_accounts_are_logged_out_while_the_shard_workers_use_them(workdir, quiet, monkeypatch):
+    page, _ = benchmark.load_fixtures()
+    with open("second.json", "w") as f:
+        json.dump({"username": "second", "password": "test", "email": "second@example.com"}, f)
+    session = benchmark.benchScrapper(["credentials.json", "second.json"], page)
+    assert all(account.driver is not None for account in session.accounts)
+
+    logged_in = []
+    def run_shard(job):
+        logged_in.append([account.driver for account in session.accounts if account.driver is not None])
+        return job["index"]
+    monkeypatch.setattr(multiprocessing, "get_context", lambda method: inlineContext)
+    monkeypatch.setattr(src, "_run_shard", run_shard)
+
+    session.start(dict(src.SEARCH_FILTERS), startDate="2026-01-16", endDate="2026-01-01", scraping_Params=dict(SCRAPING_PARAMS),
+                  processDir="sharded", workers=2, resume_from_savepoint=False)
+    assert logged_in == [[], [], []]        # Every shard ran while the session had no browser open
+    with open("Process/sharded/shards.json", "r", encoding="utf-8") as f:
+        assert all(shard["done"] for shard in json.load(f)["shards"])
+
+    # The session logs back in once it loads a page again
+    assert session._acquire_account()
+    assert session.account.driver is not None and session.driver is session.account.driver
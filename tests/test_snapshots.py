@@ -0,0 +1,59 @@
+import os
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+SNAPSHOTS = "Process/snapshots/Snapshots"
+
+
+def snapshot_run(page: str, posts: list[dict], **kwargs) -> benchmark.benchScrapper:
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), startDate=max(post["Date"] for post in posts) + 1,
+                  endDate=min(post["Date"] for post in posts), scraping_Params=dict(SCRAPING_PARAMS), processDir="snapshots",
+                  resume_from_savepoint=False, extractionMode="snapshot", **kwargs)
+    return session
+
+
+def stored() -> list[str]:
+    return sorted(os.listdir(SNAPSHOTS))
+
+
+def test_snapshots_past_the_limit_drop_the_oldest(workdir, quiet):
+    page, posts = timeline_posts()
+    snapshot_run(page, posts, snapshotLimit=None)
+    every = stored()
+    sizes = {name: os.path.getsize(os.path.join(SNAPSHOTS, name)) for name in every}
+    assert len(every) > 5
+
+    limit = sum(sizes[name] for name in every[-3:])
+    session = snapshot_run(page, posts, snapshotLimit=limit)      # The first run's snapshots count against it too
+    kept = stored()
+    assert sum(os.path.getsize(os.path.join(SNAPSHOTS, name)) for name in kept) <= limit
+    assert not set(kept) & set(every)
+    assert kept == [os.path.basename(path) for path, _ in session._snapshots]
+    assert len(session.theDict) == len(posts)       # Only the copies go, the posts were parsed already
+
+    # The latest one always stays, however small the limit
+    snapshot_run(page, posts, snapshotLimit=0)
+    assert len(stored()) == 1
+
+
+def test_snapshot_text_reads_like_inner_text():
+    from lxml import html as lxml_html
+    span = lxml_html.fragment_fromstring(
+        '<span>first\r\nline<br>second<script>skip()</script> kept<span hidden>hid</span> tail'
+        '<style>.a{}</style><b style="display: none">gone</b><i style="color: red">shown</i>\rend</span>')
+    assert span.text_content() != src._inner_text(span)
+    assert src._inner_text(span) == "first\nline\nsecond kept tailshown\nend"
+    assert src._inner_text(lxml_html.fragment_fromstring("<span>  spaced\r\n  out </span>")) == "  spaced\n  out "
+
+
+def test_parsed_snapshots_keep_line_breaks_in_post_text():
+    page, posts = timeline_posts()
+    first = posts[0]["post_text"]
+    assert "\n" not in first
+    broken = page.replace(first, first.replace(" ", "<br>", 1), 1)
+    parsed = src.parse_timeline_html(broken)
+    assert parsed[0]["post_text"] == first.replace(" ", "\n", 1)
+    assert [post["post_text"] for post in parsed[1:]] == [post["post_text"] for post in posts[1:]]
@@ -0,0 +1,70 @@
+import sqlite3
+
+import pandas as pd
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+
+def sqlite_session(page: str, resume: bool = False, **kwargs) -> benchmark.benchScrapper:
+    session = benchmark.benchScrapper("credentials.json", page)
+    session.start(dict(src.SEARCH_FILTERS), scraping_Params=dict(SCRAPING_PARAMS), processDir="stored", storage="sqlite",
+                  resume_from_savepoint=resume, **kwargs)
+    return session
+
+
+def stored_rows() -> dict[int, tuple]:
+    with sqlite3.connect("Process/stored/posts.sqlite") as db:
+        return {row[0]: row[1:] for row in db.execute("SELECT Post_id, post_text, Reply_count, Like_count, View_count FROM posts")}
+
+
+def test_posts_seen_again_only_get_their_counts_updated(workdir, quiet):
+    page, posts = timeline_posts()
+    session = sqlite_session(page, maxPages=0)
+    assert session._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    session.theDict = src.postBuffer(posts[:30])
+    session._flush_store()
+    assert len(session.theDict) == 0
+
+    again = [{**post, "Like_count": post["Like_count"] + 5, "View_count": post["View_count"] + 100, "post_text": "edited"}
+             for post in posts[20:30]]
+    session.theDict = src.postBuffer(again + posts[30:40])
+    session._flush_store()
+
+    rows = stored_rows()
+    assert len(rows) == 40
+    for i, post in enumerate(posts[:40]):
+        bumped = 20 <= i < 30
+        assert rows[post["Post_id"]] == (post["post_text"], post["Reply_count"], post["Like_count"] + 5 * bumped,
+                                         post["View_count"] + 100 * bumped)
+
+
+def test_resuming_reads_the_cursor_from_the_progress_table(workdir, quiet):
+    page, posts = timeline_posts()
+    session = sqlite_session(page, maxPages=0)
+    session.theDict = src.postBuffer(posts[50:80])
+    session._flush_store()
+    session.theDict = src.postBuffer(posts[:20])        # Newer posts flushed later don't move the cursor back up
+    session._flush_store()
+    session._db.close()
+
+    session = sqlite_session(page, resume=True, maxPages=0)
+    assert session.start_date == min(post["Date"] for post in posts[:80])
+    assert len(session.theDict) == 0 and len(session._seen) == 0      # Nothing read back, the unique index dedupes
+
+
+def test_sqlite_storage_writes_the_same_final_as_memory(workdir, quiet):
+    page, posts = timeline_posts()
+    finals = {}
+    for storage in ("memory", "sqlite"):
+        session = benchmark.benchScrapper("credentials.json", page)
+        session.start(dict(src.SEARCH_FILTERS), startDate=max(post["Date"] for post in posts) + 1,
+                      endDate=min(post["Date"] for post in posts), scraping_Params=dict(SCRAPING_PARAMS), processDir=storage,
+                      storage=storage, resume_from_savepoint=False)
+        finals[storage] = pd.read_csv(f"Process/{storage}/Final.csv")
+
+    assert len(finals["memory"]) == len(posts)
+    pd.testing.assert_frame_equal(finals["sqlite"].sort_values("Post_id", ignore_index=True),
+                                  finals["memory"].sort_values("Post_id", ignore_index=True))
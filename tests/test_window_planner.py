@@ -0,0 +1,91 @@
+import re
+from urllib.parse import unquote
+
+import benchmark
+import src
+from conftest import SCRAPING_PARAMS, timeline_posts
+
+DAY = src.windowPlanner.DAY
+
+
+def test_windows_start_unbounded_and_stay_above_the_floor():
+    planner = src.windowPlanner(target_posts=100)
+    assert planner.next_window(10 * DAY) is None
+    assert planner.next_window(10 * DAY, floor=3 * DAY) == 3 * DAY
+
+    planner.span = 2 * DAY
+    assert planner.next_window(10 * DAY) == 8 * DAY
+    assert planner.next_window(10 * DAY, floor=9 * DAY) == 9 * DAY
+
+
+def test_step_back_skips_the_whole_window():
+    planner = src.windowPlanner()
+    assert planner.step_back(8 * DAY, 10 * DAY) == 8 * DAY
+    assert planner.step_back(None, 10 * DAY) == 9 * DAY
+
+
+def test_the_cursor_only_stops_at_the_oldest_post_of_a_full_window():
+    planner = src.windowPlanner(target_posts=100)
+    since, until, oldest = 8 * DAY, 10 * DAY, 9 * DAY
+    assert planner.next_cursor(since, until, 100, oldest) == oldest     # Scrolled as far as the page goes, the rest is still to load
+    assert planner.next_cursor(since, until, 30, oldest) == since       # Ran out: [since, oldest) was loaded already
+    assert planner.next_cursor(since, until, 0) == since
+    assert planner.next_cursor(None, until, 30, oldest) == oldest       # Unbounded, nothing to skip to
+    assert planner.next_cursor(None, until, 0) == 9 * DAY
+
+
+def test_record_widens_empty_windows_and_fits_dense_ones_to_the_target():
+    planner = src.windowPlanner(target_posts=100, max_span=8 * DAY)
+    planner.record(8 * DAY, 10 * DAY, 0)
+    assert (planner.span, planner.empty_span) == (2 * DAY, 2 * DAY)
+    planner.record(4 * DAY, 8 * DAY, 0)
+    planner.record(0, 4 * DAY, 0)
+    assert (planner.span, planner.empty_span) == (8 * DAY, 10 * DAY)    # Capped at max_span
+
+    # 100 posts in the last 10 hours of the window: the scroll stopped there, that's the density
+    planner.record(0, 4 * DAY, 100, oldest=4 * DAY - 10 * planner.HOUR)
+    assert planner.empty_span == 0
+    assert planner.span == 10 * planner.HOUR
+    # 50 posts in a drained 10 hour window: the whole window counts, half the density
+    planner.record(0, 10 * planner.HOUR, 50, oldest=9 * planner.HOUR)
+    assert planner.span == 13 * planner.HOUR      # 100 posts at the average of both densities, rounded down to the hour
+
+    restored = src.windowPlanner(target_posts=100)
+    restored.restore(planner.state())
+    assert restored.state() == planner.state()
+
+
+def test_sparse_windows_are_not_loaded_twice(workdir, quiet, monkeypatch):
+    page, posts = timeline_posts()
+    newest = max(post["Date"] for post in posts) + 1
+    oldest = min(post["Date"] for post in posts)
+    span = (newest - oldest) // 4
+
+    class fixedPlanner(src.windowPlanner):
+        '''
+        Windows of a quarter of the fixture, each one drained well before the (huge) target.
+        '''
+        def __init__(self, target_posts):
+            super().__init__(10 ** 6)
+            self.span = span
+
+        def record(self, *args, **kwargs):
+            super().record(*args, **kwargs)
+            self.span = span
+    monkeypatch.setattr(src, "windowPlanner", fixedPlanner)
+
+    session = benchmark.benchScrapper("credentials.json", page)
+    loaded = []
+    get = session.driver.get
+    def recording_get(url):
+        query = unquote(url)
+        loaded.append((int(re.search(r"since_time:(\d+)", query).group(1)), int(re.search(r"until_time:(\d+)", query).group(1))))
+        get(url)
+    session.driver.get = recording_get
+    session.start(dict(src.SEARCH_FILTERS), startDate=newest, endDate=oldest, scraping_Params=dict(SCRAPING_PARAMS),
+                  processDir="sparse", resume_from_savepoint=False)
+
+    assert sorted(session.theDict.column("Post_id")) == sorted(post["Post_id"] for post in posts)
+    assert loaded[0][1] == newest and loaded[-1][0] == oldest
+    for (since, _), (_, until) in zip(loaded, loaded[1:]):
+        assert until == since       # Each window picks up where the previous one ended, nothing in between loaded again
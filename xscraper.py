@@ -0,0 +1,132 @@
+'''
+Command line entry point of the scraper, for servers and cron jobs (the notebook is still the interactive way).
+
+    python -m xscraper run job.json                     # one `start()` job
+    python -m xscraper run jobs.jsonl --headless        # a job queue, see `twitterScrapper.run_jobs`
+    python -m xscraper refresh job.json                 # re-poll the counts of the job's dataset, see `twitterScrapper.refresh`
+
+A job file is a JSON object with the `start()` arguments and the filters under "filters", plus optionally the session options
+"credentials" (a path or a list of paths), "headless", "sessionCache", "networkCapture" and "lightProfile". E.g,
+```
+{
+    "credentials": "Credentials/twitter.json",
+    "headless": true,
+    "filters": {"any_of_these_words": "'Makan Bergizi Gratis' MBG", "language": "Indonesian"},
+    "startDate": "2026-01-16",
+    "endDate": "2026-01-15",
+    "processDir": "MBG",
+    "saveFormat": "parquet"
+}
+```
+Left out filters aren't used. Command line flags win over the job file. `refresh` takes the same job file and only uses the
+filters, "processDir", "saveFormat", "scraping_Params", "extractionMode" and "backend" of it, plus "maxPosts", "maxAgeDays"
+and "minInterval" if they're there.
+
+Exit code is 0 once every job is done, 2 if a run stopped early to be resumed (e.g. `maxPages`) and 1 on an error.
+'''
+import argparse
+import json
+import os
+import sys
+from typing import *
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from src import twitterScrapper
+
+SESSION_OPTIONS = ("credentials", "headless", "sessionCache", "networkCapture", "lightProfile")
+REFRESH_OPTIONS = ("processDir", "saveFormat", "scraping_Params", "extractionMode", "backend", "maxPosts", "maxAgeDays", "minInterval")
+
+
+def load_job(path: str) -> dict:
+    '''
+    Read a job file, checking it has filters.
+    '''
+    with open(path, "r", encoding="utf-8") as f:
+        job = json.load(f)
+    if not isinstance(job, dict) or "filters" not in job:
+        raise ValueError(f"{path} should be a JSON object with the filters under \"filters\"!")
+    return job
+
+
+def queue_needs_network(path: str) -> bool:
+    '''
+    Whether any job of a JSONL queue uses `backend="network"`, which needs the session to capture network traffic.
+    '''
+    with open(path, "r", encoding="utf-8") as f:
+        return any(json.loads(line).get("backend") == "network" for line in f if line.strip())
+
+
+def session_for(args: argparse.Namespace, job: dict, queue: bool = False) -> twitterScrapper:
+    '''
+    Log in with the session options of the job file, command line flags first.
+    '''
+    session_options = {key: job.pop(key) for key in SESSION_OPTIONS if key in job}
+    if args.credentials:
+        session_options["credentials"] = args.credentials if len(args.credentials) > 1 else args.credentials[0]
+    if args.headless is not None:
+        session_options["headless"] = args.headless
+    if args.no_session_cache:
+        session_options["sessionCache"] = False
+    if args.full_render:
+        session_options["lightProfile"] = False
+    session_options.setdefault("credentials", "Credentials/twitter.json")
+    session_options.setdefault("networkCapture", queue_needs_network(args.job) if queue else job.get("backend") == "network")
+    return twitterScrapper(**session_options)
+
+
+def run(args: argparse.Namespace) -> int:
+    queue = args.job.endswith(".jsonl")
+    job = {} if queue else load_job(args.job)
+
+    session = session_for(args, job, queue)
+    try:
+        if queue:
+            done = session.run_jobs(args.job, slicePages=args.slice_pages)
+            print(f"{sum(done.values())}/{len(done)} jobs done")
+            return 0 if all(done.values()) else 2
+        filters = job.pop("filters")
+        return 0 if session.start(filters, **job) else 2
+    finally:
+        session.quit()
+
+
+def refresh(args: argparse.Namespace) -> int:
+    job = load_job(args.job)
+    if "processDir" not in job:
+        raise ValueError(f"{args.job} needs a \"processDir\" to know which dataset to refresh!")
+
+    session = session_for(args, job)
+    try:
+        session.refresh(job["filters"], **{key: job[key] for key in REFRESH_OPTIONS if key in job})
+        return 0
+    finally:
+        session.quit()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="xscraper", description="Scrape X (formerly Twitter) search results.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run a job file (.json) or a job queue (.jsonl).")
+    run_parser.add_argument("job", help="Path to the job file or queue.")
+    run_parser.add_argument("--slice-pages", type=int, default=20, help="Search pages per turn of a job queue. Default is 20.")
+    run_parser.set_defaults(handler=run)
+
+    refresh_parser = commands.add_parser("refresh", help="Re-poll the reply/repost/like/view counts of a job file's dataset.")
+    refresh_parser.add_argument("job", help="Path to the job file.")
+    refresh_parser.set_defaults(handler=refresh)
+
+    for command in (run_parser, refresh_parser):
+        command.add_argument("--credentials", action="append", metavar="PATH",
+                             help="Credentials file, repeat it for a pool of accounts. Default is Credentials/twitter.json.")
+        command.add_argument("--headless", action="store_true", default=None, help="Run Chrome without a window.")
+        command.add_argument("--no-session-cache", action="store_true", help="Always do the full login.")
+        command.add_argument("--full-render", action="store_true",
+                             help="Load images, media and fonts as usual instead of the lightweight rendering profile.")
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())